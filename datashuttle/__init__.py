@@ -1,11 +1,45 @@
-from importlib.metadata import PackageNotFoundError, version
+from typing import TYPE_CHECKING
 
-from datashuttle.datashuttle_class import DataShuttle
-from datashuttle.datashuttle_functions import validate_project_from_path
+if TYPE_CHECKING:
+    from datashuttle.datashuttle_class import DataShuttle
+    from datashuttle.datashuttle_functions import (
+        iter_validate_project_from_path,
+        validate_project_from_path,
+    )
 
+# The public API is imported on first use, so `import datashuttle` is fast and
+# e.g. `validate_project_from_path` does not import everything `DataShuttle` needs.
+_LAZY_ATTRIBUTES = {
+    "DataShuttle": "datashuttle.datashuttle_class",
+    "validate_project_from_path": "datashuttle.datashuttle_functions",
+    "iter_validate_project_from_path": "datashuttle.datashuttle_functions",
+}
 
-try:
-    __version__ = version("datashuttle")
-except PackageNotFoundError:
-    # package is not installed
-    pass
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    """Import the public API, and find the package version, on first use."""
+    if name in _LAZY_ATTRIBUTES:
+        from importlib import import_module
+
+        value = getattr(import_module(_LAZY_ATTRIBUTES[name]), name)
+
+    elif name == "__version__":
+        from importlib.metadata import PackageNotFoundError, version
+
+        try:
+            value = version("datashuttle")
+        except PackageNotFoundError:
+            # package is not installed
+            raise AttributeError(name) from None
+    else:
+        raise AttributeError(f"module 'datashuttle' has no attribute '{name}'")
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Include the lazily imported public API."""
+    return sorted([*globals(), *_LAZY_ATTRIBUTES])
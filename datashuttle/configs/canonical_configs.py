@@ -23,8 +23,6 @@ if TYPE_CHECKING:
     from datashuttle.configs.config_class import Configs
 from pathlib import Path
 
-import typeguard
-
 from datashuttle.configs.aws_regions import AwsRegion
 from datashuttle.utils import folders, utils
 from datashuttle.utils.custom_exceptions import ConfigError
@@ -219,6 +217,9 @@ def raise_on_bad_path_syntax(
 
 def check_config_types(config_dict: Configs) -> None:
     """Check the type of passed configs matches the canonical types."""
+    # `typeguard` is slow to import, so is imported only when configs are checked.
+    import typeguard
+
     required_types = get_canonical_configs()
 
     for key in config_dict.keys():
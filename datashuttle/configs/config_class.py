@@ -13,15 +13,13 @@ import copy
 from collections import UserDict
 from pathlib import Path
 
-import yaml
-
 from datashuttle.configs import (
     canonical_configs,
     canonical_folders,
     load_configs,
     rclone_configs,
 )
-from datashuttle.utils import folders, utils
+from datashuttle.utils import folders, utils, yaml_files
 
 
 class Configs(UserDict):
@@ -118,8 +116,7 @@ class Configs(UserDict):
         cfg_to_save = copy.deepcopy(self.data)
         load_configs.convert_str_and_pathlib_paths(cfg_to_save, "path_to_str")
 
-        with open(self.file_path, "w") as config_file:
-            yaml.dump(cfg_to_save, config_file, sort_keys=False)
+        yaml_files.dump_yaml(cfg_to_save, self.file_path, sort_keys=False)
 
     def load_from_file(self) -> None:
         """Load a config dict saved at .yaml file.
@@ -131,8 +128,7 @@ class Configs(UserDict):
         However, this will not automatically check the configs are valid, this
         requires calling self.check_dict_values_raise_on_fail()
         """
-        with open(self.file_path) as config_file:
-            config_dict = yaml.full_load(config_file)
+        config_dict = yaml_files.load_yaml(self.file_path)
 
         load_configs.convert_str_and_pathlib_paths(config_dict, "str_to_path")
 
@@ -1,9 +1,13 @@
+from __future__ import annotations
+
 import warnings
 from pathlib import Path
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Optional, Union
+
+if TYPE_CHECKING:
+    from datashuttle.configs.config_class import Configs
 
 from datashuttle.configs import canonical_configs
-from datashuttle.configs.config_class import Configs
 from datashuttle.utils import utils
 from datashuttle.utils.custom_exceptions import ConfigError
 
@@ -48,6 +52,9 @@ def attempt_load_configs(
             )
         return None
 
+    # For circular imports
+    from datashuttle.configs.config_class import Configs
+
     new_cfg: Optional[Configs]
 
     new_cfg = Configs(project_name, config_path, None)
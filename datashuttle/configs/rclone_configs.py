@@ -7,10 +7,8 @@ if TYPE_CHECKING:
 
     from datashuttle.configs.configs_class import Configs
 
-import yaml
-
 from datashuttle.configs import canonical_folders
-from datashuttle.utils import rclone_encryption
+from datashuttle.utils import rclone_encryption, yaml_files
 
 
 class RCloneConfigs:
@@ -58,8 +56,9 @@ class RCloneConfigs:
         )
 
         if self.rclone_encryption_state_file_path.is_file():
-            with open(self.rclone_encryption_state_file_path, "r") as file:
-                rclone_config_is_encrypted = yaml.full_load(file)
+            rclone_config_is_encrypted = yaml_files.load_yaml(
+                self.rclone_encryption_state_file_path
+            )
         else:
             rclone_config_is_encrypted = {
                 "ssh": False,
@@ -67,8 +66,10 @@ class RCloneConfigs:
                 "aws": False,
             }
 
-            with open(self.rclone_encryption_state_file_path, "w") as file:
-                yaml.dump(rclone_config_is_encrypted, file)
+            yaml_files.dump_yaml(
+                rclone_config_is_encrypted,
+                self.rclone_encryption_state_file_path,
+            )
 
         return rclone_config_is_encrypted
 
@@ -89,8 +90,9 @@ class RCloneConfigs:
             self.datashuttle_configs["connection_method"]
         ] = value
 
-        with open(self.rclone_encryption_state_file_path, "w") as file:
-            yaml.dump(rclone_config_is_encrypted, file)
+        yaml_files.dump_yaml(
+            rclone_config_is_encrypted, self.rclone_encryption_state_file_path
+        )
 
     def rclone_file_is_encrypted(
         self,
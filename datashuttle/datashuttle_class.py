@@ -9,6 +9,7 @@ from pathlib import Path
 from typing import (
     TYPE_CHECKING,
     Any,
+    Callable,
     Dict,
     List,
     Literal,
@@ -23,12 +24,14 @@ if TYPE_CHECKING:
     from datashuttle.utils.custom_types import (
         ConnectionMethods,
         DisplayMode,
+        LoggingMode,
         OverwriteExistingFiles,
         Prefix,
         TopLevelFolder,
     )
-
-import yaml
+    from datashuttle.utils.formatting import NameRange
+    from datashuttle.utils.transfer_progress_class import TransferProgress
+    from datashuttle.utils.validation import ValidationIssue
 
 from datashuttle.configs import (
     canonical_configs,
@@ -39,6 +42,7 @@ from datashuttle.configs.config_class import Configs
 from datashuttle.datashuttle_functions import _format_top_level_folder
 from datashuttle.utils import (
     aws,
+    data_transfer,
     ds_logger,
     folders,
     formatting,
@@ -47,8 +51,10 @@ from datashuttle.utils import (
     rclone,
     rclone_encryption,
     ssh,
+    transfer_diff_cache,
     utils,
     validation,
+    yaml_files,
 )
 from datashuttle.utils.custom_exceptions import (
     ConfigError,
@@ -101,6 +107,9 @@ class DataShuttle:
         )
         self.cfg: Any = None
 
+        self._logging_mode: LoggingMode = "full"
+        self._cfg_log_snapshot: Optional[str] = None
+
         self.cfg = load_configs.attempt_load_configs(
             self.project_name, self._config_path, verbose=print_startup_message
         )
@@ -112,6 +121,8 @@ class DataShuttle:
         """Update all private attributes according to config contents."""
         self.cfg.init_paths()
 
+        self._cfg_log_snapshot = None
+
         self._make_project_metadata_if_does_not_exist()
 
     # -------------------------------------------------------------------------
@@ -128,6 +139,7 @@ class DataShuttle:
         bypass_validation: bool = False,
         allow_letters_in_sub_ses_values: bool = False,
         log: bool = True,
+        num_workers: int = 1,
     ) -> Dict[str, List[Path]]:
         """Create a folder tree in the project folder.
 
@@ -172,6 +184,10 @@ class DataShuttle:
         log
             If `True`, details of folder creation will be logged.
 
+        num_workers
+            Number of threads used to make folders concurrently, which can
+            speed up making many folders on network-mounted storage.
+
         Returns
         -------
         created_paths
@@ -213,6 +229,7 @@ class DataShuttle:
                     "ses_names": ses_names,
                     "datatype": datatype,
                     "bypass_validation": bypass_validation,
+                    "num_workers": num_workers,
                 },
             )
 
@@ -242,7 +259,10 @@ class DataShuttle:
 
         ds_logger.log_names(
             ["formatted_sub_names", "formatted_ses_names"],
-            [format_sub, format_ses],
+            [
+                formatting.expand_names(format_sub),
+                formatting.expand_names(format_ses),
+            ],
         )
 
         utils.log("\nMaking folders...")
@@ -253,6 +273,7 @@ class DataShuttle:
             format_ses,
             datatype,
             log=True,
+            num_workers=num_workers,
         )
 
         utils.print_message_to_user("Finished making folders.")
@@ -275,14 +296,25 @@ class DataShuttle:
         bypass_validation: bool,
         allow_letters_in_sub_ses_values: bool,
         log: bool = True,
-    ) -> Tuple[List[str], List[str]]:
-        """Central method to format and validate subject and session names."""
+        project_folder_paths: Optional[Dict] = None,
+    ) -> Tuple[List[Union[str, NameRange]], List[Union[str, NameRange]]]:
+        """Central method to format and validate subject and session names.
+
+        If `project_folder_paths` is passed, names are validated against
+        these rather than searching the project (see
+        `validation.validate_names_against_project()`).
+
+        Names with the @TO@ tag are returned as a `formatting.NameRange`,
+        which is validated without making every name in the range. Use
+        `formatting.iter_names()` to make the names.
+        """
         format_sub = formatting.check_and_format_names(
             sub_names,
             "sub",
             validation_templates,
             bypass_validation,
             allow_letters_in_sub_ses_values,
+            expand_ranges=False,
         )
 
         if ses_names is not None:
@@ -292,6 +324,7 @@ class DataShuttle:
                 validation_templates,
                 bypass_validation,
                 allow_letters_in_sub_ses_values,
+                expand_ranges=False,
             )
         else:
             format_ses = []
@@ -307,6 +340,7 @@ class DataShuttle:
                 log=log,
                 validation_templates=validation_templates,
                 allow_letters_in_sub_ses_values=allow_letters_in_sub_ses_values,
+                project_folder_paths=project_folder_paths,
             )
 
         return format_sub, format_ses
@@ -325,6 +359,8 @@ class DataShuttle:
         datatype: Union[List[str], str] = "all",
         overwrite_existing_files: OverwriteExistingFiles = "never",
         dry_run: bool = False,
+        parallel_shards: int = 1,
+        progress_callback: Optional[Callable[[TransferProgress], None]] = None,
         init_log: bool = True,
         display_transfer_output: bool = True,
     ) -> TransferOutput:
@@ -363,6 +399,19 @@ class DataShuttle:
             Perform a dry-run of transfer. This will output as if file
             transfer was taking place, but no files will be moved.
 
+        parallel_shards
+            The number of rclone transfers to run at once. If greater than
+            one, the files to transfer are split into this many shards by
+            subject, and each shard is transferred by a separate rclone call.
+            This can make better use of the network when transferring many
+            subjects. Total concurrency is capped (see
+            ``data_transfer.MAX_CONCURRENT_TRANSFERS``).
+
+        progress_callback
+            If not ``None``, a function called with a ``TransferProgress``
+            (bytes and files transferred, speed and ETA) about once a
+            second while the transfer runs.
+
         init_log
             Whether to handle logging. This should
             always be ``True``, unless logger is handled elsewhere
@@ -383,6 +432,7 @@ class DataShuttle:
                     "datatype": datatype,
                     "overwrite_existing_files": overwrite_existing_files,
                     "dry_run": dry_run,
+                    "parallel_shards": parallel_shards,
                 },
             )
 
@@ -397,6 +447,8 @@ class DataShuttle:
             datatype,
             overwrite_existing_files,
             dry_run,
+            parallel_shards,
+            progress_callback,
         ).run()
 
         if display_transfer_output:
@@ -417,6 +469,8 @@ class DataShuttle:
         datatype: Union[List[str], str] = "all",
         overwrite_existing_files: OverwriteExistingFiles = "never",
         dry_run: bool = False,
+        parallel_shards: int = 1,
+        progress_callback: Optional[Callable[[TransferProgress], None]] = None,
         init_log: bool = True,
         display_transfer_output: bool = True,
     ) -> TransferOutput:
@@ -455,6 +509,14 @@ class DataShuttle:
             Perform a dry-run of transfer. This will output as if file
             transfer was taking place, but no files will be moved.
 
+        parallel_shards
+            The number of rclone transfers to run at once (see ``upload_custom``).
+
+        progress_callback
+            If not ``None``, a function called with a ``TransferProgress``
+            (bytes and files transferred, speed and ETA) about once a
+            second while the transfer runs.
+
         init_log
             Whether to handle logging. This should
             always be ``True``, unless logger is handled elsewhere
@@ -475,6 +537,7 @@ class DataShuttle:
                     "datatype": datatype,
                     "overwrite_existing_files": overwrite_existing_files,
                     "dry_run": dry_run,
+                    "parallel_shards": parallel_shards,
                 },
             )
 
@@ -489,6 +552,8 @@ class DataShuttle:
             datatype,
             overwrite_existing_files,
             dry_run,
+            parallel_shards,
+            progress_callback,
         ).run()
 
         if display_transfer_output:
@@ -510,6 +575,8 @@ class DataShuttle:
         self,
         overwrite_existing_files: OverwriteExistingFiles = "never",
         dry_run: bool = False,
+        parallel_shards: int = 1,
+        progress_callback: Optional[Callable[[TransferProgress], None]] = None,
     ) -> TransferOutput:
         """Upload all files in the `rawdata` top level folder.
 
@@ -528,12 +595,22 @@ class DataShuttle:
             Perform a dry-run of transfer. This will output as if file
             transfer was taking place, but no files will be moved.
 
+        parallel_shards
+            The number of rclone transfers to run at once (see ``upload_custom``).
+
+        progress_callback
+            If not ``None``, a function called with a ``TransferProgress``
+            (bytes and files transferred, speed and ETA) about once a
+            second while the transfer runs.
+
         """
         return self._transfer_top_level_folder(
             "upload",
             "rawdata",
             overwrite_existing_files=overwrite_existing_files,
             dry_run=dry_run,
+            parallel_shards=parallel_shards,
+            progress_callback=progress_callback,
         )
 
     @check_configs_set
@@ -542,6 +619,8 @@ class DataShuttle:
         self,
         overwrite_existing_files: OverwriteExistingFiles = "never",
         dry_run: bool = False,
+        parallel_shards: int = 1,
+        progress_callback: Optional[Callable[[TransferProgress], None]] = None,
     ) -> TransferOutput:
         """Upload all files in the `derivatives` top level folder.
 
@@ -560,12 +639,22 @@ class DataShuttle:
             Perform a dry-run of transfer. This will output as if file
             transfer was taking place, but no files will be moved.
 
+        parallel_shards
+            The number of rclone transfers to run at once (see ``upload_custom``).
+
+        progress_callback
+            If not ``None``, a function called with a ``TransferProgress``
+            (bytes and files transferred, speed and ETA) about once a
+            second while the transfer runs.
+
         """
         return self._transfer_top_level_folder(
             "upload",
             "derivatives",
             overwrite_existing_files=overwrite_existing_files,
             dry_run=dry_run,
+            parallel_shards=parallel_shards,
+            progress_callback=progress_callback,
         )
 
     @check_configs_set
@@ -574,6 +663,8 @@ class DataShuttle:
         self,
         overwrite_existing_files: OverwriteExistingFiles = "never",
         dry_run: bool = False,
+        parallel_shards: int = 1,
+        progress_callback: Optional[Callable[[TransferProgress], None]] = None,
     ) -> TransferOutput:
         """Download all files in the `rawdata` top level folder.
 
@@ -592,12 +683,22 @@ class DataShuttle:
             Perform a dry-run of transfer. This will output as if file
             transfer was taking place, but no files will be moved..
 
+        parallel_shards
+            The number of rclone transfers to run at once (see ``upload_custom``).
+
+        progress_callback
+            If not ``None``, a function called with a ``TransferProgress``
+            (bytes and files transferred, speed and ETA) about once a
+            second while the transfer runs.
+
         """
         return self._transfer_top_level_folder(
             "download",
             "rawdata",
             overwrite_existing_files=overwrite_existing_files,
             dry_run=dry_run,
+            parallel_shards=parallel_shards,
+            progress_callback=progress_callback,
         )
 
     @check_configs_set
@@ -606,6 +707,8 @@ class DataShuttle:
         self,
         overwrite_existing_files: OverwriteExistingFiles = "never",
         dry_run: bool = False,
+        parallel_shards: int = 1,
+        progress_callback: Optional[Callable[[TransferProgress], None]] = None,
     ) -> TransferOutput:
         """Download all files in the `derivatives` top level folder.
 
@@ -624,12 +727,22 @@ class DataShuttle:
             Perform a dry-run of transfer. This will output as if file
             transfer was taking place, but no files will be moved.
 
+        parallel_shards
+            The number of rclone transfers to run at once (see ``upload_custom``).
+
+        progress_callback
+            If not ``None``, a function called with a ``TransferProgress``
+            (bytes and files transferred, speed and ETA) about once a
+            second while the transfer runs.
+
         """
         return self._transfer_top_level_folder(
             "download",
             "derivatives",
             overwrite_existing_files=overwrite_existing_files,
             dry_run=dry_run,
+            parallel_shards=parallel_shards,
+            progress_callback=progress_callback,
         )
 
     @check_configs_set
@@ -638,6 +751,8 @@ class DataShuttle:
         self,
         overwrite_existing_files: OverwriteExistingFiles = "never",
         dry_run: bool = False,
+        parallel_shards: int = 1,
+        progress_callback: Optional[Callable[[TransferProgress], None]] = None,
     ) -> TransferOutput:
         """Upload the entire project.
 
@@ -658,17 +773,30 @@ class DataShuttle:
             Perform a dry-run of transfer. This will output as if file
             transfer was taking place, but no files will be moved.
 
+        parallel_shards
+            The number of rclone transfers to run at once (see ``upload_custom``).
+
+        progress_callback
+            If not ``None``, a function called with a ``TransferProgress``
+            (bytes and files transferred, speed and ETA) about once a
+            second while the transfer runs.
+
         """
         self._start_log(
             "upload-entire-project",
             local_vars={
                 "overwrite_existing_files": overwrite_existing_files,
                 "dry_run": dry_run,
+                "parallel_shards": parallel_shards,
             },
         )
 
         transfer_output = self._transfer_entire_project(
-            "upload", overwrite_existing_files, dry_run
+            "upload",
+            overwrite_existing_files,
+            dry_run,
+            parallel_shards,
+            progress_callback,
         )
         ds_logger.close_log_filehandler()
 
@@ -680,6 +808,8 @@ class DataShuttle:
         self,
         overwrite_existing_files: OverwriteExistingFiles = "never",
         dry_run: bool = False,
+        parallel_shards: int = 1,
+        progress_callback: Optional[Callable[[TransferProgress], None]] = None,
     ) -> TransferOutput:
         """Download the entire project.
 
@@ -700,17 +830,30 @@ class DataShuttle:
             Perform a dry-run of transfer. This will output as if file
             transfer was taking place, but no files will be moved.
 
+        parallel_shards
+            The number of rclone transfers to run at once (see ``upload_custom``).
+
+        progress_callback
+            If not ``None``, a function called with a ``TransferProgress``
+            (bytes and files transferred, speed and ETA) about once a
+            second while the transfer runs.
+
         """
         self._start_log(
             "download-entire-project",
             local_vars={
                 "overwrite_existing_files": overwrite_existing_files,
                 "dry_run": dry_run,
+                "parallel_shards": parallel_shards,
             },
         )
 
         transfer_output = self._transfer_entire_project(
-            "download", overwrite_existing_files, dry_run
+            "download",
+            overwrite_existing_files,
+            dry_run,
+            parallel_shards,
+            progress_callback,
         )
 
         ds_logger.close_log_filehandler()
@@ -724,6 +867,7 @@ class DataShuttle:
         filepath: Union[str, Path],
         overwrite_existing_files: OverwriteExistingFiles = "never",
         dry_run: bool = False,
+        progress_callback: Optional[Callable[[TransferProgress], None]] = None,
     ) -> TransferOutput:
         """Upload a specific file or folder.
 
@@ -749,6 +893,11 @@ class DataShuttle:
             Perform a dry-run of transfer. This will output as if file
             transfer was taking place, but no files will be moved.
 
+        progress_callback
+            If not ``None``, a function called with a ``TransferProgress``
+            (bytes and files transferred, speed and ETA) about once a
+            second while the transfer runs.
+
         """
         self._start_log(
             "upload-specific-folder-or-file",
@@ -760,7 +909,11 @@ class DataShuttle:
         )
 
         transfer_output = self._transfer_specific_file_or_folder(
-            "upload", filepath, overwrite_existing_files, dry_run
+            "upload",
+            filepath,
+            overwrite_existing_files,
+            dry_run,
+            progress_callback,
         )
 
         ds_logger.close_log_filehandler()
@@ -774,6 +927,7 @@ class DataShuttle:
         filepath: Union[str, Path],
         overwrite_existing_files: OverwriteExistingFiles = "never",
         dry_run: bool = False,
+        progress_callback: Optional[Callable[[TransferProgress], None]] = None,
     ) -> TransferOutput:
         """Download a specific file or folder.
 
@@ -800,6 +954,11 @@ class DataShuttle:
             Perform a dry-run of transfer. This will output as if file
             transfer was taking place, but no files will be moved.
 
+        progress_callback
+            If not ``None``, a function called with a ``TransferProgress``
+            (bytes and files transferred, speed and ETA) about once a
+            second while the transfer runs.
+
         """
         self._start_log(
             "download-specific-folder-or-file",
@@ -811,7 +970,11 @@ class DataShuttle:
         )
 
         transfer_output = self._transfer_specific_file_or_folder(
-            "download", filepath, overwrite_existing_files, dry_run
+            "download",
+            filepath,
+            overwrite_existing_files,
+            dry_run,
+            progress_callback,
         )
 
         ds_logger.close_log_filehandler()
@@ -824,6 +987,8 @@ class DataShuttle:
         top_level_folder: TopLevelFolder,
         overwrite_existing_files: OverwriteExistingFiles = "never",
         dry_run: bool = False,
+        parallel_shards: int = 1,
+        progress_callback: Optional[Callable[[TransferProgress], None]] = None,
         init_log: bool = True,
         display_transfer_output: bool = True,
     ) -> TransferOutput:
@@ -840,6 +1005,7 @@ class DataShuttle:
                     "top_level_folder": top_level_folder,
                     "overwrite_existing_files": overwrite_existing_files,
                     "dry_run": dry_run,
+                    "parallel_shards": parallel_shards,
                 },
             )
 
@@ -856,6 +1022,8 @@ class DataShuttle:
             "all",
             overwrite_existing_files=overwrite_existing_files,
             dry_run=dry_run,
+            parallel_shards=parallel_shards,
+            progress_callback=progress_callback,
             init_log=False,
             display_transfer_output=display_transfer_output,
         )
@@ -866,7 +1034,12 @@ class DataShuttle:
         return transfer_output
 
     def _transfer_specific_file_or_folder(
-        self, upload_or_download, filepath, overwrite_existing_files, dry_run
+        self,
+        upload_or_download,
+        filepath,
+        overwrite_existing_files,
+        dry_run,
+        progress_callback=None,
     ) -> TransferOutput:
         """Core function for upload/download_specific_folder_or_file()."""
         if isinstance(filepath, str):
@@ -897,23 +1070,31 @@ class DataShuttle:
 
             processed_filepath = filepath
 
-        include_list = [f"--include /{processed_filepath.as_posix()}"]
+        include_list = [f"/{processed_filepath.as_posix()}"]
+
+        rclone_options = rclone.make_rclone_transfer_options(
+            overwrite_existing_files, dry_run
+        )
+        if progress_callback is not None:
+            rclone_options["stats_interval"] = (
+                data_transfer.PROGRESS_STATS_INTERVAL
+            )
 
-        output = rclone.transfer_data(
+        _, transfer_output = rclone.transfer_data(
             self.cfg,
             upload_or_download,
             top_level_folder,
             include_list,
-            rclone.make_rclone_transfer_options(
-                overwrite_existing_files, dry_run
-            ),
-        )
-        stdout, stderr, transfer_output = rclone.parse_rclone_copy_output(
-            top_level_folder, output
+            rclone_options,
+            progress_callback,
         )
-        rclone.log_stdout_stderr_python_api(stdout, stderr)
         rclone.log_rclone_transfer_output(transfer_output)
 
+        if not dry_run:
+            transfer_diff_cache.update_from_transferred_files(
+                self.cfg, transfer_output["transferred_file_names"]
+            )
+
         return transfer_output
 
     # -------------------------------------------------------------------------
@@ -1133,6 +1314,69 @@ class DataShuttle:
 
         self.cfg.rclone.set_rclone_config_encryption_state(False)
 
+    # -------------------------------------------------------------------------
+    # Rclone daemon
+    # -------------------------------------------------------------------------
+
+    @check_configs_set
+    @check_is_not_local_project
+    def start_rclone_daemon(self) -> None:
+        """Start a persistent rclone process for the central connection.
+
+        By default, every search of central and every transfer starts
+        a new rclone process (which, for SSH, AWS and Google Drive, opens a
+        new connection to central). Once this is called, a single
+        `rclone rcd` process is run in the background and all central
+        searches, checks and transfers for the current `connection_method`
+        are sent to it, so connections are kept open between calls.
+
+        The daemon runs until `stop_rclone_daemon()` is
+        called or Python exits.
+        """
+        rclone.start_rclone_daemon(self.cfg)
+
+    @check_configs_set
+    def stop_rclone_daemon(self) -> None:
+        """Stop the rclone process started with `start_rclone_daemon()`."""
+        rclone.stop_rclone_daemon(self.cfg)
+
+    # -------------------------------------------------------------------------
+    # Logging
+    # -------------------------------------------------------------------------
+
+    def set_logging_mode(self, logging_mode: LoggingMode) -> None:
+        """Set how the commands run in this session are logged.
+
+        Every command writes a log file to the project's `.datashuttle/logs`
+        folder. The logging mode sets the fixed cost of starting each log.
+
+        Parameters
+        ----------
+        logging_mode
+            "full" (default) finds the git information of the
+            datashuttle install and copies the command's
+            arguments and the configs for every command.
+
+            "lightweight" writes log files with the same sections,
+            but finds the git and environment information and formats the
+            configs once per session (and when the configs change), and
+            reuses one log handler. This is suited to scripts that call
+            commands (e.g. ``upload_custom()``) many times.
+
+        """
+        if logging_mode not in ds_logger.get_logging_modes():
+            utils.log_and_raise_error(
+                f"`logging_mode` not recognised, must be one of: "
+                f"{ds_logger.get_logging_modes()}",
+                ValueError,
+            )
+
+        self._logging_mode = logging_mode
+
+    def get_logging_mode(self) -> LoggingMode:
+        """Return the logging mode set with `set_logging_mode()`."""
+        return self._logging_mode
+
     # -------------------------------------------------------------------------
     # Configs
     # -------------------------------------------------------------------------
@@ -1523,12 +1767,19 @@ class DataShuttle:
         include_central: bool = False,
         strict_mode: bool = False,
         allow_letters_in_sub_ses_values: bool = False,
-    ) -> List[str]:
+        num_workers: int = 1,
+        max_errors: Optional[int] = None,
+        return_issues: bool = False,
+    ) -> List[str] | List[ValidationIssue]:
         """Perform validation on the project.
 
         This checks the subject and session level folders to
         ensure there are no NeuroBlueprint formatting issues.
 
+        The results for each local subject are cached in the project
+        ``.datashuttle`` folder, so that subjects that have not changed
+        since the last validation are not validated again.
+
         Parameters
         ----------
         top_level_folder
@@ -1559,6 +1810,22 @@ class DataShuttle:
 
             - Labels must be the same length (e.g. sub-01 and sub-002 is invalid).
 
+        num_workers
+            Number of threads used to scan and validate subjects concurrently,
+            which can speed up validation of projects on network-mounted storage.
+            Errors are reported in the same order for any number of workers.
+
+        max_errors
+            If set, validation stops once this many errors are found
+            (e.g. ``1`` to check only whether the project is valid).
+            By default, all errors are found.
+
+        return_issues
+            If ``True``, return a ``ValidationIssue`` for each error rather than
+            its message. Issues hold the error ``code``, folder ``name``, ``path``
+            and project ``level``, so can be filtered or grouped without parsing
+            the messages, and ``str(issue)`` gives the message.
+
         Returns
         -------
         error_messages
@@ -1597,6 +1864,10 @@ class DataShuttle:
             validation_templates=validation_templates,
             strict_mode=strict_mode,
             allow_letters_in_sub_ses_values=allow_letters_in_sub_ses_values,
+            num_workers=num_workers,
+            use_cache=True,
+            max_errors=max_errors,
+            return_issues=return_issues,
         )
 
         ds_logger.close_log_filehandler()
@@ -1659,6 +1930,8 @@ class DataShuttle:
         upload_or_download: Literal["upload", "download"],
         overwrite_existing_files: OverwriteExistingFiles,
         dry_run: bool,
+        parallel_shards: int = 1,
+        progress_callback: Optional[Callable[[TransferProgress], None]] = None,
     ) -> TransferOutput:
         """Transfer the entire project.
 
@@ -1679,6 +1952,8 @@ class DataShuttle:
                 top_level_folder,
                 overwrite_existing_files=overwrite_existing_files,
                 dry_run=dry_run,
+                parallel_shards=parallel_shards,
+                progress_callback=progress_callback,
                 init_log=False,
                 display_transfer_output=False,
             )
@@ -1717,7 +1992,9 @@ class DataShuttle:
 
         local_vars
             local_vars are passed to fancylog variables argument.
-            see ds_logger.wrap_variables_for_fancylog for more info
+            see ds_logger.wrap_variables_for_fancylog for more info.
+            In "lightweight" logging mode, they are logged
+            without copying (see `set_logging_mode()`).
 
         store_in_temp_folder
             If `False`, existing logging path will be used
@@ -1727,13 +2004,6 @@ class DataShuttle:
             Print warnings and error messages.
 
         """
-        if local_vars is None:
-            variables = None
-        else:
-            variables = ds_logger.wrap_variables_for_fancylog(
-                local_vars, self.cfg
-            )
-
         if store_in_temp_folder:
             path_to_save = self._temp_log_path
             self._clear_temp_log_path()
@@ -1742,6 +2012,23 @@ class DataShuttle:
 
         os.makedirs(path_to_save, exist_ok=True)
 
+        if self._logging_mode == "lightweight":
+            if self._cfg_log_snapshot is None:
+                self._cfg_log_snapshot = ds_logger.format_configs_for_log(
+                    self.cfg
+                )
+            ds_logger.start_lightweight(
+                path_to_save, command_name, local_vars, self._cfg_log_snapshot
+            )
+            return
+
+        if local_vars is None:
+            variables = None
+        else:
+            variables = ds_logger.wrap_variables_for_fancylog(
+                local_vars, self.cfg
+            )
+
         ds_logger.start(path_to_save, command_name, variables, verbose)
 
     def _move_logs_from_temp_folder(self) -> None:
@@ -1890,20 +2177,24 @@ class DataShuttle:
 
     def _save_persistent_settings(self, settings: Dict) -> None:
         """Save the settings dict to file as ".yaml"."""
-        with open(self._persistent_settings_path, "w") as settings_file:
-            yaml.dump(settings, settings_file, sort_keys=False)
+        yaml_files.dump_yaml(
+            settings, self._persistent_settings_path, sort_keys=False
+        )
 
     def _load_persistent_settings(self) -> Dict:
-        """Return settings that are stored persistently across datashuttle sessions."""
+        """Return settings that are stored persistently across datashuttle sessions.
+
+        The settings file is parsed (and updated with any new
+        canonical keys) only when it has changed on disk, otherwise
+        a copy of the settings loaded previously is returned.
+        """
         if not self._persistent_settings_path.is_file():
             self._init_persistent_settings()
 
-        with open(self._persistent_settings_path) as settings_file:
-            settings = yaml.full_load(settings_file)
-
-        self._update_settings_with_new_canonical_keys(settings)
-
-        return settings
+        return yaml_files.load_yaml(
+            self._persistent_settings_path,
+            update=self._update_settings_with_new_canonical_keys,
+        )
 
     def _update_settings_with_new_canonical_keys(self, settings: Dict) -> None:
         """Check and update keys within persistent settings if missing.
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Dict, List
+from typing import TYPE_CHECKING, Dict, Generator, List
 
 if TYPE_CHECKING:
     from datashuttle.utils.custom_types import (
         DisplayMode,
         TopLevelFolder,
     )
+    from datashuttle.utils.validation import ValidationIssue
 
 from pathlib import Path
 from typing import (
@@ -27,7 +28,10 @@ def validate_project_from_path(
     strict_mode: bool = False,
     validation_templates: Optional[Dict] = None,
     allow_letters_in_sub_ses_values: bool = False,
-) -> List[str]:
+    num_workers: int = 1,
+    max_errors: Optional[int] = None,
+    return_issues: bool = False,
+) -> List[str] | List[ValidationIssue]:
     """Perform validation on a NeuroBlueprint-formatted project.
 
     Parameters
@@ -64,11 +68,125 @@ def validate_project_from_path(
 
         - Labels must be the same length (e.g. sub-01 and sub-002 is invalid).
 
+    num_workers
+        Number of threads used to scan and validate subjects concurrently,
+        which can speed up validation of projects on network-mounted storage.
+        Errors are reported in the same order for any number of workers.
+
+    max_errors
+        If set, validation stops once this many errors are found
+        (e.g. ``1`` to check only whether the project is valid).
+        By default, all errors are found.
+
+    return_issues
+        If ``True``, return a ``ValidationIssue`` for each error rather than
+        its message. Issues hold the error ``code``, folder ``name``, ``path``
+        and project ``level``, so can be filtered or grouped without parsing
+        the messages, and ``str(issue)`` gives the message.
+
     Returns
     -------
     error_messages
         A list of validation errors found in the project.
 
+    """
+    cfg = _get_configs_for_project_path(project_path)
+
+    error_messages = validation.validate_project(
+        cfg=cfg,
+        top_level_folder_list=_format_top_level_folder(top_level_folder),
+        include_central=False,
+        display_mode=display_mode,
+        validation_templates=validation_templates,
+        strict_mode=strict_mode,
+        allow_letters_in_sub_ses_values=allow_letters_in_sub_ses_values,
+        num_workers=num_workers,
+        max_errors=max_errors,
+        return_issues=return_issues,
+    )
+
+    return error_messages
+
+
+def iter_validate_project_from_path(
+    project_path: str | Path,
+    top_level_folder: Optional[TopLevelFolder] = "rawdata",
+    strict_mode: bool = False,
+    validation_templates: Optional[Dict] = None,
+    allow_letters_in_sub_ses_values: bool = False,
+    num_workers: int = 1,
+    max_errors: Optional[int] = None,
+) -> Generator[ValidationIssue, None, None]:
+    """Perform validation on a NeuroBlueprint-formatted project, yielding issues as they are found.
+
+    The issues are the same, and in the same order, as
+    ``validate_project_from_path(..., return_issues=True)``,
+    but are not displayed.
+    The project is validated as the errors are consumed, so
+    stopping iteration early (e.g. on the first error) avoids
+    scanning the rest of the project.
+
+    Parameters
+    ----------
+    project_path
+        Path to the project to validate. Must include the project
+        name, and hold a "rawdata" or "derivatives" folder.
+
+    top_level_folder
+        The top-level folder ("rawdata" or "derivatives") to
+        perform validation. If `None`, both are checked.
+
+    strict_mode
+        If ``True``, only allow NeuroBlueprint-formatted folders to exist in
+        the project. See ``validate_project_from_path()``.
+
+    validation_templates
+        A dictionary of templates for subject and session name
+        to validate against. See ``DataShuttle.set_validation_templates()``
+        for details.
+
+    allow_letters_in_sub_ses_values
+        If `True`, any alphanumeric character are allowed for the values associated
+        with sub- or ses-  keys. Otherwise, values must be integer.
+
+    num_workers
+        Number of threads used to scan and validate subjects concurrently.
+
+    max_errors
+        If set, stop once this many errors have been yielded.
+
+    Yields
+    ------
+    issue
+        A validation issue found in the project, see ``ValidationIssue``.
+
+    """
+    cfg = _get_configs_for_project_path(project_path)
+
+    return validation.iter_validate_project(
+        cfg=cfg,
+        top_level_folder_list=_format_top_level_folder(top_level_folder),
+        include_central=False,
+        validation_templates=validation_templates,
+        strict_mode=strict_mode,
+        allow_letters_in_sub_ses_values=allow_letters_in_sub_ses_values,
+        num_workers=num_workers,
+        max_errors=max_errors,
+    )
+
+
+def _get_configs_for_project_path(project_path: str | Path) -> Configs:
+    """Create placeholder configs to validate the project at `project_path`.
+
+    Parameters
+    ----------
+    project_path
+        Path to the project to validate.
+
+    Returns
+    -------
+    Configs with the `local_path` set to the project path.
+
     """
     project_path = Path(project_path)
 
@@ -79,10 +197,7 @@ def validate_project_from_path(
             f"Cannot perform validation. No file or folder found at `project_path`: {project_path}"
         )
 
-    top_level_folders_to_validate = _format_top_level_folder(top_level_folder)
-
-    # Create some mock configs for the validation call,
-    # then for each top-level folder, run the validation
+    # Create some mock configs for the validation call.
     # Note `get_internal_datashuttle_from_path` generates a placeholder
     # folder path but this is not actually created.
     placeholder_configs = {
@@ -90,24 +205,12 @@ def validate_project_from_path(
     }
     placeholder_configs["local_path"] = Path(project_path)  # type: ignore
 
-    cfg = Configs(
+    return Configs(
         project_name=project_path.name,
         file_path=canonical_folders.get_internal_datashuttle_from_path(),
         input_dict=placeholder_configs,
     )
 
-    error_messages = validation.validate_project(
-        cfg=cfg,
-        top_level_folder_list=top_level_folders_to_validate,
-        include_central=False,
-        display_mode=display_mode,
-        validation_templates=validation_templates,
-        strict_mode=strict_mode,
-        allow_letters_in_sub_ses_values=allow_letters_in_sub_ses_values,
-    )
-
-    return error_messages
-
 
 def _format_top_level_folder(
     top_level_folder: TopLevelFolder | None,
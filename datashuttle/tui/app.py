@@ -8,25 +8,21 @@ if TYPE_CHECKING:
 
 from pathlib import Path
 
-import pyperclip
-import showinfm
-import yaml
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Container
 from textual.widgets import Button, Label
 
 from datashuttle.configs import canonical_folders
+
+# Other screens are imported when they are first opened,
+# so that the main window is shown quickly on start-up.
 from datashuttle.tui.screens import (
-    get_help,
     modal_dialogs,
-    new_project,
-    project_manager,
     project_selector,
-    settings,
-    validate_at_path,
 )
 from datashuttle.tui.tooltips import get_tooltip
+from datashuttle.utils import yaml_files
 
 
 class TuiApp(App, inherit_bindings=False):  # type: ignore
@@ -96,12 +92,16 @@ class TuiApp(App, inherit_bindings=False):  # type: ignore
             )
 
         elif event.button.id == "mainwindow_new_project_button":
+            from datashuttle.tui.screens import new_project
+
             self.push_screen(
                 new_project.NewProjectScreen(self),
                 self.load_project_page,
             )
 
         elif event.button.id == "mainwindow_settings_button":
+            from datashuttle.tui.screens import settings
+
             self.push_screen(
                 settings.SettingsScreen(
                     self,
@@ -109,9 +109,13 @@ class TuiApp(App, inherit_bindings=False):  # type: ignore
             )
 
         elif event.button.id == "mainwindow_get_help_button":
+            from datashuttle.tui.screens import get_help
+
             self.push_screen(get_help.GetHelpScreen())
 
         elif event.button.id == "mainwindow_validate_from_project_path":
+            from datashuttle.tui.screens import validate_at_path
+
             self.push_screen(validate_at_path.ValidateScreen(self))
 
         elif event.button.id == "mainwindow_exit_button":
@@ -159,12 +163,29 @@ class TuiApp(App, inherit_bindings=False):  # type: ignore
 
         """
         if interface:
+            from datashuttle.tui.screens import project_manager
+
+            if (
+                self.load_global_settings()["use_rclone_daemon"]
+                and not interface.project.is_local_project()
+            ):
+                success, output = interface.start_rclone_daemon()
+            else:
+                success = True
+
             self.push_screen(
                 project_manager.ProjectManagerScreen(
                     self, interface, id="project_manager_screen"
                 )
             )
 
+            if not success:
+                self.show_modal_error_dialog(
+                    f"Could not start the persistent rclone connection, "
+                    f"a new rclone process will be used for each "
+                    f"command.\n\n{output}"
+                )
+
     def show_modal_error_dialog(self, message: str) -> None:
         """Show an error in a pop-up window.
 
@@ -192,6 +213,9 @@ class TuiApp(App, inherit_bindings=False):  # type: ignore
             return
 
         try:
+            # `showinfm` is slow to import, so is imported only when used.
+            import showinfm
+
             showinfm.show_in_file_manager(str(path_))
         except Exception:
             if path_.is_file():
@@ -251,6 +275,8 @@ class TuiApp(App, inherit_bindings=False):  # type: ignore
                     path_.as_posix(),
                     path_.parent / f"{new_name}{path_.suffix}",
                 )
+            from datashuttle.tui.screens import project_manager
+
             assert isinstance(
                 self.screen, project_manager.ProjectManagerScreen
             )
@@ -279,8 +305,11 @@ class TuiApp(App, inherit_bindings=False):  # type: ignore
             global_settings = self.get_default_global_settings()
             self.save_global_settings(global_settings)
         else:
-            with open(settings_path) as file:
-                global_settings = yaml.full_load(file)
+            # Fill any settings added since the file was written.
+            global_settings = {
+                **self.get_default_global_settings(),
+                **yaml_files.load_yaml(settings_path),
+            }
 
         return global_settings
 
@@ -294,6 +323,7 @@ class TuiApp(App, inherit_bindings=False):  # type: ignore
         return {
             "dark_mode": True,
             "show_transfer_tree_status": False,
+            "use_rclone_daemon": False,
         }
 
     def save_global_settings(self, global_settings: Dict) -> None:
@@ -303,8 +333,7 @@ class TuiApp(App, inherit_bindings=False):  # type: ignore
         if not settings_path.parent.is_dir():
             settings_path.parent.mkdir(parents=True)
 
-        with open(settings_path, "w") as file:
-            yaml.dump(global_settings, file, sort_keys=False)
+        yaml_files.dump_yaml(global_settings, settings_path, sort_keys=False)
 
     def copy_to_clipboard(self, value) -> None:
         """Centralized function to copy to clipboard.
@@ -317,6 +346,8 @@ class TuiApp(App, inherit_bindings=False):  # type: ignore
             Value to copy to clipboard.
 
         """
+        import pyperclip
+
         try:
             pyperclip.copy(value)
         except pyperclip.PyperclipException:
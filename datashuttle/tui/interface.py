@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import copy
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 
 if TYPE_CHECKING:
     import subprocess
@@ -10,11 +10,19 @@ if TYPE_CHECKING:
 
     from datashuttle.configs.config_class import Configs
     from datashuttle.utils.custom_types import InterfaceOutput, TopLevelFolder
+    from datashuttle.utils.project_snapshot import LocalNamesSnapshot
+    from datashuttle.utils.transfer_progress_class import TransferProgress
 
 from datashuttle import DataShuttle
 from datashuttle.configs import load_configs
-from datashuttle.utils import aws, rclone, ssh, utils
-from datashuttle.utils.rclone import get_local_and_central_file_differences
+from datashuttle.utils import (
+    aws,
+    formatting,
+    rclone,
+    ssh,
+    transfer_diff_cache,
+    utils,
+)
 
 
 class Interface:
@@ -38,6 +46,7 @@ class Interface:
         self.project: DataShuttle
         self.validation_templates: Dict = {}
         self.tui_settings: Dict = {}
+        self.rclone_daemon_started: bool = False
 
         self.gdrive_rclone_setup_process: subprocess.Popen | None = None
         self.gdrive_setup_process_killed: bool = False
@@ -99,13 +108,23 @@ class Interface:
             The configs and new values to update.
 
         """
+        # The daemon is started for the `connection_method`,
+        # which may be changed, so it is restarted.
+        rclone_daemon_started = self.rclone_daemon_started
+        self.stop_rclone_daemon()
+
         try:
             self.project.update_config_file(**cfg_kwargs)
-            return True, None
 
         except Exception as e:
             return False, str(e)
 
+        finally:
+            if rclone_daemon_started and not self.project.is_local_project():
+                self.start_rclone_daemon()
+
+        return True, None
+
     def create_folders(
         self,
         sub_names: List[str],
@@ -153,6 +172,7 @@ class Interface:
         self,
         sub_names: List[str],
         ses_names: Optional[List[str]],
+        names_snapshot: Optional[LocalNamesSnapshot] = None,
     ) -> InterfaceOutput:
         """Validate a list of subject / session names.
 
@@ -169,6 +189,11 @@ class Interface:
         ses_names
             List of session names to format.
 
+        names_snapshot
+            If passed, names are validated against the project subject and
+            session names held in the snapshot, rather than searching the
+            project on every call.
+
         """
         top_level_folder = self.tui_settings["top_level_folder_select"][
             "create_tab"
@@ -179,6 +204,14 @@ class Interface:
         ]
 
         try:
+            project_folder_paths = (
+                None
+                if names_snapshot is None
+                else names_snapshot.get_folder_paths(
+                    self.get_configs(), top_level_folder
+                )
+            )
+
             format_sub, format_ses = self.project._format_and_validate_names(
                 top_level_folder,
                 sub_names,
@@ -186,11 +219,12 @@ class Interface:
                 self.get_validation_templates(),
                 bypass_validation=False,
                 allow_letters_in_sub_ses_values=allow_letters_in_sub_ses_values,
+                project_folder_paths=project_folder_paths,
             )
 
             return True, {
-                "format_sub": format_sub,
-                "format_ses": format_ses,
+                "format_sub": formatting.expand_names(format_sub),
+                "format_ses": formatting.expand_names(format_ses),
             }
 
         except Exception as e:
@@ -244,7 +278,11 @@ class Interface:
     # Transfer
     # ----------------------------------------------------------------------------------
 
-    def transfer_entire_project(self, upload: bool) -> InterfaceOutput:
+    def transfer_entire_project(
+        self,
+        upload: bool,
+        progress_callback: Optional[Callable[[TransferProgress], None]] = None,
+    ) -> InterfaceOutput:
         """Transfer the entire project (all canonical top-level folders).
 
         Parameters
@@ -253,6 +291,9 @@ class Interface:
             Upload from local to central if `True`, otherwise download
             from central to remote.
 
+        progress_callback
+            Called with a `TransferProgress` periodically during the transfer.
+
         """
         try:
             if upload:
@@ -265,6 +306,7 @@ class Interface:
                     "overwrite_existing_files"
                 ],
                 dry_run=self.tui_settings["dry_run"],
+                progress_callback=progress_callback,
             )
 
             return True, transfer_output
@@ -273,7 +315,10 @@ class Interface:
             return False, str(e)
 
     def transfer_top_level_only(
-        self, selected_top_level_folder: TopLevelFolder, upload: bool
+        self,
+        selected_top_level_folder: TopLevelFolder,
+        upload: bool,
+        progress_callback: Optional[Callable[[TransferProgress], None]] = None,
     ) -> InterfaceOutput:
         """Transfer all files within a selected top level folder.
 
@@ -286,6 +331,9 @@ class Interface:
             Upload from local to central if `True`, otherwise download
             from central to remote.
 
+        progress_callback
+            Called with a `TransferProgress` periodically during the transfer.
+
         """
         assert selected_top_level_folder in ["rawdata", "derivatives"]
 
@@ -308,6 +356,7 @@ class Interface:
                     "overwrite_existing_files"
                 ],
                 dry_run=self.tui_settings["dry_run"],
+                progress_callback=progress_callback,
             )
 
             return True, transfer_output
@@ -322,6 +371,7 @@ class Interface:
         ses_names: List[str],
         datatype: List[str],
         upload: bool,
+        progress_callback: Optional[Callable[[TransferProgress], None]] = None,
     ) -> InterfaceOutput:
         """Transfer a custom selection of subjects / sessions / datatypes.
 
@@ -343,6 +393,9 @@ class Interface:
             Upload from local to central if `True`, otherwise download
             from central to remote.
 
+        progress_callback
+            Called with a `TransferProgress` periodically during the transfer.
+
         """
         try:
             if upload:
@@ -359,6 +412,7 @@ class Interface:
                     "overwrite_existing_files"
                 ],
                 dry_run=self.tui_settings["dry_run"],
+                progress_callback=progress_callback,
             )
 
             return True, transfer_output
@@ -369,9 +423,14 @@ class Interface:
     def get_transfer_diffs(
         self, top_level_folders_to_check: List[TopLevelFolder]
     ) -> InterfaceOutput:
-        """Get a dict of differences between the local and central project."""
+        """Get a dict of differences between the local and central project.
+
+        Differences are read from the project's cache and only
+        files changed since they were last checked are re-checked
+        (see `transfer_diff_cache.TransferDiffCache`).
+        """
         try:
-            transfer_diffs = get_local_and_central_file_differences(
+            transfer_diffs = transfer_diff_cache.get_transfer_diffs(
                 self.get_configs(),
                 top_level_folders_to_check=top_level_folders_to_check,
             )
@@ -380,6 +439,27 @@ class Interface:
         except Exception as e:
             return False, str(e)
 
+    def start_rclone_daemon(self) -> InterfaceOutput:
+        """Start a persistent rclone process for the central connection.
+
+        This is used for all searches, checks and transfers
+        until `stop_rclone_daemon()` is called, see
+        `DataShuttle.start_rclone_daemon()`.
+        """
+        try:
+            self.project.start_rclone_daemon()
+            self.rclone_daemon_started = True
+            return True, None
+
+        except Exception as e:
+            return False, str(e)
+
+    def stop_rclone_daemon(self) -> None:
+        """Stop the rclone process started with `start_rclone_daemon()`, if running."""
+        if self.rclone_daemon_started:
+            self.project.stop_rclone_daemon()
+            self.rclone_daemon_started = False
+
     # Name templates
     # ----------------------------------------------------------------------------------
 
@@ -12,18 +12,21 @@ if TYPE_CHECKING:
 
     from datashuttle.tui.app import TuiApp
     from datashuttle.utils.custom_types import InterfaceOutput
+    from datashuttle.utils.transfer_progress_class import TransferProgress
 
 import platform
 from pathlib import Path
 
 import psutil
 from textual.containers import Container, Horizontal
+from textual.css.query import NoMatches
 from textual.screen import ModalScreen
 from textual.widgets import (
     Button,
     Input,
     Label,
     LoadingIndicator,
+    ProgressBar,
     Select,
     Static,
 )
@@ -182,14 +185,16 @@ class ConfirmAndAwaitTransferPopup(ModalScreen):
     """A popup screen for confirming, awaiting and finishing a Transfer.
 
     When users select Transfer, this screen pops up to a) allow users to confirm transfer b) display
-    a `LoadingIndicator` while the transfer runs in a separate worker c) indicate the transfer is finished.
+    a `ProgressBar` while the transfer runs in a separate worker c) indicate the transfer is finished.
     It is much easier to handle this on a single screen, rather than open / close screens at each stage.
     """
 
     def __init__(
         self,
         message: str,
-        transfer_func: Callable[[], Worker[InterfaceOutput]],
+        transfer_func: Callable[
+            [Callable[[TransferProgress], None]], Worker[InterfaceOutput]
+        ],
     ) -> None:
         """Initialise the ConfirmAndAwaitTransferPopup.
 
@@ -199,7 +204,8 @@ class ConfirmAndAwaitTransferPopup(ModalScreen):
             Message to display while running the transfer.
 
         transfer_func
-            Function to run in a worker that performs the transfer.
+            Function to run in a worker that performs the transfer. It is
+            passed a callback to report the transfer progress.
 
         """
         super().__init__()
@@ -231,15 +237,43 @@ class ConfirmAndAwaitTransferPopup(ModalScreen):
             )
 
             self.query_one("#confirm_message_label").update("Transferring...")
-            loading_indicator = LoadingIndicator(id="loading_indicator")
-            self.query_one("#confirm_top_container").mount(loading_indicator)
+
+            # The progress bar is indeterminate until the first progress update.
+            self.query_one("#confirm_top_container").mount(
+                ProgressBar(id="transfer_progress_bar", show_eta=False),
+                Label("", id="transfer_progress_label"),
+            )
         else:
             self.dismiss()
 
+    def on_transfer_progress(self, progress: TransferProgress) -> None:
+        """Update the progress bar, called from the transfer worker thread."""
+        self.app.call_from_thread(self.update_progress, progress)
+
+    def update_progress(self, progress: TransferProgress) -> None:
+        """Update the progress bar and throughput with the latest transfer progress."""
+        try:
+            progress_bar = self.query_one(
+                "#transfer_progress_bar", ProgressBar
+            )
+            progress_label = self.query_one("#transfer_progress_label", Label)
+        except NoMatches:
+            return
+
+        if progress.total_bytes > 0:
+            progress_bar.update(
+                total=progress.total_bytes,
+                progress=progress.bytes_transferred,
+            )
+
+        progress_label.update(progress.create_tui_message())
+
     async def handle_transfer_and_update_ui_when_complete(self) -> None:
         """Run the data transfer worker and updates the UI on completion."""
         try:
-            data_transfer_worker = self.transfer_func()
+            data_transfer_worker = self.transfer_func(
+                self.on_transfer_progress
+            )
             await data_transfer_worker.wait()
             success, transfer_output = data_transfer_worker.result
 
@@ -20,6 +20,7 @@ from datashuttle.tui.screens import modal_dialogs
 from datashuttle.tui.shared.configs_content import ConfigsContent
 from datashuttle.tui.shared.validate_content import ValidateContent
 from datashuttle.tui.tabs import create_folders, logging, transfer
+from datashuttle.tui.tabs.transfer_status_tree import TransferStatusTree
 
 
 class ProjectManagerScreen(Screen):
@@ -91,6 +92,10 @@ class ProjectManagerScreen(Screen):
                 id="tabscreen_logging_tab",
             )
 
+    def on_unmount(self) -> None:
+        """Stop the persistent rclone process, if started when the project was opened."""
+        self.interface.stop_rclone_daemon()
+
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Dismiss the TabScreen and return to the main menu."""
         if event.button.id == "all_main_menu_buttons":
@@ -102,7 +107,9 @@ class ProjectManagerScreen(Screen):
         """Handle a tab switch.
 
         Refresh the DirectoryTree for create or transfer tabs whenever
-        the TabbedContent is switched to one of these tabs.
+        the TabbedContent is switched to one of these tabs. When switching
+        away from the transfer tab, any running update of the transfer
+        status is cancelled (it is restarted when switching back).
 
         This is also triggered on mount, leading to it being reloaded
         twice, leading to a strange flicker. Ideally no trigger
@@ -113,6 +120,12 @@ class ProjectManagerScreen(Screen):
             self.tabbed_content_mount_signal = False
             return
 
+        if event.pane.id != "tabscreen_transfer_tab":
+            for transfer_tree in self.query("#transfer_directorytree").results(
+                TransferStatusTree
+            ):
+                transfer_tree.cancel_transfer_status_update()
+
         if event.pane.id in [
             "tabscreen_create_tab",
             "tabscreen_transfer_tab",
@@ -55,14 +55,22 @@ class SettingsScreen(ModalScreen):
                 value=self.global_settings["show_transfer_tree_status"],
                 id="show_transfer_tree_status_checkbox",
             ),
+            Checkbox(
+                "Keep a persistent rclone connection open",
+                value=self.global_settings["use_rclone_daemon"],
+                id="use_rclone_daemon_checkbox",
+            ),
             Button("Main Menu", id="all_main_menu_buttons"),
             id="generic_screen_container",
         )
 
     def on_mount(self) -> None:
         """Update widgets immediately after they have been mounted."""
-        id = "#show_transfer_tree_status_checkbox"
-        self.query_one(id).tooltip = get_tooltip(id)
+        for id in [
+            "#show_transfer_tree_status_checkbox",
+            "#use_rclone_daemon_checkbox",
+        ]:
+            self.query_one(id).tooltip = get_tooltip(id)
 
     def on_radio_set_changed(self, event: RadioSet.Changed) -> None:
         """Handle a radio set widget changed on SettingsScreen."""
@@ -77,7 +85,12 @@ class SettingsScreen(ModalScreen):
 
     def on_checkbox_changed(self, event: Checkbox.Changed) -> None:
         """Handle checkbox changed on SettingsScreen."""
-        self.global_settings["show_transfer_tree_status"] = event.value
+        if event.checkbox.id == "show_transfer_tree_status_checkbox":
+            self.global_settings["show_transfer_tree_status"] = event.value
+
+        elif event.checkbox.id == "use_rclone_daemon_checkbox":
+            self.global_settings["use_rclone_daemon"] = event.value
+
         self.mainwindow.save_global_settings(self.global_settings)
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 if TYPE_CHECKING:
     from pathlib import Path
 
     from textual.app import ComposeResult
+    from textual.timer import Timer
     from textual.worker import Worker
 
     from datashuttle.tui.app import TuiApp
@@ -16,6 +17,7 @@ from textual import work
 from textual.containers import Container, Horizontal
 from textual.widgets import (
     Button,
+    Input,
     Label,
 )
 
@@ -39,10 +41,19 @@ from datashuttle.tui.utils.tui_decorators import (
     require_double_click,
 )
 from datashuttle.tui.utils.tui_validators import NeuroBlueprintValidator
+from datashuttle.utils import project_snapshot
 
 
 class CreateFoldersTab(TreeAndInputTab):
-    """Create new project files formatted according to the NeuroBlueprint specification."""
+    """Create new project files formatted according to the NeuroBlueprint specification.
+
+    The subject and session inputs are validated against the project
+    once typing pauses for `VALIDATION_DEBOUNCE_S` seconds, using
+    a snapshot of the project subject and session names that is
+    refreshed after folders are created or the tree is reloaded.
+    """
+
+    VALIDATION_DEBOUNCE_S = 0.15
 
     def __init__(self, mainwindow: TuiApp, interface: Interface) -> None:
         """Initialise the CreateFoldersTab.
@@ -67,6 +78,9 @@ class CreateFoldersTab(TreeAndInputTab):
 
         self.click_info = ClickInfo()
 
+        self.names_snapshot = project_snapshot.LocalNamesSnapshot()
+        self.validation_timers: Dict[str, Timer] = {}
+
     def compose(self) -> ComposeResult:
         """Add widgets to the Create Folders tab."""
         yield CustomDirectoryTree(
@@ -79,7 +93,7 @@ class CreateFoldersTab(TreeAndInputTab):
             self.mainwindow,
             id="create_folders_subject_input",
             placeholder="e.g. sub-001",
-            validate_on=["changed", "submitted"],
+            validate_on=["submitted"],
             validators=[NeuroBlueprintValidator("sub", self)],
         )
         yield Label("Session(s)", id="create_folders_session_label")
@@ -87,7 +101,7 @@ class CreateFoldersTab(TreeAndInputTab):
             self.mainwindow,
             id="create_folders_session_input",
             placeholder="e.g. ses-001",
-            validate_on=["changed", "submitted"],
+            validate_on=["submitted"],
             validators=[NeuroBlueprintValidator("ses", self)],
         )
         yield Label("Datatype(s)", id="create_folders_datatype_label")
@@ -243,6 +257,29 @@ class CreateFoldersTab(TreeAndInputTab):
     # Validation
     # ----------------------------------------------------------------------------------
 
+    def on_input_changed(self, event: Input.Changed) -> None:
+        """Validate the subject or session input once typing has paused.
+
+        Each change restarts the timer, so that validation
+        is not run on every key press.
+        """
+        input = event.input
+
+        if input.id not in [
+            "create_folders_subject_input",
+            "create_folders_session_input",
+        ]:
+            return
+
+        timer = self.validation_timers.pop(input.id, None)
+        if timer is not None:
+            timer.stop()
+
+        self.validation_timers[input.id] = self.set_timer(
+            self.VALIDATION_DEBOUNCE_S,
+            lambda: input.validate(value=input.value),
+        )
+
     def revalidate_inputs(self, all_prefixes: List[str]) -> None:
         """Revalidate and style both subject and session inputs based on their value."""
         input_names = {
@@ -301,6 +338,7 @@ class CreateFoldersTab(TreeAndInputTab):
         but done for consistency with other tab refresh methods.
 
         """
+        self.names_snapshot.invalidate()
         self.revalidate_inputs(["sub", "ses"])
         self.query_one("#create_folders_directorytree").reload()
 
@@ -530,6 +568,7 @@ class CreateFoldersTab(TreeAndInputTab):
         success, output = self.interface.validate_names(
             sub_names,
             ses_names,
+            self.names_snapshot,
         )
 
         if not success:
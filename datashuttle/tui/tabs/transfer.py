@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Callable, Optional
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -12,6 +12,7 @@ if TYPE_CHECKING:
     from datashuttle.tui.custom_widgets import CustomDirectoryTree
     from datashuttle.tui.interface import Interface
     from datashuttle.utils.custom_types import InterfaceOutput
+    from datashuttle.utils.transfer_progress_class import TransferProgress
 
 from rich.text import Text
 from textual import work
@@ -378,7 +379,9 @@ class TransferTab(TreeAndInputTab):
     # ----------------------------------------------------------------------------------
 
     @work(exclusive=True, thread=True)
-    def transfer_data(self) -> Worker[InterfaceOutput]:
+    def transfer_data(
+        self, progress_callback: Callable[[TransferProgress], None]
+    ) -> Worker[InterfaceOutput]:
         """Transfer data in a threaded worker.
 
         This function transfers data based on the config provided by the radio buttons
@@ -389,6 +392,12 @@ class TransferTab(TreeAndInputTab):
         data transfer in a worker thread. The UI updates during and after transfer are
         handled by `ConfirmAndAwaitTransferPopup`.
 
+        Parameters
+        ----------
+        progress_callback
+            Called (from the worker thread) with the transfer progress,
+            to update the progress bar in `ConfirmAndAwaitTransferPopup`.
+
         Returns
         -------
         An InterfaceOutput object that indicates whether the transfer was a success.
@@ -398,7 +407,9 @@ class TransferTab(TreeAndInputTab):
         upload = not self.query_one("#transfer_switch").value
 
         if self.query_one("#transfer_all_radiobutton").value:
-            success, output = self.interface.transfer_entire_project(upload)
+            success, output = self.interface.transfer_entire_project(
+                upload, progress_callback
+            )
 
         elif self.query_one("#transfer_toplevel_radiobutton").value:
             selected_top_level_folder = self.query_one(
@@ -406,7 +417,7 @@ class TransferTab(TreeAndInputTab):
             ).get_top_level_folder()
 
             success, output = self.interface.transfer_top_level_only(
-                selected_top_level_folder, upload
+                selected_top_level_folder, upload, progress_callback
             )
 
         elif self.query_one("#transfer_custom_radiobutton").value:
@@ -431,6 +442,7 @@ class TransferTab(TreeAndInputTab):
                 ses_names,
                 datatype,
                 upload,
+                progress_callback,
             )
 
         self.app.call_from_thread(self.reload_directorytree)
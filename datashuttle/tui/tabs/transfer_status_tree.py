@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Dict, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 if TYPE_CHECKING:
     from rich.style import Style
@@ -8,17 +8,18 @@ if TYPE_CHECKING:
 
     from datashuttle.tui.app import TuiApp
     from datashuttle.tui.interface import Interface
-
-import os
-from pathlib import Path
+    from datashuttle.utils.custom_types import TopLevelFolder
 
 from rich.text import Text
+from textual import work
 from textual.widgets._tree import TOGGLE_STYLE, TreeNode
+from textual.worker import get_current_worker
 
 from datashuttle.configs import canonical_folders
 from datashuttle.tui.custom_widgets import (
     CustomDirectoryTree,
 )
+from datashuttle.utils import rclone_canceller
 
 
 class TransferStatusTree(CustomDirectoryTree):
@@ -50,15 +51,31 @@ class TransferStatusTree(CustomDirectoryTree):
         Attributes
         ----------
         Keep the local path as a string, linked to project.cfg["local_path"],
-        so that no conversion to string is necessary in `format_transfer_label`
-        which is called many times.
+        so that no conversion to string is necessary when building
+        `transfer_status_styles`.
+
+        `transfer_status_styles` maps the full path (posix) of every
+        file and folder with a transfer status to the style used to
+        display it, so `format_transfer_label` (which is called
+        for every node, on every render) is a single lookup. It is
+        built from `transfer_status_styles_by_top_level_folder`, which is
+        filled as the status of each top-level folder is computed.
+
+        `rclone_canceller` stops the rclone calls of a running
+        transfer status update, see `cancel_transfer_status_update()`.
 
         """
         self.interface = interface
         self.local_path_str = self.interface.get_configs()[
             "local_path"
         ].as_posix()
-        self.transfer_diffs: Dict = {}
+        self.transfer_status_styles: Dict[str, str] = {}
+        self.transfer_status_styles_by_top_level_folder: Dict[
+            str, Dict[str, str]
+        ] = {}
+        self.rclone_canceller: Optional[rclone_canceller.RcloneCanceller] = (
+            None
+        )
 
         super(TransferStatusTree, self).__init__(
             path=self.local_path_str, mainwindow=mainwindow, id=id
@@ -68,41 +85,144 @@ class TransferStatusTree(CustomDirectoryTree):
         """Update the directory tree after the widget is mounted."""
         self.update_transfer_tree(init=True)
 
+    def on_unmount(self) -> None:
+        """Stop any transfer status update when the tree is removed (e.g. switching project)."""
+        self.cancel_transfer_status_update()
+
     def update_transfer_tree(self, init: bool = False) -> None:
-        """Update tree styling to reflect the current TUI state and project transfer status."""
+        """Update tree styling to reflect the current TUI state and project transfer status.
+
+        The tree is displayed immediately, and the transfer status
+        is filled in as it is computed (see `transfer_status_worker()`).
+        """
         self.local_path_str = self.interface.get_configs()[
             "local_path"
         ].as_posix()
 
-        self.update_local_transfer_paths()
-
         if self.mainwindow.load_global_settings()["show_transfer_tree_status"]:
-            success, output = self.interface.get_transfer_diffs(
-                top_level_folders_to_check=["rawdata", "derivatives"]
+            self.cancel_transfer_status_update()
+
+            # Top-level folders the user has expanded are shown first.
+            top_level_folders = sorted(
+                canonical_folders.get_top_level_folders(),
+                key=lambda folder: (
+                    not self.is_expanded_top_level_folder(folder)
+                ),
             )
-            if success:
-                self.transfer_diffs = output
-            else:
-                self.mainwindow.show_modal_error_dialog(
-                    f"Could not update transfer tree status. See the below error:\n{output}"
-                )
-                return
+            self.rclone_canceller = rclone_canceller.RcloneCanceller()
+            self.transfer_status_worker(
+                top_level_folders, self.rclone_canceller
+            )
+
         if not init:
             self.reload()
 
-    def update_local_transfer_paths(self) -> None:
-        """Compiles a list of all project files and paths."""
-        paths_list = []
+    def is_expanded_top_level_folder(self, top_level_folder: str) -> bool:
+        """Return a bool indicating whether the top-level folder is expanded in the tree."""
+        return any(
+            node.is_expanded
+            for node in self.root.children
+            if node.data is not None
+            and node.data.path.name == top_level_folder
+        )
 
-        for top_level_folder in canonical_folders.get_top_level_folders():
-            walk_paths = os.walk(f"{self.local_path_str}/{top_level_folder}")
-            for path in walk_paths:
-                paths_list.append(Path(path[0]))
-                if path[2]:
-                    paths_list.extend(
-                        [Path(f"{path[0]}/{file}") for file in path[2]]
-                    )
-        self.transfer_paths = paths_list
+    @work(exclusive=True, thread=True, group="transfer_status")
+    def transfer_status_worker(
+        self,
+        top_level_folders: List[TopLevelFolder],
+        canceller: rclone_canceller.RcloneCanceller,
+    ) -> None:
+        """Compute the transfer status of each top-level folder in a worker thread.
+
+        Running `rclone check` may take some time, so is not run on the
+        main thread. The styling of each top-level folder is updated as
+        soon as its status is computed. If cancelled (see
+        `cancel_transfer_status_update()`), any running rclone calls
+        are stopped and no further updates are made.
+        """
+        worker = get_current_worker()
+
+        for top_level_folder in top_level_folders:
+            with canceller.activate():
+                success, output = self.interface.get_transfer_diffs(
+                    top_level_folders_to_check=[top_level_folder]
+                )
+
+            if worker.is_cancelled or canceller.cancelled:
+                return
+
+            if not success:
+                self.app.call_from_thread(
+                    self.mainwindow.show_modal_error_dialog,
+                    f"Could not update transfer tree status. See the below error:\n{output}",
+                )
+                return
+
+            self.app.call_from_thread(
+                self.set_transfer_status, top_level_folder, output, canceller
+            )
+
+    def set_transfer_status(
+        self,
+        top_level_folder: str,
+        transfer_diffs: Dict[str, List[str]],
+        canceller: rclone_canceller.RcloneCanceller,
+    ) -> None:
+        """Update the tree styling with the transfer status of a top-level folder."""
+        if canceller.cancelled:
+            return
+
+        self.transfer_status_styles_by_top_level_folder[top_level_folder] = (
+            self.build_transfer_status_styles(transfer_diffs)
+        )
+
+        transfer_status_styles: Dict[str, str] = {}
+        for styles in self.transfer_status_styles_by_top_level_folder.values():
+            transfer_status_styles.update(styles)
+        self.transfer_status_styles = transfer_status_styles
+
+        # Clear the cached tree lines so labels are re-rendered.
+        self._invalidate()
+
+    def cancel_transfer_status_update(self) -> None:
+        """Cancel any running transfer status update, killing its rclone calls."""
+        self.workers.cancel_group(self, "transfer_status")
+
+        if self.rclone_canceller is not None:
+            self.rclone_canceller.cancel()
+            self.rclone_canceller = None
+
+    def build_transfer_status_styles(
+        self, transfer_diffs: Dict[str, List[str]]
+    ) -> Dict[str, str]:
+        """Map each file and folder with a transfer status to its display style.
+
+        Files are styled according to their own status. Folders are styled
+        by the files they contain, with changed files ("different") taking
+        precedence over files found in local only, then over errors.
+        Files that are the same across local and central are not styled.
+        """
+        transfer_status_styles: Dict[str, str] = {}
+
+        # In order of increasing precedence, so later statuses overwrite earlier ones.
+        for status, style in [
+            ("error", "bright_red"),
+            ("local_only", "green3"),
+            ("different", "gold3"),
+        ]:
+            for relative_path in transfer_diffs[status]:
+                path_ = f"{self.local_path_str}/{relative_path}"
+                transfer_status_styles[path_] = style
+
+                parent, _, _ = path_.rpartition("/")
+                while len(parent) > len(self.local_path_str):
+                    if transfer_status_styles.get(parent) == style:
+                        # Ancestors were already set by a sibling.
+                        break
+                    transfer_status_styles[parent] = style
+                    parent, _, _ = parent.rpartition("/")
+
+        return transfer_status_styles
 
     # Overridden Methods
     # ----------------------------------------------------------------------------------
@@ -147,7 +267,7 @@ class TransferStatusTree(CustomDirectoryTree):
                 ),
             )
 
-        if self.transfer_diffs:
+        if self.transfer_status_styles:
             self.format_transfer_label(node_label, node_path)
 
         text = Text.assemble(prefix, node_label)
@@ -158,21 +278,10 @@ class TransferStatusTree(CustomDirectoryTree):
 
         Takes nodes being formatted using `render_label` and applies custom
         formatting according to the node's transfer status.
+        Sub- and ses-level folders are styled if files within have changed,
+        see `build_transfer_status_styles()`.
         """
-        node_relative_path = node_path.as_posix().replace(
-            f"{self.local_path_str}/", ""
-        )
+        style = self.transfer_status_styles.get(node_path.as_posix())
 
-        # Checks whether the current node's file path is staged for transfer
-        if node_path in self.transfer_paths:
-            # Sets sub- and ses-level folders to orange if files within have changed
-            # fmt: off
-            if node_relative_path in self.transfer_diffs["same"]:
-                pass
-            elif node_relative_path in self.transfer_diffs["different"] or any([node_relative_path in file for file in self.transfer_diffs["different"]]):
-                node_label.stylize_before("gold3")
-            elif node_relative_path in self.transfer_diffs["local_only"] or any([node_relative_path in file for file in self.transfer_diffs["local_only"]]):
-                node_label.stylize_before("green3")
-            elif node_label.plain in self.transfer_diffs["error"] or any([node_relative_path in file for file in self.transfer_diffs["error"]]):
-                node_label.stylize_before("bright_red")
-            # fmt: on
+        if style is not None:
+            node_label.stylize_before(style)
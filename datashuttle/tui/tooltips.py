@@ -120,6 +120,17 @@ def get_tooltip(id: str) -> str:
             "using an SSH connection."
         )
 
+    # Use a persistent rclone connection checkbox
+    elif id == "#use_rclone_daemon_checkbox":
+        tooltip = (
+            "When a project is opened, start a single rclone process that "
+            "is used for all searches, checks and transfers until the "
+            "project is closed. This keeps the connection to central open "
+            "between commands, which is faster in particular for SSH, "
+            "AWS and Google Drive connections.\n\n"
+            "Applies to projects opened after this is changed."
+        )
+
     # Tabscreen - Create tab
     # -------------------------------------------------------------------------
 
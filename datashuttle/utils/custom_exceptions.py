@@ -8,3 +8,9 @@ class NeuroBlueprintError(Exception):
     """Raise an error when something doesn't conform to the NeuroBlueprint pattern."""
 
     pass
+
+
+class RcloneCallCancelledError(Exception):
+    """Raise an error when an rclone call is cancelled (see `RcloneCanceller`)."""
+
+    pass
@@ -12,6 +12,8 @@ OverwriteExistingFiles = Literal[
 
 Prefix = Literal["sub", "ses"]
 
+LoggingMode = Literal["full", "lightweight"]
+
 InterfaceOutput = Tuple[bool, Any]
 
 ConnectionMethods = Literal[
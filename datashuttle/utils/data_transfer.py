@@ -1,15 +1,35 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Literal, Optional, Union
+from typing import Callable, Dict, List, Literal, Optional, Tuple, Union
 
 from datashuttle.configs import canonical_folders
 from datashuttle.configs.config_class import Configs
-from datashuttle.utils import folders, formatting, rclone, utils
+from datashuttle.utils import (
+    folders,
+    formatting,
+    project_snapshot,
+    rclone,
+    transfer_diff_cache,
+    utils,
+)
 from datashuttle.utils.custom_types import (
     OverwriteExistingFiles,
     Prefix,
     TopLevelFolder,
 )
 from datashuttle.utils.transfer_output_class import TransferOutput
+from datashuttle.utils.transfer_progress_class import TransferProgress
+
+# The maximum number of files rclone transfers at once, summed across all
+# shards when `parallel_shards > 1`. Rclone transfers 4 files at once
+# by default, this number is split between shards so they do not
+# over-subscribe the central storage.
+MAX_CONCURRENT_TRANSFERS = 16
+RCLONE_DEFAULT_TRANSFERS = 4
+
+# How often rclone outputs transfer stats when a progress callback is passed.
+PROGRESS_STATS_INTERVAL = "1s"
 
 
 class TransferData:
@@ -18,6 +38,9 @@ class TransferData:
     This works by first building a large list of all
     files to transfer. Then, rclone is called
     once with this list to perform the transfer.
+    If `parallel_shards` is greater than one, the list is split
+    by subject into shards which are transferred by concurrent
+    rclone calls.
 
     The properties on this class are to be read during generation
     of transfer lists and should never be changed during the lifetime
@@ -34,6 +57,8 @@ class TransferData:
         datatype: Union[str, List[str]],
         overwrite_existing_files: OverwriteExistingFiles,
         dry_run: bool,
+        parallel_shards: int = 1,
+        progress_callback: Optional[Callable[[TransferProgress], None]] = None,
     ):
         """Initialise TransferData.
 
@@ -74,6 +99,18 @@ class TransferData:
             Perform a dry-run of transfer. This will output as if file
             transfer was taking place, but no files will be moved.
 
+        parallel_shards
+            The number of rclone copies to run at once. Files are split
+            into shards by subject (or top-level folder / file, for
+            non-subject items). Shards are capped so that the total number
+            of concurrent file transfers does not exceed
+            `MAX_CONCURRENT_TRANSFERS`.
+
+        progress_callback
+            If not `None`, called with a `TransferProgress` every
+            `PROGRESS_STATS_INTERVAL` while the transfer runs. If the
+            transfer is sharded, the progress of all shards is combined.
+
         """
         self.__cfg = cfg
         self.__upload_or_download = upload_or_download
@@ -86,6 +123,8 @@ class TransferData:
         )
         self.__overwrite_existing_files = overwrite_existing_files
         self.__dry_run = dry_run
+        self.__parallel_shards = parallel_shards
+        self.__progress_callback = progress_callback
 
         self.sub_names = self.to_list(sub_names)
         self.ses_names = self.to_list(ses_names)
@@ -94,33 +133,80 @@ class TransferData:
         self.check_input_arguments()
 
     def run(self) -> TransferOutput:
-        """Run the transfer."""
-        include_list = self.build_a_list_of_all_files_and_folders_to_transfer()
+        """Run the transfer.
 
-        if any(include_list):
-            output = rclone.transfer_data(
-                self.__cfg,
-                self.__upload_or_download,
-                self.__top_level_folder,
-                include_list,
-                rclone.make_rclone_transfer_options(
-                    self.__overwrite_existing_files, self.__dry_run
-                ),
+        When downloading, central is searched for the files to transfer.
+        This is done from a single snapshot of the central top-level folder.
+        """
+        with project_snapshot.central_snapshots(
+            self.__cfg,
+            [self.__top_level_folder],
+            include_central=self.__local_or_central == "central",
+        ):
+            include_lists = self.build_include_lists_for_each_shard()
+
+        if any(include_lists):
+            rclone_options = rclone.make_rclone_transfer_options(
+                self.__overwrite_existing_files, self.__dry_run
             )
 
-            stdout, stderr, transfer_output = rclone.parse_rclone_copy_output(
-                self.__top_level_folder, output
+            if len(include_lists) > 1:
+                rclone_options["transfers"] = max(
+                    1,
+                    min(
+                        RCLONE_DEFAULT_TRANSFERS,
+                        MAX_CONCURRENT_TRANSFERS // len(include_lists),
+                    ),
+                )
+
+            if self.__progress_callback is not None:
+                rclone_options["stats_interval"] = PROGRESS_STATS_INTERVAL
+
+            shard_progress_callbacks = self.make_shard_progress_callbacks(
+                len(include_lists)
             )
 
-            if output.returncode != 0 and not any(
-                transfer_output["errors"]["messages"]
-            ):
-                raise RuntimeError(
-                    "Errors were detected in transfer but not reported properly. "
-                    "Please contact the datashuttle team."
+            def transfer_shard(shard_idx: int):
+                return rclone.transfer_data(
+                    self.__cfg,
+                    self.__upload_or_download,
+                    self.__top_level_folder,
+                    include_lists[shard_idx],
+                    rclone_options,
+                    shard_progress_callbacks[shard_idx],
+                )
+
+            with ThreadPoolExecutor(
+                max_workers=len(include_lists)
+            ) as executor:
+                outputs = list(
+                    executor.map(transfer_shard, range(len(include_lists)))
                 )
 
-            rclone.log_stdout_stderr_python_api(stdout, stderr)
+            shard_transfer_outputs = []
+
+            for returncode, transfer_output in outputs:
+                if returncode != 0 and not any(
+                    transfer_output["errors"]["messages"]
+                ):
+                    raise RuntimeError(
+                        "Errors were detected in transfer but not reported properly. "
+                        "Please contact the datashuttle team."
+                    )
+
+                shard_transfer_outputs.append(transfer_output)
+
+            if len(shard_transfer_outputs) == 1:
+                transfer_output = shard_transfer_outputs[0]
+            else:
+                transfer_output = TransferOutput.merge_shard_outputs(
+                    self.__top_level_folder, shard_transfer_outputs
+                )
+
+            if not self.__dry_run:
+                transfer_diff_cache.update_from_transferred_files(
+                    self.__cfg, transfer_output["transferred_file_names"]
+                )
 
         else:
             utils.log_and_message("No files included. None transferred.")
@@ -129,12 +215,88 @@ class TransferData:
 
         return transfer_output
 
+    def make_shard_progress_callbacks(
+        self, num_shards: int
+    ) -> List[Optional[Callable[[TransferProgress], None]]]:
+        """Make a progress callback for each shard, that reports the combined progress of all shards."""
+        if self.__progress_callback is None or num_shards == 1:
+            return [self.__progress_callback] * num_shards
+
+        progress_callback = self.__progress_callback
+        latest_progress: Dict[int, TransferProgress] = {}
+        lock = threading.Lock()
+
+        def make_callback(shard_idx: int):
+            def shard_callback(progress: TransferProgress) -> None:
+                with lock:
+                    latest_progress[shard_idx] = progress
+                    combined_progress = TransferProgress.merge_shard_progress(
+                        list(latest_progress.values())
+                    )
+                progress_callback(combined_progress)
+
+            return shard_callback
+
+        return [make_callback(shard_idx) for shard_idx in range(num_shards)]
+
     # -------------------------------------------------------------------------
-    # Build the --include list
+    # Build the list of filter rules
     # -------------------------------------------------------------------------
 
-    def build_a_list_of_all_files_and_folders_to_transfer(self) -> List[str]:
-        """Build a list of every file to transfer based on the user-passed arguments.
+    def build_include_lists_for_each_shard(self) -> List[List[str]]:
+        """Build a list of every file to transfer, split into `parallel_shards` shards.
+
+        Paths are grouped by their first part (i.e. the subject, or a
+        non-subject folder or file in the top-level folder) so that all
+        data for a subject is transferred by the same rclone call. Groups
+        are assigned, largest first, to the shard with the fewest paths.
+
+        Returns
+        -------
+        A list of rclone filter rules for each shard. If there is
+        nothing to transfer, a single empty list.
+
+        """
+        sub_ses_dtype_include, extra_folder_names, extra_filenames = (
+            self.get_paths_to_transfer()
+        )
+
+        all_paths = [
+            (path_, True)
+            for path_ in sub_ses_dtype_include + extra_folder_names
+        ] + [(path_, False) for path_ in extra_filenames]
+
+        groups: Dict[str, List[Tuple[str, bool]]] = {}
+        for path_, recursive in all_paths:
+            groups.setdefault(path_.split("/")[0], []).append(
+                (path_, recursive)
+            )
+
+        num_shards = max(
+            1,
+            min(self.__parallel_shards, MAX_CONCURRENT_TRANSFERS, len(groups)),
+        )
+
+        shards: List[List[Tuple[str, bool]]] = [[] for _ in range(num_shards)]
+
+        for group in sorted(groups.values(), key=len, reverse=True):
+            min(shards, key=len).extend(group)
+
+        return [
+            self.make_include_rules(
+                [path_ for path_, recursive in shard if recursive]
+            )
+            + self.make_include_rules(
+                [path_ for path_, recursive in shard if not recursive],
+                recursive=False,
+            )
+            for shard in shards
+        ]
+
+    def get_paths_to_transfer(
+        self,
+    ) -> Tuple[List[str], List[str], List[str]]:
+        """Find the paths of every file and folder to transfer.
 
         This cycles through every subject, session and datatype
         and adds the outputs to three lists:
@@ -148,8 +310,7 @@ class TransferData:
 
         Returns
         -------
-        include_list
-            A list of paths to pass to rclone's `--include` flag.
+        The three lists of paths, relative to the top-level folder.
 
         """
         # Find sub names to transfer
@@ -199,32 +360,20 @@ class TransferData:
                     ses,
                 )
 
-        include_list = (
-            self.make_include_arg(sub_ses_dtype_include)
-            + self.make_include_arg(extra_folder_names)
-            + self.make_include_arg(extra_filenames, recursive=False)
-        )
-
-        return include_list
+        return sub_ses_dtype_include, extra_folder_names, extra_filenames
 
-    def make_include_arg(
+    def make_include_rules(
         self, list_of_paths: List[str], recursive: bool = True
     ) -> List[str]:
-        """Return the list of paths formatted to rclone's required `--include` flag format."""
-        if not any(list_of_paths):
-            return []
+        """Return the list of paths formatted as rclone filter rules.
 
+        Rules are anchored to the top-level folder. If `recursive`,
+        the rule includes everything within the folder at the path.
+        """
         if recursive:
+            return [f"/{path_}/**" for path_ in list_of_paths]
 
-            def include_arg(ele: str) -> str:
-                return f' --include "{ele}/**" '
-
-        else:
-
-            def include_arg(ele: str) -> str:
-                return f' --include "{ele}" '
-
-        return ["".join([include_arg(ele) for ele in list_of_paths])]
+        return [f"/{path_}" for path_ in list_of_paths]
 
     # -------------------------------------------------------------------------
     # Search for non-sub / ses / dtype folders and add them to list
@@ -432,6 +581,15 @@ class TransferData:
                     ValueError,
                 )
 
+        if (
+            not isinstance(self.__parallel_shards, int)
+            or self.__parallel_shards < 1
+        ):
+            utils.log_and_raise_error(
+                "`parallel_shards` must be an integer greater than zero.",
+                ValueError,
+            )
+
     # -------------------------------------------------------------------------
     # Format Arguments
     # -------------------------------------------------------------------------
@@ -8,21 +8,41 @@ if TYPE_CHECKING:
 
     from datashuttle.configs.configs import Configs
 
+import atexit
 import copy
+import io
 import logging
+import queue
 from datetime import datetime
-
-from fancylog import fancylog
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
 
 import datashuttle as package_to_log
 from datashuttle.utils import utils
 
+# Handler reused by every command logged in
+# "lightweight" mode, see `start_lightweight()`.
+_lightweight_handler: Optional[logging.StreamHandler] = None
+
+# Writes the records of the logger to the log file on a background
+# thread while logging is active, see `start_queue_listener()`.
+_queue_listener: Optional[QueueListener] = None
+
 
 def get_logger_name() -> str:
     """Return the name of the logger."""
     return "datashuttle"
 
 
+def get_logging_modes() -> List[str]:
+    """Return the modes commands can be logged in.
+
+    "full" logs every command with ``fancylog`` (see `start()`)
+    and "lightweight" with `start_lightweight()`.
+    """
+    return ["full", "lightweight"]
+
+
 def get_logger() -> Logger:
     """Return the instance of the logger object."""
     return logging.getLogger(get_logger_name())
@@ -60,6 +80,9 @@ def start(
         Verbosity passed to ``fancylog``.
 
     """
+    # `fancylog` is slow to import, so is imported only when logging starts.
+    from fancylog import fancylog
+
     filename = get_logging_filename(command_name)
 
     fancylog.start_logging(
@@ -75,9 +98,187 @@ def start(
         logger_name=get_logger_name(),
     )
     logger = get_logger()
+    start_queue_listener(logger)
+
+    logger.info(f"Starting logging for command {command_name}")
+
+
+def start_lightweight(
+    path_to_log: Path,
+    command_name: str,
+    local_vars: Optional[dict],
+    cfg_snapshot: str,
+) -> None:
+    """Initialise logging without the fixed cost of `start()` per command.
+
+    A log file is written for each command, with the same sections
+    as `start()`. However, the git, command line and Python version
+    sections are found once per session (finding the git information
+    is slow), the configs are passed already formatted (see
+    `format_configs_for_log()`) and `local_vars` are not deep-copied.
+    The same handler is reused for every command.
+
+    Parameters
+    ----------
+    path_to_log
+        Path to save the log file to.
+
+    command_name
+        Name of the datashuttle command run, which is included
+        in the log filename.
+
+    local_vars
+        Local variables to log, if `None` no variables are logged.
+
+    cfg_snapshot
+        The project configs, formatted for the log.
+
+    """
+    global _lightweight_handler
+
+    header = make_log_header_writer()
+    header.write_log_header(str(path_to_log), None)
+    header.file.write(get_environment_log_header())
+
+    if local_vars is not None:
+        header.write_variables([VariablesState(local_vars, cfg_snapshot)])
+    header.write_separated_section_header("LOGGING")
+
+    log_file = open(
+        path_to_log / f"{get_logging_filename(command_name)}.log",
+        "w",
+        encoding="utf-8",
+    )
+    log_file.write(header.file.getvalue())
+
+    # Write any records of the last command before reusing its handler.
+    stop_queue_listener()
+
+    if _lightweight_handler is None:
+        _lightweight_handler = logging.StreamHandler(log_file)
+        _lightweight_handler.setLevel(logging.DEBUG)
+        _lightweight_handler.setFormatter(make_log_formatter())
+    else:
+        previous_log_file = _lightweight_handler.setStream(log_file)
+        if previous_log_file is not None:
+            previous_log_file.close()
+
+    logger = get_logger()
+    logger.handlers = [_lightweight_handler]
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    start_queue_listener(logger)
+
     logger.info(f"Starting logging for command {command_name}")
 
 
+def start_queue_listener(logger: Logger) -> None:
+    """Move the handlers of `logger` behind a queue.
+
+    Logging a message only puts the record on a queue, and the
+    handlers (which write to the log file) are run on a background thread.
+    This means commands that log many messages do not wait on disk
+    (e.g. on network drives). The queue is written in full when
+    logging is closed, in `close_log_filehandler()`.
+    """
+    global _queue_listener
+
+    stop_queue_listener()
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+
+    _queue_listener = QueueListener(
+        log_queue, *logger.handlers, respect_handler_level=True
+    )
+    logger.handlers = [QueueHandler(log_queue)]
+
+    _queue_listener.start()
+
+
+def stop_queue_listener() -> List[logging.Handler]:
+    """Write all queued records and stop the background thread.
+
+    Returns
+    -------
+    The handlers that the queued records were written to.
+
+    """
+    global _queue_listener
+
+    if _queue_listener is None:
+        return []
+
+    _queue_listener.stop()
+    handlers = list(_queue_listener.handlers)
+    _queue_listener = None
+
+    return handlers
+
+
+# Write records still queued if Python exits while logging is active.
+atexit.register(stop_queue_listener)
+
+
+def get_file_handlers() -> List[logging.Handler]:
+    """Return the handlers that write the logger's records to file."""
+    if _queue_listener is None:
+        return []
+    return list(_queue_listener.handlers)
+
+
+@lru_cache(maxsize=1)
+def get_environment_log_header() -> str:
+    """Return the git, command line and Python version log sections.
+
+    These are the same for every command run in a
+    session, so are only found once.
+    """
+    header = make_log_header_writer()
+    header.write_git_info(package_to_log.__name__)
+    header.write_command_line_arguments()
+    header.write_python_version()
+
+    return header.file.getvalue()
+
+
+def make_log_header_writer():
+    """Return a ``fancylog`` log header that writes to a string buffer.
+
+    This is used to write log file sections in the same format as
+    ``fancylog`` but without writing a log file. The log header
+    `__init__` (which writes every section to file) is skipped.
+    """
+    from fancylog import fancylog
+
+    header = fancylog.LoggingHeader.__new__(fancylog.LoggingHeader)
+    header.package = package_to_log
+    header.file = io.StringIO()
+
+    return header
+
+
+def make_log_formatter() -> logging.Formatter:
+    """Return the log message formatter, as used by ``fancylog``."""
+    formatter = logging.Formatter(
+        "%(asctime)s - %(levelname)s"
+        " - %(processName)s %(filename)s:%(lineno)s"
+        " - %(message)s"
+    )
+    formatter.datefmt = "%Y-%m-%d %H:%M:%S %p"
+
+    return formatter
+
+
+def format_configs_for_log(cfg: Configs) -> str:
+    """Format the configs as they are written to the log.
+
+    In "lightweight" mode this is called once per session (and
+    when the configs change) rather than deep-copying
+    the configs for every command.
+    """
+    return str(cfg)
+
+
 def get_logging_filename(command_name: str) -> str:
     """Return the log filename.
 
@@ -128,23 +329,41 @@ def wrap_variables_for_fancylog(local_vars: dict, cfg: Configs) -> List:
     state for fancylog to log.
 
     """
+    variables = [VariablesState(copy.deepcopy(local_vars), copy.deepcopy(cfg))]
 
-    class VariablesState:
-        def __init__(self, local_vars_, cfg_):
-            local_vars_ = copy.deepcopy(local_vars_)
-            self.locals = local_vars_
-            self.cfg = copy.deepcopy(cfg_)
+    return variables
 
-    variables = [VariablesState(local_vars, cfg)]
 
-    return variables
+class VariablesState:
+    """Hold the variables logged for a command.
+
+    ``fancylog`` writes each attribute of this
+    class to the log as "<name>: <value>".
+    """
+
+    def __init__(self, local_vars: dict, cfg: Any):
+        """Hold the command's local variables and the project configs."""
+        self.locals = local_vars
+        self.cfg = cfg
 
 
 def close_log_filehandler() -> None:
-    """Remove handlers from all loggers."""
+    """Remove handlers from all loggers.
+
+    All queued records are written to the log
+    file before it is closed (see `start_queue_listener()`).
+    """
     logger = get_logger()
     logger.debug("Finished logging.")
     handlers = logger.handlers[:]
     for handler in handlers:
         logger.removeHandler(handler)
-        handler.close()
+
+    for handler in handlers + stop_queue_listener():
+        if handler is _lightweight_handler:
+            # Keep the handler to reuse for the next command.
+            log_file = handler.setStream(None)
+            if log_file is not None:
+                log_file.close()
+        else:
+            handler.close()
@@ -5,9 +5,11 @@ from typing import (
     TYPE_CHECKING,
     Any,
     Dict,
+    FrozenSet,
     List,
     Literal,
     Optional,
+    Set,
     Tuple,
     Union,
     overload,
@@ -20,14 +22,21 @@ if TYPE_CHECKING:
     from datashuttle.utils.custom_types import TopLevelFolder
 
 import fnmatch
+import os
 import re
 from datetime import datetime
 from pathlib import Path
 
 from datashuttle.configs import canonical_folders, canonical_tags
-from datashuttle.utils import rclone, utils, validation
+from datashuttle.utils import (
+    formatting,
+    project_index,
+    project_snapshot,
+    rclone,
+    utils,
+    validation,
+)
 from datashuttle.utils.custom_exceptions import NeuroBlueprintError
-from datashuttle.utils.utils import get_values_from_bids_formatted_name
 
 # -----------------------------------------------------------------------------
 # Create Folders
@@ -41,6 +50,7 @@ def create_folder_trees(
     ses_names: Union[str, list],
     datatype: Union[List[str], str],
     log: bool = True,
+    num_workers: int = 1,
 ) -> Dict[str, List[Path]]:
     """Entry method to make a full folder tree.
 
@@ -67,6 +77,9 @@ def create_folder_trees(
         whether to log or not. If True, logging must
         already be initialised.
 
+    num_workers
+        Number of threads used to make folders, see `create_folders_in_bulk()`.
+
     """
     datatype_passed = datatype not in [[""], ""]
 
@@ -89,52 +102,62 @@ def create_folder_trees(
         if error_message:
             utils.log_and_raise_error(error_message, NeuroBlueprintError)
 
-    for sub in sub_names:
+        datatype_names = get_datatype_folder_names(cfg, datatype, "ses")
+
+    # All folders in the tree are listed first, then made together.
+    # Any ranges of names (see `formatting.NameRange`) are only
+    # expanded here, one name at a time.
+    paths = []
+
+    for sub in formatting.iter_names(sub_names):
         sub_path = cfg.build_project_path(
             "local",
             sub,
             top_level_folder,
         )
-
-        create_folders(sub_path, log)
+        paths.append(sub_path)
 
         if not any(ses_names):
             all_paths["sub"].append(sub_path)
             continue
 
-        for ses in ses_names:
-            ses_path = cfg.build_project_path(
-                "local",
-                [sub, ses],
-                top_level_folder,
-            )
-
-            create_folders(ses_path, log)
+        for ses in formatting.iter_names(ses_names):
+            ses_path = sub_path / ses
+            paths.append(ses_path)
 
-            if datatype_passed:
-                make_datatype_folders(
-                    cfg,
-                    datatype,
-                    ses_path,
-                    "ses",
-                    save_paths=all_paths,
-                    log=log,
-                )
-            else:
+            if not datatype_passed:
                 all_paths["ses"].append(ses_path)
+                continue
+
+            for datatype_name in datatype_names:
+                datatype_path = ses_path / datatype_name
+                paths.append(datatype_path)
+
+                # Use the custom datatype names for the output.
+                all_paths.setdefault(datatype_name, []).append(datatype_path)
+
+    # Made folders are logged together in a single
+    # record, rather than one record per folder.
+    made_folders: List[Path] = []
+
+    try:
+        create_folders_in_bulk(
+            paths,
+            cfg.get_base_folder("local", top_level_folder),
+            num_workers=num_workers,
+            made_folders=made_folders,
+        )
+    finally:
+        if log:
+            log_made_folders(made_folders)
 
     return all_paths
 
 
-def make_datatype_folders(
-    cfg: Configs,
-    datatype: Union[list, str],
-    sub_or_ses_level_path: Path,
-    level: str,
-    save_paths: Dict,
-    log: bool = True,
-):
-    """Make datatype folder (e.g. behav) at the sub or ses level.
+def get_datatype_folder_names(
+    cfg: Configs, datatype: Union[list, str], level: str
+) -> List[str]:
+    """Return the names of the datatype folders (e.g. behav) made at a level.
 
     Checks folder_class.Folders attributes, whether the datatype
     is used and at the current level.
@@ -148,45 +171,28 @@ def make_datatype_folders(
         datatype (e.g. "behav", "all") to use. Use
         empty string ("") for none.
 
-    sub_or_ses_level_path
-        Full path to the subject
-        or session folder where the new folder
-        will be written.
-
     level
         The folder level that the
         folder will be made at, "sub" or "ses"
 
-    save_paths
-        A dictionary, which will be filled
-        with created paths split by datatype name.
-
-    log
-        whether to log on or not (if True, logging must
-        already be initialised).
-
     """
     datatype_items = cfg.get_datatype_as_dict_items(datatype)
 
-    for datatype_key, datatype_folder in datatype_items:  # type: ignore
-        if datatype_folder.level == level:
-            datatype_name = datatype_folder.name
-
-            datatype_path = sub_or_ses_level_path / datatype_name
-
-            create_folders(datatype_path, log)
-
-            # Use the custom datatype names for the output.
-            if datatype_name in save_paths:
-                save_paths[datatype_name].append(datatype_path)
-            else:
-                save_paths[datatype_name] = [datatype_path]
+    return [
+        datatype_folder.name
+        for _, datatype_folder in datatype_items  # type: ignore
+        if datatype_folder.level == level
+    ]
 
 
 # Create Folders Helpers --------------------------------------------------------
 
 
-def create_folders(paths: Union[Path, List[Path]], log: bool = True) -> None:
+def create_folders(
+    paths: Union[Path, List[Path]],
+    log: bool = True,
+    made_folders: Optional[List[Path]] = None,
+) -> None:
     """Make a path or list of paths if they do not already exist.
 
     Parameters
@@ -198,6 +204,11 @@ def create_folders(paths: Union[Path, List[Path]], log: bool = True) -> None:
         if True, log all made folders. This
         requires the logger to already be initialised.
 
+    made_folders
+        If passed, made folders are appended to this list rather than
+        logged, so many made folders can be logged together
+        with `log_made_folders()`.
+
     """
     if isinstance(paths, Path):
         paths = [paths]
@@ -205,8 +216,144 @@ def create_folders(paths: Union[Path, List[Path]], log: bool = True) -> None:
     for path_ in paths:
         if not path_.is_dir():
             path_.mkdir(parents=True)
-            if log:
-                utils.log(f"Made folder at path: {path_}")
+            if made_folders is not None:
+                made_folders.append(path_)
+            elif log:
+                log_made_folders([path_])
+
+
+def create_folders_in_bulk(
+    paths: List[Path],
+    base_folder: Path,
+    num_workers: int = 1,
+    made_folders: Optional[List[Path]] = None,
+) -> None:
+    """Make many folders, reading each existing folder only once.
+
+    Checking and making each folder with `is_dir()` and `mkdir(parents=True)`
+    calls `stat` on every path (and its parents), which is slow on
+    network-mounted drives. Instead, the folders that hold `paths` are
+    each read once (through the `ProjectIndex`) to find the missing folders
+    (see `find_missing_folders()`), which are made parent-first.
+
+    Parameters
+    ----------
+    paths
+        Paths of the folders to make, if they do not already exist.
+
+    base_folder
+        A folder that all `paths` are within (e.g. the top-level folder).
+
+    num_workers
+        Number of threads used to make the folders at each depth of the
+        tree concurrently, which can speed up making many folders on
+        network-mounted storage.
+
+    made_folders
+        If passed, the made folders are appended to this
+        list, in the order of `paths` with parents first.
+
+    """
+    missing_folders = find_missing_folders(paths, base_folder)
+
+    folders_by_depth: Dict[int, List[Path]] = {}
+    for path_ in missing_folders:
+        folders_by_depth.setdefault(len(path_.parts), []).append(path_)
+
+    made = set()
+
+    def make_folder(path_: Path) -> None:
+        # `exist_ok` as folders are matched by name, and the
+        # file system may not be case-sensitive.
+        path_.mkdir(exist_ok=True)
+        made.add(path_)
+
+    try:
+        for depth in sorted(folders_by_depth):
+            utils.map_in_threads(
+                make_folder, folders_by_depth[depth], num_workers
+            )
+    finally:
+        if made_folders is not None:
+            made_folders.extend(
+                path_ for path_ in missing_folders if path_ in made
+            )
+
+
+def find_missing_folders(paths: List[Path], base_folder: Path) -> List[Path]:
+    """Return the `paths` that do not exist, and any of their missing parents.
+
+    Within `base_folder`, the existing folders are found by reading
+    each parent folder once. `base_folder` and the folders that hold
+    it are checked with `is_dir()`.
+
+    Returns
+    -------
+    The missing folders without duplicates, in the order of
+    `paths` and with every folder after its parent.
+
+    """
+    index = project_index.get_project_index()
+
+    # Folders are handled as strings, as this is much
+    # faster than `Path` for many (e.g. 10,000s) of folders.
+    base = str(base_folder)
+    base_with_sep = os.path.join(base, "")
+
+    existing_folders: Set[str] = set()
+    missing_folders: Dict[str, None] = {}  # an ordered set
+    folder_names: Dict[str, FrozenSet[str]] = {}
+
+    def exists(folder: str) -> bool:
+        if folder in existing_folders:
+            return True
+        if folder in missing_folders:
+            return False
+
+        parent = os.path.dirname(folder)
+
+        if not folder.startswith(base_with_sep):
+            is_folder = os.path.isdir(folder)
+            if not is_folder and parent != folder:
+                exists(parent)
+
+        elif not exists(parent):
+            is_folder = False
+
+        else:
+            if parent not in folder_names:
+                node = index.get_node(Path(parent))
+                folder_names[parent] = frozenset(
+                    () if node is None else node.folder_names
+                )
+            is_folder = os.path.basename(folder) in folder_names[parent]
+
+        if is_folder:
+            existing_folders.add(folder)
+        else:
+            missing_folders[folder] = None
+
+        return is_folder
+
+    paths_by_folder = {str(path_): path_ for path_ in paths}
+
+    for folder in paths_by_folder:
+        exists(folder)
+
+    return [
+        paths_by_folder.get(folder) or Path(folder)
+        for folder in missing_folders
+    ]
+
+
+def log_made_folders(made_folders: List[Path]) -> None:
+    """Log the made folders in a single log record, one per line."""
+    if made_folders:
+        utils.log(
+            "\n".join(
+                f"Made folder at path: {path_}" for path_ in made_folders
+            )
+        )
 
 
 # -----------------------------------------------------------------------------
@@ -590,16 +737,12 @@ def filter_names_by_datetime_range(
 
         # If the datetime has a key, use that, otherwise
         # we assume it is in the position of the prefix (e.g. sub-<date>)
-        if format_type in candidate_basename:
-            value = get_values_from_bids_formatted_name(
-                [candidate_basename], format_type
-            )[0]
-
-        else:
-            prefix = candidate_basename[:3]
-            value = get_values_from_bids_formatted_name(
-                [candidate_basename], prefix
-            )[0]
+        key = (
+            format_type
+            if format_type in candidate_basename
+            else candidate_basename[:3]
+        )
+        value = utils.BidsName(candidate_basename, key).get_value(key)
 
         try:
             candidate_timepoint = datetime_object_from_string(
@@ -983,16 +1126,18 @@ def search_for_folders(
     ):
         assert search_path is not None
 
-        if not search_path.exists():
-            if verbose:
+        search_results = project_index.get_project_index().search(
+            search_path, search_prefix, return_full_path
+        )
+
+        if search_results is None:
+            if verbose and not search_path.exists():
                 utils.log_and_message(
                     f"No file found at {search_path.as_posix()}"
                 )
             return [], []
 
-        all_folder_names, all_filenames = search_local_filesystem(
-            search_path, search_prefix, return_full_path
-        )
+        all_folder_names, all_filenames = search_results
 
     else:
         all_folder_names, all_filenames = search_central_via_connection(
@@ -1014,6 +1159,8 @@ def search_local_filesystem(
 
     Partner function to `search_central_via_connection()` for use
     locally as is much faster than calling `rclone` through a new process.
+    Folder contents are read from the `ProjectIndex` (see `project_index.py`),
+    so repeated searches of unchanged folders do not re-read the filesystem.
 
     Parameters
     ----------
@@ -1030,18 +1177,14 @@ def search_local_filesystem(
         If `True`, return the full filepath, otherwise return only the folder/file name.
 
     """
-    all_folder_names = []
-    all_filenames = []
+    search_results = project_index.get_project_index().search(
+        search_path, search_prefix, return_full_path
+    )
 
-    for item in search_path.glob(search_prefix):
-        to_append = item if return_full_path else item.name
+    if search_results is None:
+        return [], []
 
-        if item.is_dir():
-            all_folder_names.append(to_append)
-        elif item.is_file():
-            all_filenames.append(to_append)
-
-    return sorted(all_folder_names), sorted(all_filenames)
+    return search_results
 
 
 def search_central_via_connection(
@@ -1071,17 +1214,27 @@ def search_central_via_connection(
     return_full_path
         If `True`, return the full filepath, otherwise return only the folder/file name.
 
+    Notes
+    -----
+    If a project snapshot covering the `search_path` is active (see
+    `project_snapshot.central_snapshots()`), the search is answered from
+    the snapshot and rclone is not called.
+
     """
+    snapshot_results = project_snapshot.search_active_snapshots(
+        cfg, search_path, search_prefix, return_full_path
+    )
+    if snapshot_results is not None:
+        return snapshot_results
+
     rclone_config_name = cfg.rclone.get_rclone_config_name(
         cfg["connection_method"]
     )
 
     final_search_path = search_path.as_posix() if search_path else ""
 
-    output = rclone.call_rclone_for_central_connection(
-        cfg,
-        f'lsjson {rclone_config_name}:"{final_search_path}" {rclone.get_config_arg(cfg)}',
-        pipe_std=True,
+    output = rclone.call_rclone_lsjson_for_central_connection(
+        cfg, final_search_path
     )
 
     all_folder_names: list = []
@@ -2,12 +2,24 @@ from __future__ import annotations
 
 import datetime
 import re
-from typing import TYPE_CHECKING, Dict, List, Optional, Union
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    overload,
+)
 
 if TYPE_CHECKING:
     from datashuttle.utils.custom_types import Prefix
 
-from datashuttle.configs.canonical_folders import canonical_reserved_keywords
+from datashuttle.configs import canonical_folders
 from datashuttle.configs.canonical_tags import tags
 from datashuttle.utils import utils, validation
 
@@ -16,13 +28,37 @@ from datashuttle.utils import utils, validation
 # -----------------------------------------------------------------------------
 
 
+@overload
+def check_and_format_names(
+    names: Union[list, str],
+    prefix: Prefix,
+    validation_templates: Optional[Dict] = ...,
+    bypass_validation: bool = ...,
+    allow_letters_in_sub_ses_values: bool = ...,
+    expand_ranges: Literal[True] = ...,
+) -> List[str]: ...
+
+
+@overload
+def check_and_format_names(
+    names: Union[list, str],
+    prefix: Prefix,
+    validation_templates: Optional[Dict] = ...,
+    bypass_validation: bool = ...,
+    allow_letters_in_sub_ses_values: bool = ...,
+    *,
+    expand_ranges: Literal[False],
+) -> List[Union[str, NameRange]]: ...
+
+
 def check_and_format_names(
     names: Union[list, str],
     prefix: Prefix,
     validation_templates: Optional[Dict] = None,
     bypass_validation: bool = False,
     allow_letters_in_sub_ses_values: bool = False,
-) -> List[str]:
+    expand_ranges: bool = True,
+) -> List[str] | List[Union[str, NameRange]]:
     """Format a list of subject or session names.
 
     This ensures all have sub- or ses- prefix, checks
@@ -57,6 +93,12 @@ def check_and_format_names(
     allow_letters_in_sub_ses_values
         If `True`, alphanumeric values will not raise an error.
 
+    expand_ranges
+        If `False`, names with the @TO@ tag are returned as a `NameRange`
+        rather than expanded into every name in the range. Validation
+        checks ranges without expanding them, so large ranges
+        (e.g. sub-0001@TO@9999) are only expanded when folders are made.
+
     Returns
     -------
     A list of formatted names.
@@ -68,7 +110,7 @@ def check_and_format_names(
     names_to_format, reserved_keywords = [], []
     for name in names:
         if (
-            name in canonical_reserved_keywords()
+            name in canonical_folders.canonical_reserved_keywords()
             or tags("*") in name
             or tags("DATETO") in name
             or tags("TIMETO") in name
@@ -84,7 +126,7 @@ def check_and_format_names(
         else:
             names_to_format.append(name)
 
-    formatted_names = format_names(names_to_format, prefix)
+    formatted_names = format_names(names_to_format, prefix, expand_ranges)
 
     if not bypass_validation:
         error_messages = validation.validate_list_of_names(
@@ -99,7 +141,27 @@ def check_and_format_names(
     return formatted_names + reserved_keywords
 
 
-def format_names(names: List, prefix: Prefix) -> List[str]:
+@overload
+def format_names(
+    names: List, prefix: Prefix, expand_ranges: Literal[True] = ...
+) -> List[str]: ...
+
+
+@overload
+def format_names(
+    names: List, prefix: Prefix, expand_ranges: Literal[False]
+) -> List[Union[str, NameRange]]: ...
+
+
+@overload
+def format_names(
+    names: List, prefix: Prefix, expand_ranges: bool
+) -> List[str] | List[Union[str, NameRange]]: ...
+
+
+def format_names(
+    names: List, prefix: Prefix, expand_ranges: bool = True
+) -> List[str] | List[Union[str, NameRange]]:
     """Check a single or list of input session or subject names.
 
     First check the type is correct, next prepend the prefix
@@ -115,6 +177,10 @@ def format_names(names: List, prefix: Prefix) -> List[str]:
     prefix
         "sub" or "ses" - this defines the prefix checks.
 
+    expand_ranges
+        If `False`, names with the @TO@ tag are returned
+        as a `NameRange`, see `check_and_format_names()`.
+
     Returns
     -------
     A list of formatted names.
@@ -131,11 +197,181 @@ def format_names(names: List, prefix: Prefix) -> List[str]:
 
     prefixed_names = add_missing_prefixes_to_names(names, prefix)
 
-    prefixed_names = update_names_with_range_to_flag(prefixed_names, prefix)
+    names_and_ranges = parse_names_with_range_to_flag(prefixed_names, prefix)
+
+    # Any date or time tags of a range are in the rest of the name after the
+    # sub- or ses- value, so are replaced there for all names in the range.
+    names_to_update = [
+        name.name_end_str if isinstance(name, NameRange) else name
+        for name in names_and_ranges
+    ]
+    update_names_with_datetime(names_to_update)
+
+    for i, updated_name in enumerate(names_to_update):
+        if isinstance(names_and_ranges[i], NameRange):
+            names_and_ranges[i].name_end_str = updated_name  # type: ignore
+        else:
+            names_and_ranges[i] = updated_name
+
+    if expand_ranges:
+        return expand_names(names_and_ranges)
+
+    return names_and_ranges
+
+
+class NameRange:
+    """A range of subject or session names, made from a name with the @TO@ tag.
+
+    For example, sub-001@TO@003_date-20220101 is the range of names
+    ["sub-001_date-20220101", ..., "sub-003_date-20220101"]. Names are
+    only made when the range is iterated over, so a large range
+    (e.g. sub-0001@TO@9999) can be checked without making every name
+    (see `validation.get_list_of_names_issues()`).
+
+    Parameters
+    ----------
+    name_start_str
+        Part of the name before the number, usually "sub-".
+
+    name_end_str
+        Rest of the name after the number, i.e. all other key-value pairs.
+
+    start, stop
+        The first and last number in the range (inclusive).
+
+    width
+        The minimum number of digits of the number, the number
+        is padded with leading zeros to this width.
 
-    update_names_with_datetime(prefixed_names)
+    """
+
+    __slots__ = ("name_start_str", "name_end_str", "start", "stop", "width")
+
+    def __init__(
+        self,
+        name_start_str: str,
+        name_end_str: str,
+        start: int,
+        stop: int,
+        width: int,
+    ) -> None:
+        """Initialise the NameRange."""
+        self.name_start_str = name_start_str
+        self.name_end_str = name_end_str
+        self.start = start
+        self.stop = stop
+        self.width = width
+
+    def __len__(self) -> int:
+        """Return the number of names in the range."""
+        return self.stop - self.start + 1
+
+    def __iter__(self) -> Iterator[str]:
+        """Make each name in the range, in order."""
+        for number in range(self.start, self.stop + 1):
+            yield self.get_name(number)
+
+    def __contains__(self, name: object) -> bool:
+        """Return a bool indicating whether `name` is a name in the range."""
+        return isinstance(name, str) and self.get_number(name) is not None
+
+    def __repr__(self) -> str:
+        """Return the range in the @TO@ format it was made from."""
+        return repr(str(self))
+
+    def __str__(self) -> str:
+        """Return the range in the @TO@ format, e.g. sub-001@TO@003_date-20220101."""
+        return (
+            f"{self.name_start_str}{self.get_value(self.start)}"
+            f"{tags('to')}{self.get_value(self.stop)}{self.name_end_str}"
+        )
 
-    return prefixed_names
+    @property
+    def prefix(self) -> str:
+        """The key of the numbered value, "sub" or "ses"."""
+        return self.name_start_str.rstrip("-")
+
+    def get_value(self, number: int) -> str:
+        """Return the sub- or ses- value for a number in the range e.g. 1 -> "001"."""
+        return str(number).zfill(self.width)
+
+    def get_name(self, number: int) -> str:
+        """Return the name for a number in the range."""
+        return (
+            f"{self.name_start_str}{self.get_value(number)}{self.name_end_str}"
+        )
+
+    def get_number(self, name: str) -> Optional[int]:
+        """Return the number of a name in the range, or `None` if `name` is not in the range."""
+        value_end = len(name) - len(self.name_end_str)
+
+        if (
+            value_end <= len(self.name_start_str)
+            or not name.startswith(self.name_start_str)
+            or not name.endswith(self.name_end_str)
+        ):
+            return None
+
+        return self.get_number_from_value(
+            name[len(self.name_start_str) : value_end]
+        )
+
+    def get_number_from_value(self, value: str) -> Optional[int]:
+        """Return the number with the sub- or ses- `value`, or `None` if not in the range."""
+        if not value.isdigit():
+            return None
+
+        number = int(value)
+
+        if not self.start <= number <= self.stop:
+            return None
+
+        if self.get_value(number) != value:
+            return None
+
+        return number
+
+    def get_value_lengths(self) -> Set[int]:
+        """Return the lengths of the sub- or ses- values of names in the range.
+
+        Numbers with more digits than the `width` are not padded,
+        e.g. sub-1@TO@10 has values of length 1 and 2.
+        """
+        return {
+            max(self.width, num_digits)
+            for num_digits in range(
+                len(str(self.start)), len(str(self.stop)) + 1
+            )
+        }
+
+
+def iter_names(names: Iterable[str | NameRange]) -> Iterator[str]:
+    """Yield each name, with each `NameRange` expanded into its names."""
+    for name in names:
+        if isinstance(name, NameRange):
+            yield from name
+        else:
+            yield name
+
+
+def expand_names(names: Iterable[str | NameRange]) -> List[str]:
+    """Return a list of names, with each `NameRange` expanded into its names."""
+    return list(iter_names(names))
+
+
+def split_name_ranges(
+    names: Iterable[str | NameRange],
+) -> Tuple[List[str], List[NameRange]]:
+    """Split a list of names into the names and the ranges of names (see `NameRange`)."""
+    single_names, name_ranges = [], []
+
+    for name in names:
+        if isinstance(name, NameRange):
+            name_ranges.append(name)
+        else:
+            single_names.append(name)
+
+    return single_names, name_ranges
 
 
 def update_names_with_range_to_flag(
@@ -153,7 +389,18 @@ def update_names_with_range_to_flag(
     names = ["sub-01", "sub-02@TO@04", "sub-05@TO@10"]
     will output a list of ["sub-01", ..., "sub-10"]
     """
-    new_names = []
+    return expand_names(parse_names_with_range_to_flag(names, prefix))
+
+
+def parse_names_with_range_to_flag(
+    names: List[str], prefix: str
+) -> List[str | NameRange]:
+    """Given a list of names, replace names with the @TO@ keyword with a `NameRange`.
+
+    See `update_names_with_range_to_flag()`, the names
+    in each range are not made.
+    """
+    new_names: List[str | NameRange] = []
 
     for i, name in enumerate(names):
         if tags("to") in name:
@@ -182,12 +429,11 @@ def update_names_with_range_to_flag(
                     ValueError,
                 )
 
-            names_with_new_number_inserted = (
-                make_list_of_zero_padded_names_across_range(
+            new_names.append(
+                make_name_range(
                     left_number, right_number, name_start_str, name_end_str
                 )
             )
-            new_names += names_with_new_number_inserted
 
         else:
             new_names.append(name)
@@ -244,23 +490,32 @@ def make_list_of_zero_padded_names_across_range(
         ["sub-001_date-20220101", "sub-002_date-20220101"].
 
     """
-    max_leading_zeros = max(
-        utils.num_leading_zeros(left_number),
-        utils.num_leading_zeros(right_number),
+    return list(
+        make_name_range(
+            left_number, right_number, name_start_str, name_end_str
+        )
     )
 
-    all_numbers = [*range(int(left_number), int(right_number) + 1)]
 
-    all_numbers_with_leading_zero = [
-        str(number).zfill(max_leading_zeros + 1) for number in all_numbers
-    ]
+def make_name_range(
+    left_number: str, right_number: str, name_start_str: str, name_end_str: str
+) -> NameRange:
+    """Make the `NameRange` of subject or session names across a range.
 
-    names_with_new_number_inserted = [
-        f"{name_start_str}{number}{name_end_str}"
-        for number in all_numbers_with_leading_zero
-    ]
+    See `make_list_of_zero_padded_names_across_range()`.
+    """
+    max_leading_zeros = max(
+        utils.num_leading_zeros(left_number),
+        utils.num_leading_zeros(right_number),
+    )
 
-    return names_with_new_number_inserted
+    return NameRange(
+        name_start_str,
+        name_end_str,
+        int(left_number),
+        int(right_number),
+        max_leading_zeros + 1,
+    )
 
 
 # Handle @DATE@, @DATETIME@, @TIME@ flags -------------------------------------
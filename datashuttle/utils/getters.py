@@ -20,7 +20,7 @@ if TYPE_CHECKING:
 import warnings
 
 from datashuttle.configs import canonical_folders
-from datashuttle.utils import folders, utils
+from datashuttle.utils import folders, project_snapshot, utils
 from datashuttle.utils.custom_exceptions import (
     ConfigError,
     NeuroBlueprintError,
@@ -96,9 +96,16 @@ def get_next_sub_or_ses(
     else:
         prefix = "sub"
 
-    folder_names = folders.search_project_for_sub_or_ses_names(
-        cfg, top_level_folder, sub, search_str, include_central=include_central
-    )
+    with project_snapshot.central_snapshots(
+        cfg, [top_level_folder], include_central
+    ):
+        folder_names = folders.search_project_for_sub_or_ses_names(
+            cfg,
+            top_level_folder,
+            sub,
+            search_str,
+            include_central=include_central,
+        )
 
     all_folders = list(set(folder_names["local"] + folder_names["central"]))
 
@@ -173,11 +180,11 @@ def get_max_sub_or_ses_num_and_value_length(
             num_value_digits = default_num_value_digits
 
     else:
-        all_values_str = utils.get_values_from_bids_formatted_name(
-            all_folders,
-            prefix,
-            return_as_int=False,
-        )
+        # Parse each name once, raising if the value cannot be found.
+        bids_names = [utils.BidsName(name, prefix) for name in all_folders]
+        all_values_str = [
+            bids_name.get_value(prefix) for bids_name in bids_names
+        ]
 
         # First get the length of bids-key value across the project
         # or name template if it exists (e.g. sub-003 has three values).
@@ -198,15 +205,17 @@ def get_max_sub_or_ses_num_and_value_length(
             )
 
         # Then get the latest existing sub or ses number in the project.
-        all_value_nums = []
-        for value in all_values_str:
-            if not value.isdigit():
+        # Letters are not allowed in the values, so ids are int (or `None`).
+        all_value_nums: List[int] = []
+        for bids_name in bids_names:
+            value_id = bids_name.id
+            if not isinstance(value_id, int) or not bids_name.value.isdigit():  # type: ignore
                 utils.log_and_raise_error(
-                    f"Cannot suggest next {prefix} because not all {prefix} labels in the project are integer. e.g. {prefix}-{value}",
+                    f"Cannot suggest next {prefix} because not all {prefix} labels in the project are integer. e.g. {prefix}-{bids_name.value}",
                     NeuroBlueprintError,
                 )
-            int_value = utils.sub_or_ses_value_to_int(value)
-            all_value_nums.append(int_value)
+            else:
+                all_value_nums.append(value_id)
 
         all_value_nums = sorted(all_value_nums)
 
@@ -330,6 +339,7 @@ def get_all_sub_and_ses_paths(
     cfg: Configs,
     top_level_folder: TopLevelFolder,
     include_central: bool,
+    num_workers: int = 1,
 ) -> Dict:
     """Return a dict including filepaths to all subjects and sessions.
 
@@ -351,11 +361,65 @@ def get_all_sub_and_ses_paths(
         If `False, only get names from `local_path`, otherwise from
         `local_path` and `central_path`.
 
+    num_workers
+        Number of threads used to search subject folders for sessions
+        concurrently. The results are the same for any number of workers.
+
     Returns
     -------
     A dictionary with "sub" key (path to all subject folders)
     and "ses" key (path to all session folders).
 
+    """
+    with project_snapshot.central_snapshots(
+        cfg, [top_level_folder], include_central
+    ):
+        return _get_all_sub_and_ses_paths(
+            cfg, top_level_folder, include_central, num_workers
+        )
+
+
+def _get_all_sub_and_ses_paths(
+    cfg: Configs,
+    top_level_folder: TopLevelFolder,
+    include_central: bool,
+    num_workers: int = 1,
+) -> Dict:
+    """Search the project for all subject and session paths.
+
+    If `include_central` is `True`, this is called within a project
+    snapshot so central is listed once, rather than for every subject.
+    See `get_all_sub_and_ses_paths()` for parameters.
+    """
+    all_sub_folder_paths = get_sub_paths(
+        cfg, top_level_folder, include_central
+    )
+
+    # Subjects are searched concurrently, but collected in order.
+    all_ses_folder_paths = {}
+    for sub_path, ses_folder_paths in zip(
+        all_sub_folder_paths,
+        utils.map_in_threads(
+            lambda sub_path: get_ses_paths(
+                cfg, top_level_folder, sub_path.name, include_central
+            ),
+            all_sub_folder_paths,
+            num_workers,
+        ),
+    ):
+        all_ses_folder_paths[sub_path.name] = ses_folder_paths
+
+    return {"sub": all_sub_folder_paths, "ses": all_ses_folder_paths}
+
+
+def get_sub_paths(
+    cfg: Configs, top_level_folder: TopLevelFolder, include_central: bool
+) -> List[Path]:
+    """Return the paths to all subject folders, local then central.
+
+    See `get_all_sub_and_ses_paths()` for parameters. If `include_central` is
+    `True`, call within `project_snapshot.central_snapshots()` so central
+    is listed once rather than for each call.
     """
     sub_folder_paths = folders.search_project_for_sub_or_ses_names(
         cfg,
@@ -367,30 +431,31 @@ def get_all_sub_and_ses_paths(
     )
 
     if include_central:
-        all_sub_folder_paths = (
-            sub_folder_paths["local"] + sub_folder_paths["central"]
-        )
+        return sub_folder_paths["local"] + sub_folder_paths["central"]
     else:
-        all_sub_folder_paths = sub_folder_paths["local"]
+        return sub_folder_paths["local"]
 
-    all_ses_folder_paths = {}
-    for sub_path in all_sub_folder_paths:
-        sub = sub_path.name
 
-        ses_folder_paths = folders.search_project_for_sub_or_ses_names(
-            cfg,
-            top_level_folder,
-            sub,
-            "ses-*",
-            include_central,
-            return_full_path=True,
-        )
+def get_ses_paths(
+    cfg: Configs,
+    top_level_folder: TopLevelFolder,
+    sub: str,
+    include_central: bool,
+) -> List[Path]:
+    """Return the paths to all session folders of a subject, local then central.
 
-        if include_central:
-            all_ses_folder_paths[sub] = (
-                ses_folder_paths["local"] + ses_folder_paths["central"]
-            )
-        else:
-            all_ses_folder_paths[sub] = ses_folder_paths["local"]
+    See `get_sub_paths()`.
+    """
+    ses_folder_paths = folders.search_project_for_sub_or_ses_names(
+        cfg,
+        top_level_folder,
+        sub,
+        "ses-*",
+        include_central,
+        return_full_path=True,
+    )
 
-    return {"sub": all_sub_folder_paths, "ses": all_ses_folder_paths}
+    if include_central:
+        return ses_folder_paths["local"] + ses_folder_paths["central"]
+    else:
+        return ses_folder_paths["local"]
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+import fnmatch
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from datashuttle.configs import canonical_configs, canonical_folders
+
+# A folder modified within this window of being scanned may be modified
+# again without its mtime changing (on filesystems with coarse mtime
+# resolution, e.g. network shares). These folders are always re-scanned.
+RACY_MTIME_WINDOW_NS = 2_000_000_000
+
+# The maximum number of folders held in the index. When exceeded,
+# the least recently used folders are removed from the index.
+MAX_INDEXED_FOLDERS = 100_000
+
+
+class IndexNode:
+    """The contents of a single folder in the `ProjectIndex`.
+
+    Parameters
+    ----------
+    level
+        The project level of the folder ("top_level_folder", "sub", "ses"
+        or "datatype"), or `None` if it is not a NeuroBlueprint folder.
+
+    mtime_ns
+        The folder modification time when it was scanned. Adding, removing
+        or renaming a folder's contents changes its mtime, invalidating
+        the node.
+
+    scanned_at_ns
+        The time the folder was scanned.
+
+    folder_names
+        Names of the folders within the folder (including symlinks to folders).
+
+    filenames
+        Names of the files within the folder.
+
+    symlink_folder_names
+        Names of `folder_names` that are symlinks.
+
+    """
+
+    __slots__ = (
+        "level",
+        "mtime_ns",
+        "scanned_at_ns",
+        "folder_names",
+        "filenames",
+        "symlink_folder_names",
+    )
+
+    def __init__(
+        self,
+        level: Optional[str],
+        mtime_ns: int,
+        scanned_at_ns: int,
+        folder_names: Tuple[str, ...],
+        filenames: Tuple[str, ...],
+        symlink_folder_names: Tuple[str, ...],
+    ) -> None:
+        """Initialise the IndexNode."""
+        self.level = level
+        self.mtime_ns = mtime_ns
+        self.scanned_at_ns = scanned_at_ns
+        self.folder_names = folder_names
+        self.filenames = filenames
+        self.symlink_folder_names = symlink_folder_names
+
+    def is_valid(self, mtime_ns: int) -> bool:
+        """Return a bool indicating whether the node is up to date with the folder."""
+        return (
+            mtime_ns == self.mtime_ns
+            and self.scanned_at_ns - self.mtime_ns > RACY_MTIME_WINDOW_NS
+        )
+
+
+class ProjectIndex:
+    """An in-memory, incrementally updated index of local project folders.
+
+    Searching a folder with `Path.glob` then checking `is_dir()` / `is_file()`
+    calls `stat` on every item. As the same folders are searched many
+    times within a single operation (e.g. validating then transferring a
+    project), this is slow on network-mounted drives.
+
+    Instead, each folder is read once with `os.scandir` (which provides
+    the file type without a `stat` call on most systems) and stored.
+    On later searches only the folder itself is checked with `stat`,
+    and it is re-read only if its modification time has changed.
+
+    As the index is shared by all searches in the process (e.g. across
+    projects in a long-running TUI session), at most `max_folders`
+    folders are held, with the least recently used removed first.
+    """
+
+    def __init__(self, max_folders: int = MAX_INDEXED_FOLDERS) -> None:
+        """Initialise the ProjectIndex."""
+        self._nodes: OrderedDict[str, IndexNode] = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_folders = max_folders
+
+    def get_node(self, folder_path: Path) -> Optional[IndexNode]:
+        """Return the up-to-date node for `folder_path`.
+
+        Returns `None` if `folder_path` does not exist or is not a folder.
+        """
+        key = folder_path.as_posix()
+
+        try:
+            mtime_ns = os.stat(key).st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            with self._lock:
+                self._nodes.pop(key, None)
+            return None
+
+        with self._lock:
+            node = self._nodes.get(key)
+            if node is not None:
+                self._nodes.move_to_end(key)
+
+        if node is not None and node.is_valid(mtime_ns):
+            return node
+
+        node = self.scan_folder(folder_path, mtime_ns)
+
+        if node is not None:
+            with self._lock:
+                self._nodes[key] = node
+                self._nodes.move_to_end(key)
+
+                while len(self._nodes) > self.max_folders:
+                    self._nodes.popitem(last=False)
+
+        return node
+
+    def scan_folder(
+        self, folder_path: Path, mtime_ns: int
+    ) -> Optional[IndexNode]:
+        """Read the contents of a folder with `os.scandir`."""
+        scanned_at_ns = time.time_ns()
+
+        folder_names = []
+        filenames = []
+        symlink_folder_names = []
+
+        try:
+            with os.scandir(folder_path) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        folder_names.append(entry.name)
+                        if entry.is_symlink():
+                            symlink_folder_names.append(entry.name)
+                    elif entry.is_file():
+                        filenames.append(entry.name)
+
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+        except PermissionError:
+            # Match `Path.glob`, which treats unreadable folders as empty.
+            # The node is never valid, so the folder is read again next time.
+            return IndexNode(
+                get_level(folder_path.name), -1, scanned_at_ns, (), (), ()
+            )
+
+        return IndexNode(
+            get_level(folder_path.name),
+            mtime_ns,
+            scanned_at_ns,
+            tuple(sorted(folder_names)),
+            tuple(sorted(filenames)),
+            tuple(symlink_folder_names),
+        )
+
+    def search(
+        self,
+        search_path: Path,
+        search_prefix: str,
+        return_full_path: bool = False,
+    ) -> Optional[Tuple[List[Any], List[Any]]]:
+        """Search a folder for files and folders matching `search_prefix`.
+
+        Outputs match `folders.search_local_filesystem()`.
+
+        Returns
+        -------
+        Discovered folders and files, or `None` if the
+        `search_path` does not exist or is not a folder.
+
+        """
+        node = self.get_node(search_path)
+
+        if node is None:
+            return None
+
+        all_folder_names = [
+            search_path / name if return_full_path else name
+            for name in fnmatch.filter(node.folder_names, search_prefix)
+        ]
+        all_filenames = [
+            search_path / name if return_full_path else name
+            for name in fnmatch.filter(node.filenames, search_prefix)
+        ]
+
+        return sorted(all_folder_names), sorted(all_filenames)
+
+    def walk(self, top: Path) -> Iterator[Tuple[str, List[str], List[str]]]:
+        """Walk the folder tree below `top`, as `os.walk(top)`.
+
+        As for `os.walk`, symlinks to folders are listed but not followed.
+        """
+        node = self.get_node(top)
+
+        if node is None:
+            return
+
+        top_str = top.as_posix()
+
+        yield top_str, list(node.folder_names), list(node.filenames)
+
+        for folder_name in node.folder_names:
+            if folder_name in node.symlink_folder_names:
+                continue
+            yield from self.walk(top / folder_name)
+
+    def invalidate(self, folder_path: Path) -> None:
+        """Remove `folder_path` and all folders within it from the index."""
+        key = folder_path.as_posix()
+        key_with_sep = f"{key}/"
+
+        with self._lock:
+            for node_key in list(self._nodes):
+                if node_key == key or node_key.startswith(key_with_sep):
+                    del self._nodes[node_key]
+
+    def clear(self) -> None:
+        """Remove all folders from the index."""
+        with self._lock:
+            self._nodes.clear()
+
+    def get_level(self, folder_path: Path) -> Optional[str]:
+        """Return the project level of an indexed folder, if known."""
+        node = self.get_node(folder_path)
+        return None if node is None else node.level
+
+
+def get_level(folder_name: str) -> Optional[str]:
+    """Return the NeuroBlueprint level of a folder from its name."""
+    if folder_name in canonical_folders.get_top_level_folders():
+        return "top_level_folder"
+    if folder_name.startswith("sub-"):
+        return "sub"
+    if folder_name.startswith("ses-"):
+        return "ses"
+    if folder_name in canonical_configs.get_datatypes():
+        return "datatype"
+    return None
+
+
+_project_index = ProjectIndex()
+
+
+def get_project_index() -> ProjectIndex:
+    """Return the index shared by all local searches in this process."""
+    return _project_index
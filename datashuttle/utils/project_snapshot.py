@@ -0,0 +1,413 @@
+from __future__ import annotations
+
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+if TYPE_CHECKING:
+    from datashuttle.configs.config_class import Configs
+    from datashuttle.utils.custom_types import TopLevelFolder
+
+import fnmatch
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from datashuttle.utils import project_index, rclone, utils
+
+# The project snapshot holds the sub, ses and datatype levels
+# below a top-level folder. (e.g. rawdata/sub-001/ses-001/behav).
+SNAPSHOT_MAX_DEPTH = 3
+
+# rclone's error when listing a folder that does not exist.
+RCLONE_FOLDER_NOT_FOUND_ERROR = "directory not found"
+
+# Snapshots that are currently in use, keyed by
+# (rclone config name, top-level folder path on central). Snapshots
+# are shared by all threads (e.g. searches run in worker threads
+# within `central_snapshots()`), and `_snapshot_users` counts the
+# `central_snapshots()` contexts using each, so a snapshot is only
+# discarded when the last context using it exits.
+_active_snapshots: Dict[Tuple[str, str], ProjectSnapshot] = {}
+_snapshot_users: Dict[Tuple[str, str], int] = {}
+_snapshots_lock = threading.Lock()
+
+
+class ProjectSnapshot:
+    """An in-memory listing of a central top-level folder.
+
+    Searching central through `rclone lsjson` starts a new rclone process
+    (and, for SSH, a new connection) for every folder searched. When
+    searching a full project (e.g. validation, suggesting the next
+    subject or session, building transfer lists) this means one call
+    per subject and session. Instead, a snapshot is filled with a single
+    recursive, depth-limited `rclone lsjson` call on the top-level
+    folder and searches are answered from memory.
+
+    The listing holds, for every folder down to the session level,
+    the names of the folders and files it contains. Therefore the
+    contents of the top-level, subject and session folders can be
+    searched (i.e. down to the datatype folders).
+    """
+
+    def __init__(
+        self,
+        root: str,
+        listing: Dict[str, Tuple[List[str], List[str]]],
+        max_depth: int = SNAPSHOT_MAX_DEPTH,
+    ) -> None:
+        """Initialise the ProjectSnapshot.
+
+        Parameters
+        ----------
+        root
+            The path (posix) of the listed folder on the central storage.
+
+        listing
+            A dictionary where keys are folder paths relative to `root`
+            ("" for the root itself) and values are a tuple of
+            (folder names, file names) found within that folder.
+
+        max_depth
+            The depth of the listing. Only folders less deep than this
+            have a complete record of their contents.
+
+        """
+        self.root = root
+        self.listing = listing
+        self.max_depth = max_depth
+
+    @classmethod
+    def from_lsjson_output(
+        cls,
+        root: str,
+        files_and_folders: List[Dict[str, Any]],
+        max_depth: int = SNAPSHOT_MAX_DEPTH,
+    ) -> ProjectSnapshot:
+        """Build the snapshot from the parsed output of `rclone lsjson -R`.
+
+        Each entry contains the "Path" relative to the listed folder,
+        the item "Name" and whether it "IsDir".
+        """
+        listing: Dict[str, Tuple[List[str], List[str]]] = {"": ([], [])}
+
+        for file_or_folder in files_and_folders:
+            relative_path = file_or_folder["Path"]
+            is_dir = file_or_folder.get("IsDir", False)
+
+            parent, _, name = relative_path.rpartition("/")
+
+            if is_dir and relative_path.count("/") + 1 < max_depth:
+                listing.setdefault(relative_path, ([], []))
+
+            folder_names, filenames = listing.setdefault(parent, ([], []))
+
+            if is_dir:
+                folder_names.append(name)
+            else:
+                filenames.append(name)
+
+        return cls(root, listing, max_depth)
+
+    def search(
+        self,
+        search_path: Optional[Path],
+        search_prefix: str,
+        return_full_path: bool = False,
+    ) -> Optional[Tuple[List[Any], List[Any]]]:
+        """Search a folder within the snapshot for files and folders.
+
+        Outputs match `folders.search_central_via_connection()`.
+
+        Returns
+        -------
+        Discovered folders and files, or `None` if the `search_path` is
+        not covered by the snapshot (in which case central must be
+        searched directly).
+
+        """
+        final_search_path = search_path.as_posix() if search_path else ""
+
+        relative_path = self.get_relative_path(final_search_path)
+
+        if relative_path is None:
+            return None
+
+        depth = 0 if relative_path == "" else relative_path.count("/") + 1
+
+        if depth >= self.max_depth:
+            return None
+
+        if relative_path not in self.listing:
+            # The folder does not exist on central.
+            return [], []
+
+        folder_names, filenames = self.listing[relative_path]
+
+        all_folder_names: List[Any] = []
+        all_filenames: List[Any] = []
+        for names, results in (
+            (folder_names, all_folder_names),
+            (filenames, all_filenames),
+        ):
+            for name in names:
+                if not fnmatch.fnmatch(name, search_prefix):
+                    continue
+
+                results.append(
+                    Path(final_search_path) / name
+                    if return_full_path
+                    else name
+                )
+
+        return sorted(all_folder_names), sorted(all_filenames)
+
+    def get_relative_path(self, search_path: str) -> Optional[str]:
+        """Return `search_path` relative to the snapshot root, `None` if it is not within it."""
+        if search_path == self.root:
+            return ""
+
+        root_with_sep = f"{self.root}/" if self.root else ""
+
+        if not search_path.startswith(root_with_sep):
+            return None
+
+        return search_path[len(root_with_sep) :]
+
+
+# -----------------------------------------------------------------------------
+# Building and using snapshots
+# -----------------------------------------------------------------------------
+
+
+def take_central_snapshot(
+    cfg: Configs, top_level_folder: TopLevelFolder
+) -> Optional[ProjectSnapshot]:
+    """List the central top-level folder with a single `rclone lsjson` call.
+
+    Returns `None` if the top-level folder does not exist on central, in
+    which case searches fall back to `folders.search_central_via_connection()`.
+    Raises a `ConnectionError` if the listing otherwise failed.
+    """
+    root = cfg.get_base_folder("central", top_level_folder).as_posix()
+
+    output = rclone.call_rclone_lsjson_for_central_connection(
+        cfg, root, max_depth=SNAPSHOT_MAX_DEPTH
+    )
+
+    stderr = output.stderr.decode("utf-8") if output.stderr else ""
+
+    if output.returncode != 0:
+        if RCLONE_FOLDER_NOT_FOUND_ERROR in stderr:
+            return None
+
+        utils.log_and_raise_error(
+            f"Could not list the central folder {root}.\n{stderr}",
+            ConnectionError,
+        )
+
+    try:
+        files_and_folders = json.loads(output.stdout)
+    except json.JSONDecodeError:
+        utils.log_and_raise_error(
+            f"Could not read the listing of the central folder {root}.\n"
+            f"{stderr}",
+            ConnectionError,
+        )
+
+    return ProjectSnapshot.from_lsjson_output(root, files_and_folders)
+
+
+def connection_requires_rclone_search(cfg: Configs) -> bool:
+    """Return a bool indicating whether central is searched through rclone.
+
+    Local filesystem central projects are searched directly on the filesystem.
+    """
+    return cfg["connection_method"] not in ["local_filesystem", "local_only"]
+
+
+@contextmanager
+def central_snapshots(
+    cfg: Configs,
+    top_level_folders: List[TopLevelFolder],
+    include_central: bool = True,
+) -> Iterator[None]:
+    """Answer central searches within the context from project snapshots.
+
+    A snapshot is taken for each top-level folder on entry and
+    discarded on exit. If a snapshot for the top-level folder is
+    already active (e.g. the context is nested, or entered in another
+    thread) it is re-used, and discarded when the last context using
+    it exits.
+
+    Parameters
+    ----------
+    cfg
+        datashuttle Configs.
+
+    top_level_folders
+        The top-level folders to take snapshots of.
+
+    include_central
+        If `False`, central is not being searched and no snapshot is taken.
+
+    """
+    used_keys = []
+
+    try:
+        if include_central and connection_requires_rclone_search(cfg):
+            for top_level_folder in top_level_folders:
+                key = get_snapshot_key(
+                    cfg, cfg.get_base_folder("central", top_level_folder)
+                )
+                with _snapshots_lock:
+                    is_active = key in _active_snapshots
+                    if is_active:
+                        _snapshot_users[key] += 1
+                        used_keys.append(key)
+
+                if is_active:
+                    continue
+
+                # Listing central is slow, so is not done holding the lock.
+                snapshot = take_central_snapshot(cfg, top_level_folder)
+
+                if snapshot is not None:
+                    with _snapshots_lock:
+                        # Another thread may have taken the snapshot meanwhile.
+                        _active_snapshots.setdefault(key, snapshot)
+                        _snapshot_users[key] = _snapshot_users.get(key, 0) + 1
+                        used_keys.append(key)
+        yield
+    finally:
+        with _snapshots_lock:
+            for key in used_keys:
+                _snapshot_users[key] -= 1
+                if _snapshot_users[key] == 0:
+                    del _snapshot_users[key]
+                    _active_snapshots.pop(key, None)
+
+
+def search_active_snapshots(
+    cfg: Configs,
+    search_path: Optional[Path],
+    search_prefix: str,
+    return_full_path: bool = False,
+) -> Optional[Tuple[List[Any], List[Any]]]:
+    """Search central using an active snapshot, if one covers the `search_path`.
+
+    Returns `None` if no active snapshot covers the `search_path`.
+    """
+    with _snapshots_lock:
+        active_snapshots = list(_active_snapshots.items())
+
+    if not active_snapshots:
+        return None
+
+    rclone_config_name = cfg.rclone.get_rclone_config_name(
+        cfg["connection_method"]
+    )
+    final_search_path = search_path.as_posix() if search_path else ""
+
+    for (config_name, root), snapshot in active_snapshots:
+        if config_name != rclone_config_name:
+            continue
+
+        if final_search_path == root or final_search_path.startswith(
+            f"{root}/"
+        ):
+            return snapshot.search(
+                search_path, search_prefix, return_full_path
+            )
+
+    return None
+
+
+def get_snapshot_key(cfg: Configs, root: Path) -> Tuple[str, str]:
+    """Return the key used to hold a snapshot of `root` in `_active_snapshots`."""
+    return (
+        cfg.rclone.get_rclone_config_name(cfg["connection_method"]),
+        root.as_posix(),
+    )
+
+
+# -----------------------------------------------------------------------------
+# Local subject and session names
+# -----------------------------------------------------------------------------
+
+
+class LocalNamesSnapshot:
+    """The subject and session folders of a local top-level folder, held in memory.
+
+    Live validation of names (e.g. in the TUI Create tab, on every change
+    to the subject or session input) checks the names against all
+    subjects and sessions in the project. Rather than searching the
+    project for each check, the names are listed once and re-used.
+
+    The snapshot is re-taken if the top-level folder is modified (i.e. a
+    subject is added, removed or renamed), if it is for a different
+    project or top-level folder, or after `invalidate()` (e.g. after
+    folders are created). Sessions added outside of datashuttle are
+    not detected until then, which is acceptable for live validation
+    as names are validated against the project itself when the
+    folders are created.
+    """
+
+    def __init__(self) -> None:
+        """Initialise the LocalNamesSnapshot."""
+        self.folder_paths: Optional[Dict] = None
+        self.key: Optional[Tuple[str, str]] = None
+        self.mtime_ns: Optional[int] = None
+        self.taken_at_ns = 0
+
+    def get_folder_paths(
+        self, cfg: Configs, top_level_folder: TopLevelFolder
+    ) -> Dict:
+        """Return the subject and session paths, re-listing the project if it has changed.
+
+        Outputs match `getters.get_all_sub_and_ses_paths()`
+        with `include_central=False`.
+        """
+        # For circular imports
+        from datashuttle.utils import getters
+
+        base_folder = cfg.get_base_folder("local", top_level_folder)
+        key = (cfg["local_path"].as_posix(), top_level_folder)
+
+        try:
+            mtime_ns: Optional[int] = os.stat(base_folder).st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            mtime_ns = None
+
+        if (
+            self.folder_paths is None
+            or key != self.key
+            or mtime_ns != self.mtime_ns
+            or (
+                mtime_ns is not None
+                and self.taken_at_ns - mtime_ns
+                <= project_index.RACY_MTIME_WINDOW_NS
+            )
+        ):
+            # Read the mtime before listing, so that any later changes are detected.
+            self.taken_at_ns = time.time_ns()
+            self.folder_paths = getters.get_all_sub_and_ses_paths(
+                cfg, top_level_folder, include_central=False
+            )
+            self.key = key
+            self.mtime_ns = mtime_ns
+
+        return self.folder_paths
+
+    def invalidate(self) -> None:
+        """Discard the snapshot, so the project is listed again on next use."""
+        self.folder_paths = None
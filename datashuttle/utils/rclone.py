@@ -26,14 +26,36 @@ import json
 import os
 import platform
 import shlex
+import signal
 import subprocess
 import tempfile
+import threading
 from pathlib import Path
 from subprocess import CompletedProcess
 
 from datashuttle.configs import canonical_configs
-from datashuttle.utils import rclone_encryption, utils
+from datashuttle.utils import (
+    rclone_canceller,
+    rclone_daemon,
+    rclone_encryption,
+    utils,
+)
 from datashuttle.utils.transfer_output_class import TransferOutput
+from datashuttle.utils.transfer_progress_class import TransferProgress
+
+# Files that differ between local and central by design (logs and
+# per-machine caches), excluded when checking for transfer differences.
+CHECK_EXCLUDE_PATTERNS = [
+    "*.datashuttle/logs/*",
+    "*.datashuttle/transfer_diffs.*",
+    "*.datashuttle/validation_cache.*",
+]
+
+# Rclone calls that require the config password may run concurrently
+# (e.g. sharded transfers). The password environment variable is set by
+# the first call and removed only when the last call has finished.
+_encrypted_config_lock = threading.Lock()
+_num_encrypted_config_users = 0
 
 
 def call_rclone(command: str, pipe_std: bool = False) -> CompletedProcess:
@@ -53,7 +75,12 @@ def call_rclone(command: str, pipe_std: bool = False) -> CompletedProcess:
 
     """
     command = "rclone " + command
-    if pipe_std:
+
+    canceller = rclone_canceller.get_active_canceller()
+
+    if canceller is not None:
+        output = run_cancellable_command(command, pipe_std, canceller)
+    elif pipe_std:
         output = subprocess.run(
             command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True
         )
@@ -66,6 +93,28 @@ def call_rclone(command: str, pipe_std: bool = False) -> CompletedProcess:
     return output
 
 
+def run_cancellable_command(
+    command: str,
+    pipe_std: bool,
+    canceller: rclone_canceller.RcloneCanceller,
+) -> CompletedProcess:
+    """Run a command that is killed if `canceller` is cancelled.
+
+    The command must not be run through the shell, otherwise killing
+    the process kills the shell but not rclone (see `call_rclone_with_popen()`).
+    On Windows, the command string is passed directly to the process.
+    """
+    args = command if platform.system() == "Windows" else shlex.split(command)
+    std = subprocess.PIPE if pipe_std else None
+
+    process = subprocess.Popen(args, stdout=std, stderr=std)
+
+    with canceller.register(process.kill):
+        stdout, stderr = process.communicate()
+
+    return CompletedProcess(args, process.returncode, stdout, stderr)
+
+
 def call_rclone_for_central_connection(
     cfg, command: str, pipe_std: bool = False
 ) -> CompletedProcess:
@@ -82,7 +131,9 @@ def call_rclone_for_central_connection(
 
 
 def call_rclone_through_script_for_central_connection(
-    cfg: Configs, command: str
+    cfg: Configs,
+    command: str,
+    process_line: Optional[Callable[[str], None]] = None,
 ) -> CompletedProcess:
     """Call rclone through a script.
 
@@ -93,13 +144,19 @@ def call_rclone_through_script_for_central_connection(
     ----------
     cfg
         Datashuttle Configs class.
-    ----------
+
     command
         Full command to run with RClone.
 
+    process_line
+        If not `None`, stdout and stderr are not captured. Instead, each line
+        is passed to this function as soon as it is output by rclone
+        (see `stream_process_output()`).
+
     Returns
     -------
     subprocess.CompletedProcess with `stdout` and `stderr` attributes.
+    These are `None` if `process_line` is passed.
 
     """
     system = platform.system()
@@ -122,12 +179,17 @@ def call_rclone_through_script_for_central_connection(
         if system != "Windows":
             os.chmod(tmp_script_path, 0o700)
 
-        lambda_func = lambda: subprocess.run(
-            [tmp_script_path],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            shell=False,
-        )
+        if process_line is None:
+            lambda_func = lambda: subprocess.run(
+                [tmp_script_path],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                shell=False,
+            )
+        else:
+            lambda_func = lambda: stream_process_output(
+                [tmp_script_path], process_line
+            )
 
         if rclone_encryption.connection_method_requires_encryption(
             cfg["connection_method"]
@@ -147,6 +209,71 @@ def call_rclone_through_script_for_central_connection(
     return output
 
 
+def stream_process_output(
+    args: List[str], process_line: Callable[[str], None]
+) -> CompletedProcess:
+    """Run a process, passing each line of its output to `process_line` as it arrives.
+
+    stdout and stderr are read concurrently (stderr on a separate thread)
+    so that neither pipe fills and blocks the process. Lines are not
+    retained, so memory use does not grow with the length of the output.
+    If interrupted, the process and any processes it started (i.e. rclone,
+    when run through a script) are killed.
+    """
+    process = subprocess.Popen(
+        args,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        shell=False,
+        # Run in a new process group, so it can be killed with its children.
+        start_new_session=platform.system() != "Windows",
+    )
+    assert process.stdout is not None and process.stderr is not None
+
+    def read_stream(stream) -> None:
+        for line in stream:
+            process_line(line.decode("utf-8", errors="replace").rstrip("\n"))
+
+    stderr_thread = threading.Thread(
+        target=read_stream, args=(process.stderr,), daemon=True
+    )
+    stderr_thread.start()
+
+    try:
+        read_stream(process.stdout)
+        stderr_thread.join()
+        process.wait()
+    except BaseException:
+        kill_process_tree(process)
+        process.wait()
+        raise
+    finally:
+        process.stdout.close()
+        process.stderr.close()
+
+    return CompletedProcess(args, process.returncode, None, None)
+
+
+def kill_process_tree(process: subprocess.Popen) -> None:
+    """Kill a process and the processes it started.
+
+    On macOS and Linux, the process must have been started
+    with `start_new_session=True` (i.e. in its own process group).
+    """
+    if platform.system() == "Windows":
+        subprocess.run(
+            ["taskkill", "/F", "/T", "/PID", str(process.pid)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    else:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            # The process group has already exited.
+            pass
+
+
 def call_rclone_with_popen(
     command: str,
 ) -> subprocess.Popen:
@@ -211,20 +338,114 @@ def run_function_that_requires_encrypted_rclone_config_access(
             f"Please set up the {cfg['connection_method']} connection again."
         )
 
+    global _num_encrypted_config_users
+
     is_encrypted = cfg.rclone.rclone_file_is_encrypted()
 
     if is_encrypted:
-        rclone_encryption.set_credentials_as_password_command(cfg)
+        with _encrypted_config_lock:
+            if _num_encrypted_config_users == 0:
+                rclone_encryption.set_credentials_as_password_command(cfg)
+            _num_encrypted_config_users += 1
 
     try:
         results = lambda_func()
     finally:
         if is_encrypted:
-            rclone_encryption.remove_rclone_password_env_var()
+            with _encrypted_config_lock:
+                _num_encrypted_config_users -= 1
+                if _num_encrypted_config_users == 0:
+                    rclone_encryption.remove_rclone_password_env_var()
 
     return results
 
 
+def call_rclone_lsjson_for_central_connection(
+    cfg: Configs, search_path: str, max_depth: Optional[int] = None
+) -> CompletedProcess:
+    """List a folder on central with `rclone lsjson`.
+
+    Parameters
+    ----------
+    cfg
+        datashuttle Configs class.
+
+    search_path
+        The path (posix) on central to list.
+
+    max_depth
+        If not `None`, list recursively to this depth.
+
+    """
+    rclone_config_name = cfg.rclone.get_rclone_config_name(
+        cfg["connection_method"]
+    )
+
+    daemon = get_rclone_daemon(cfg)
+
+    if daemon is not None:
+        return daemon.lsjson(f"{rclone_config_name}:{search_path}", max_depth)
+
+    recurse_arg = (
+        f" -R --max-depth {max_depth}" if max_depth is not None else ""
+    )
+
+    return call_rclone_for_central_connection(
+        cfg,
+        f'lsjson {rclone_config_name}:"{search_path}"{recurse_arg} '
+        f"{get_config_arg(cfg)}",
+        pipe_std=True,
+    )
+
+
+# -----------------------------------------------------------------------------
+# RClone Daemon
+# -----------------------------------------------------------------------------
+
+
+def start_rclone_daemon(cfg: Configs) -> None:
+    """Start a persistent `rclone rcd` to use for all central connection calls.
+
+    Once started, listing, checking and transferring files with the
+    current `connection_method` are sent to the running daemon rather than
+    starting a new rclone process each call. See `rclone_daemon.py`.
+    """
+    if rclone_encryption.connection_method_requires_encryption(
+        cfg["connection_method"]
+    ):
+        daemon = rclone_daemon.RcloneDaemon(
+            cfg.rclone.get_rclone_central_connection_config_filepath()
+        )
+        run_function_that_requires_encrypted_rclone_config_access(
+            cfg, daemon.start
+        )
+    else:
+        daemon = rclone_daemon.RcloneDaemon()
+        daemon.start()
+
+    rclone_daemon.register_daemon(cfg, daemon)
+
+
+def stop_rclone_daemon(cfg: Configs) -> None:
+    """Stop the `rclone rcd` for the current `connection_method`, if running."""
+    rclone_daemon.stop_daemon(cfg)
+
+
+def get_rclone_daemon(cfg: Configs) -> Optional[rclone_daemon.RcloneDaemon]:
+    """Return the running daemon for the current `connection_method`, if there is one.
+
+    If the rclone config file has changed since the daemon was started
+    (e.g. the connection was set up again) the daemon is restarted.
+    """
+    daemon = rclone_daemon.get_active_daemon(cfg)
+
+    if daemon is not None and daemon.config_has_changed():
+        start_rclone_daemon(cfg)
+        daemon = rclone_daemon.get_active_daemon(cfg)
+
+    return daemon
+
+
 # -----------------------------------------------------------------------------
 # RClone Configs
 # -----------------------------------------------------------------------------
@@ -536,21 +757,29 @@ def check_successful_connection_and_raise_error_on_fail(cfg: Configs) -> None:
 
     config_name = cfg.rclone.get_rclone_config_name()
 
-    output = call_rclone_for_central_connection(
-        cfg,
-        f"touch {config_name}:{tempfile_path} {get_config_arg(cfg)}",
-        pipe_std=True,
-    )
+    daemon = get_rclone_daemon(cfg)
+
+    if daemon is not None:
+        output = daemon.touch(f"{config_name}:", tempfile_path)
+    else:
+        output = call_rclone_for_central_connection(
+            cfg,
+            f"touch {config_name}:{tempfile_path} {get_config_arg(cfg)}",
+            pipe_std=True,
+        )
     if output.returncode != 0:
         utils.log_and_raise_error(
             output.stderr.decode("utf-8"), ConnectionError
         )
 
-    output = call_rclone_for_central_connection(
-        cfg,
-        f"delete {cfg.rclone.get_rclone_config_name()}:{tempfile_path} {get_config_arg(cfg)}",
-        pipe_std=True,
-    )
+    if daemon is not None:
+        output = daemon.deletefile(f"{config_name}:", tempfile_path)
+    else:
+        output = call_rclone_for_central_connection(
+            cfg,
+            f"delete {config_name}:{tempfile_path} {get_config_arg(cfg)}",
+            pipe_std=True,
+        )
     if output.returncode != 0:
         utils.log_and_raise_error(
             output.stderr.decode("utf-8"), ConnectionError
@@ -619,9 +848,14 @@ def transfer_data(
     top_level_folder: TopLevelFolder,
     include_list: List[str],
     rclone_options: Dict,
-) -> subprocess.CompletedProcess:
+    progress_callback: Optional[Callable[[TransferProgress], None]] = None,
+) -> tuple[int, TransferOutput]:
     """Transfer data by making a call to Rclone.
 
+    The output of `rclone copy` is parsed and logged line by line
+    as the transfer runs (see `reformat_rclone_copy_output_line()`),
+    so memory use does not depend on the number of files transferred.
+
     Parameters
     ----------
     cfg
@@ -635,15 +869,26 @@ def transfer_data(
         The top-level-folder to transfer files within.
 
     include_list
-        A list of filepaths to include in the transfer
+        A list of rclone filter rules (e.g. "sub-001/ses-001/behav/**")
+        for the files to include in the transfer. These are written to a
+        temporary file, see `write_transfer_filter_file()`.
 
     rclone_options
         A list of options to pass to Rclone's copy function.
         see `make_rclone_transfer_options()`.
 
+    progress_callback
+        If not `None`, called with a `TransferProgress` each time rclone
+        outputs transfer stats. Set `rclone_options["stats_interval"]`
+        to control how often this occurs.
+
     Returns
     -------
-    subprocess.CompletedProcess with `stdout` and `stderr` attributes.
+    returncode
+        The return code of the `rclone copy` call.
+
+    transfer_output
+        The errors and number of transferred files, see `TransferOutput`.
 
     """
     assert upload_or_download in [
@@ -657,37 +902,132 @@ def transfer_data(
         "central", top_level_folder
     ).as_posix()
 
-    extra_arguments = handle_rclone_arguments(rclone_options, include_list)
+    transfer_output = TransferOutput()
+    lock = threading.Lock()
 
-    if upload_or_download == "upload":
-        output = call_rclone_through_script_for_central_connection(
-            cfg,
-            f"{rclone_args('copy')} "
-            f'"{local_filepath}" "{cfg.rclone.get_rclone_config_name()}:'
-            f'{central_filepath}" {extra_arguments} {get_config_arg(cfg)} --use-json-log',
-        )
+    def process_line(line: str) -> None:
+        with lock:
+            utils.log_and_message(
+                reformat_rclone_copy_output_line(
+                    line, transfer_output, top_level_folder, progress_callback
+                )
+            )
 
-    elif upload_or_download == "download":
-        output = call_rclone_through_script_for_central_connection(
-            cfg,
-            f"{rclone_args('copy')} "
-            f'"{cfg.rclone.get_rclone_config_name()}:'
-            f'{central_filepath}" "{local_filepath}" {extra_arguments} {get_config_arg(cfg)} --use-json-log',
+    utils.log_and_message(
+        "\n\n**************  RCLONE OUTPUT  **************\n"
+    )
+
+    filter_flag, filter_filepath = write_transfer_filter_file(include_list)
+
+    try:
+        daemon = get_rclone_daemon(cfg)
+
+        if daemon is not None:
+            central_fs = (
+                f"{cfg.rclone.get_rclone_config_name()}:{central_filepath}"
+            )
+
+            src_fs, dst_fs = (
+                (local_filepath, central_fs)
+                if upload_or_download == "upload"
+                else (central_fs, local_filepath)
+            )
+            output = daemon.copy(
+                src_fs,
+                dst_fs,
+                rclone_daemon.make_filter_options(
+                    filter_flag, filter_filepath
+                ),
+                make_rclone_daemon_transfer_options(rclone_options),
+                stats_callback=(
+                    None
+                    if progress_callback is None
+                    else lambda stats: progress_callback(
+                        TransferProgress.from_rclone_stats(
+                            top_level_folder, stats
+                        )
+                    )
+                ),
+            )
+            for stream in [output.stdout, output.stderr]:
+                for line in stream.decode("utf-8").splitlines():
+                    process_line(line)
+
+            return output.returncode, transfer_output
+
+        extra_arguments = handle_rclone_arguments(
+            rclone_options, [f'{filter_flag} "{filter_filepath}"']
         )
 
-    return output
+        if upload_or_download == "upload":
+            output = call_rclone_through_script_for_central_connection(
+                cfg,
+                f"{rclone_args('copy')} "
+                f'"{local_filepath}" "{cfg.rclone.get_rclone_config_name()}:'
+                f'{central_filepath}" {extra_arguments} {get_config_arg(cfg)} --use-json-log',
+                process_line,
+            )
 
+        elif upload_or_download == "download":
+            output = call_rclone_through_script_for_central_connection(
+                cfg,
+                f"{rclone_args('copy')} "
+                f'"{cfg.rclone.get_rclone_config_name()}:'
+                f'{central_filepath}" "{local_filepath}" {extra_arguments} {get_config_arg(cfg)} --use-json-log',
+                process_line,
+            )
 
-def log_stdout_stderr_python_api(stdout: str, stderr: str) -> None:
-    """Log `stdout` and `stderr`."""
-    message = (
-        f"\n\n**************  STDOUT  **************\n"
-        f"{stdout}"
-        f"\n\n**************  STDERR  **************\n"
-        f"{stderr}"
-    )
+    finally:
+        os.remove(filter_filepath)
+
+    return output.returncode, transfer_output
+
+
+def write_transfer_filter_file(include_list: List[str]) -> tuple[str, str]:
+    """Write the files to transfer to a temporary file to pass to rclone.
+
+    Passing rules in a file, rather than as `--include` arguments,
+    avoids limits on the length of the rclone call. If every entry is the
+    path to a single file (no wildcards), the paths are written for
+    `--files-from-raw`. rclone then transfers exactly these files,
+    without listing folders or matching each file against every rule.
+    Otherwise, the rules are written for `--filter-from`, followed by a
+    rule to exclude all other files.
+
+    The written rules are logged, and the caller must delete the file.
+
+    Returns
+    -------
+    filter_flag
+        The rclone flag to pass the file with, either
+        "--files-from-raw" or "--filter-from".
 
-    utils.log_and_message(message)
+    filter_filepath
+        Path to the written file.
+
+    """
+    if not any(has_glob_pattern(rule) for rule in include_list):
+        filter_flag = "--files-from-raw"
+        lines = [rule.lstrip("/") for rule in include_list]
+    else:
+        filter_flag = "--filter-from"
+        lines = [f"+ {rule}" for rule in include_list] + ["- **"]
+
+    with tempfile.NamedTemporaryFile(
+        mode="w", suffix=".txt", delete=False, encoding="utf-8"
+    ) as filter_file:
+        for line in lines:
+            filter_file.write(f"{line}\n")
+        filter_filepath = filter_file.name
+
+    utils.log(f"Transferring with {filter_flag}, rules:\n" + "\n".join(lines))
+
+    return filter_flag, Path(filter_filepath).as_posix()
+
+
+def has_glob_pattern(rule: str) -> bool:
+    """Return whether an rclone filter rule contains glob pattern characters."""
+    return any(char in rule for char in "*?[{")
 
 
 def log_rclone_transfer_output(transfer_output: TransferOutput) -> None:
@@ -702,97 +1042,75 @@ def log_rclone_transfer_output(transfer_output: TransferOutput) -> None:
     utils.log_and_message(message, use_rich=True)
 
 
-def parse_rclone_copy_output(
-    top_level_folder: TopLevelFolder | None, output: CompletedProcess
-) -> tuple[str, str, TransferOutput]:
-    """Format the `rclone copy` output ready for logging.
-
-    Reformat and combine the string streams and `TransferOutput`
-    dictionary from stdout and stderr output of `rclone copy`.
-    see `reformat_rclone_copy_output()` for details.
-    """
-    stdout, stdout_outputs = reformat_rclone_copy_output(
-        output.stdout, top_level_folder=top_level_folder
-    )
-    stderr, stderr_outputs = reformat_rclone_copy_output(
-        output.stderr, top_level_folder=top_level_folder
-    )
-
-    combined_transfer_output = TransferOutput.merge_std_outputs(
-        stdout_outputs, stderr_outputs
-    )
-
-    return stdout, stderr, combined_transfer_output
-
-
-def reformat_rclone_copy_output(
-    stream: bytes,
+def reformat_rclone_copy_output_line(
+    line: str,
+    transfer_output: TransferOutput,
     top_level_folder: TopLevelFolder | None = None,
-) -> tuple[str, TransferOutput]:
-    """Parse the output of `rclone copy` for convenient error checking.
+    progress_callback: Optional[Callable[[TransferProgress], None]] = None,
+) -> str:
+    """Parse a line of the output of `rclone copy` for convenient error checking.
 
     Rclone's `copy` command (called with `--use-json-log`) outputs a lot of
     information related to the transfer. We dump this in text form to a log
     file. However, we also want to grab any key events (errors, or complete
     lack of transferred files) so these can be displayed separately.
 
-    This function iterates through all lines in the `rclone copy` output.
-    This output is typically a mix of string format and json format.
+    The output is typically a mix of string format and json format.
     If the line is json-encoded, then we extract important information
-    and format it to string, and re-insert it into the output.
-
-    In this way, we have a string-format output ready to be
-    dumped to the logs, as well as an `errors` dictionary containing
-    details on all key information.
+    (errors, copied files and the number of transferred files) into
+    `transfer_output` (in place) and format the line to string.
+    Stats lines are also passed to `progress_callback`, if given.
 
     Returns
     -------
-    format_stream
-        The input stream, converted to string and with all
-        json-formatted lines reformatted as string. This is ready
-        to be dumped to a log file.
-
-    errors
-        A dictionary (`TransferOutput`) containing key information
-        about issues in the transfer.
+    The line, with json-formatted lines reformatted as string.
+    This is ready to be dumped to a log file.
 
     """
-    split_stream = stream.decode("utf-8").split("\n")
-
-    transfer_output = TransferOutput()
-
-    for idx, line in enumerate(split_stream):
-        try:
-            line_json = json.loads(line)
-        except json.JSONDecodeError:
-            continue
-
-        if line_json["level"] in ["error", "critical"]:
-            if "object" in line_json:
-                full_filepath = Path(
-                    f"{top_level_folder}/{line_json['object']}"
-                ).as_posix()
+    try:
+        line_json = json.loads(line)
+    except json.JSONDecodeError:
+        return line
+
+    if not isinstance(line_json, dict):
+        return line
+
+    if line_json["level"] in ["error", "critical"]:
+        if "object" in line_json:
+            full_filepath = Path(
+                f"{top_level_folder}/{line_json['object']}"
+            ).as_posix()
+            if full_filepath not in transfer_output["errors"]["file_names"]:
                 transfer_output["errors"]["file_names"].append(full_filepath)
-                transfer_output["errors"]["messages"].append(
-                    f"The file {full_filepath} failed to transfer. Reason: {line_json['msg']}"
-                )
-            else:
-                transfer_output["errors"]["messages"].append(
-                    f"ERROR : {line_json['msg']}"
-                )
+            transfer_output["errors"]["messages"].append(
+                f"The file {full_filepath} failed to transfer. Reason: {line_json['msg']}"
+            )
+        else:
+            transfer_output["errors"]["messages"].append(
+                f"ERROR : {line_json['msg']}"
+            )
 
-        elif "stats" in line_json and "totalTransfers" in line_json["stats"]:
-            transfer_output["num_transferred"][top_level_folder] = line_json[
-                "stats"
-            ]["totalTransfers"]
+    elif line_json["msg"] == rclone_daemon.TRANSFERRED_LIST_INCOMPLETE_MSG:
+        transfer_output.add_transferred_file_names(None)
 
-        split_stream[idx] = (
-            f"{line_json['time'][:19]} {line_json['level'].upper()} : {line_json['msg']}"
+    elif "object" in line_json and line_json["msg"].startswith("Copied"):
+        transfer_output.add_transferred_file_names(
+            [Path(f"{top_level_folder}/{line_json['object']}").as_posix()]
         )
 
-    format_stream = "\n".join(split_stream)
+    elif "stats" in line_json and "totalTransfers" in line_json["stats"]:
+        transfer_output["num_transferred"][top_level_folder] = line_json[
+            "stats"
+        ]["totalTransfers"]
 
-    return format_stream, transfer_output
+        if progress_callback is not None:
+            progress_callback(
+                TransferProgress.from_rclone_stats(
+                    top_level_folder, line_json["stats"]
+                )
+            )
+
+    return f"{line_json['time'][:19]} {line_json['level'].upper()} : {line_json['msg']}"
 
 
 def make_rclone_transfer_options(
@@ -814,6 +1132,8 @@ def make_rclone_transfer_options(
         "show_transfer_progress": True,
         "transfer_verbosity": "vv",
         "dry_run": dry_run,
+        "transfers": None,
+        "stats_interval": None,
     }
 
 
@@ -830,6 +1150,9 @@ def get_local_and_central_file_differences(
     Convert the output of Rclone's check (with `--combine`) flag
     to a dictionary separating each case.
 
+    This checks every file in the project. The TUI instead uses the
+    cached differences, see `transfer_diff_cache.get_transfer_diffs()`.
+
     Parameters
     ----------
     cfg
@@ -897,13 +1220,18 @@ def assert_rclone_check_output_is_as_expected(result, symbol, convert_symbols):
 
 
 def perform_rclone_check(
-    cfg: Configs, top_level_folder: TopLevelFolder
+    cfg: Configs,
+    top_level_folder: TopLevelFolder,
+    files_from: Optional[List[str]] = None,
 ) -> str:
     r"""Run RClone check to find differences in files between local and central.
 
     Use Rclone's `check` command to build a list of files that
     are the same ("="), different ("*"), found in local only ("+")
     or central only ("-"). The output is formatted as "\<symbol> \<path>\n".
+
+    If `files_from` is given, only these files (paths relative to the
+    project folder) are checked, see `transfer_diff_cache`.
     """
     local_filepath = cfg.get_base_folder(
         "local", top_level_folder
@@ -913,28 +1241,56 @@ def perform_rclone_check(
         "central", top_level_folder
     ).parent.as_posix()
 
-    if rclone_encryption.connection_method_requires_encryption(
-        cfg["connection_method"]
-    ):
-        output = call_rclone_for_central_connection(
-            cfg,
-            f"{rclone_args('check')} "
-            f'"{local_filepath}" '
-            f'"{cfg.rclone.get_rclone_config_name()}:{central_filepath}" '
-            f"--combined - "
-            f'--exclude "*.datashuttle/logs/*" '
-            f"{get_config_arg(cfg)}",
-            pipe_std=True,
-        )
-    else:
-        output = call_rclone(
-            f"{rclone_args('check')} "
-            f'"{local_filepath}" '
-            f'"{cfg.rclone.get_rclone_config_name()}:{central_filepath}" '
-            f"--combined - "
-            f'--exclude "*.datashuttle/logs/*"',
-            pipe_std=True,
-        )
+    files_from_filepath = None
+    if files_from is not None:
+        with tempfile.NamedTemporaryFile(
+            mode="w", suffix=".txt", delete=False, encoding="utf-8"
+        ) as files_from_file:
+            for path_ in files_from:
+                files_from_file.write(f"{path_}\n")
+            files_from_filepath = Path(files_from_file.name).as_posix()
+
+    try:
+        daemon = get_rclone_daemon(cfg)
+
+        if daemon is not None:
+            output = daemon.check(
+                local_filepath,
+                f"{cfg.rclone.get_rclone_config_name()}:{central_filepath}",
+                exclude=CHECK_EXCLUDE_PATTERNS,
+                files_from=files_from_filepath,
+            )
+        else:
+            files_from_arg = (
+                f'--files-from-raw "{files_from_filepath}" '
+                if files_from_filepath is not None
+                else ""
+            )
+            command = (
+                f"{rclone_args('check')} "
+                f'"{local_filepath}" '
+                f'"{cfg.rclone.get_rclone_config_name()}:{central_filepath}" '
+                f"--combined - "
+                f"{files_from_arg}"
+                + " ".join(
+                    f'--exclude "{pattern}"'
+                    for pattern in CHECK_EXCLUDE_PATTERNS
+                )
+            )
+
+            if rclone_encryption.connection_method_requires_encryption(
+                cfg["connection_method"]
+            ):
+                output = call_rclone_for_central_connection(
+                    cfg,
+                    f"{command} {get_config_arg(cfg)}",
+                    pipe_std=True,
+                )
+            else:
+                output = call_rclone(command, pipe_std=True)
+    finally:
+        if files_from_filepath is not None:
+            os.remove(files_from_filepath)
 
     return output.stdout.decode("utf-8")
 
@@ -950,8 +1306,8 @@ def handle_rclone_arguments(
         A list of option keywords to be passed to
 
     include_list
-        The (already formatted) list of filepaths for the
-        rclone `--include` option.
+        The (already formatted) list of filter arguments, e.g.
+        the `--filter-from` option.
 
     Returns
     -------
@@ -977,12 +1333,23 @@ def handle_rclone_arguments(
     elif overwrite == "if_source_newer":
         extra_arguments_list += [rclone_args("if_source_newer_overwrite")]
 
-    if rclone_options["show_transfer_progress"]:
+    # With `--progress`, stats are shown on the terminal display instead of
+    # being logged, so are not output for the progress callback.
+    if (
+        rclone_options["show_transfer_progress"]
+        and rclone_options["stats_interval"] is None
+    ):
         extra_arguments_list += [rclone_args("progress")]
 
     if rclone_options["dry_run"]:
         extra_arguments_list += [rclone_args("dry_run")]
 
+    if rclone_options["transfers"] is not None:
+        extra_arguments_list += [f"--transfers {rclone_options['transfers']}"]
+
+    if rclone_options["stats_interval"] is not None:
+        extra_arguments_list += [f"--stats {rclone_options['stats_interval']}"]
+
     extra_arguments_list += include_list
 
     extra_arguments = " ".join(extra_arguments_list)
@@ -990,6 +1357,27 @@ def handle_rclone_arguments(
     return extra_arguments
 
 
+def make_rclone_daemon_transfer_options(rclone_options: Dict) -> Dict:
+    """Convert the transfer options to rclone config options for the daemon.
+
+    These are the equivalent of the flags set in `handle_rclone_arguments()`,
+    named as in `rclone rc options/get`.
+    """
+    overwrite = rclone_options["overwrite_existing_files"]
+
+    config_options = {
+        "IgnoreExisting": overwrite == "never",
+        "IgnoreTimes": overwrite == "always",
+        "UpdateOlder": overwrite == "if_source_newer",
+        "DryRun": rclone_options["dry_run"],
+    }
+
+    if rclone_options["transfers"] is not None:
+        config_options["Transfers"] = rclone_options["transfers"]
+
+    return config_options
+
+
 def rclone_args(name: str) -> str:
     """Return list of Rclone commands."""
     valid_names = [
@@ -0,0 +1,100 @@
+"""Module for cancelling rclone calls running on another thread.
+
+Long-running rclone calls (e.g. `rclone check`) may be run in a worker
+thread, for example in the TUI. Cancelling the worker does not stop the
+rclone process, which continues until complete. Instead, calls made
+within `RcloneCanceller.activate()` register a function to stop them,
+so they can be stopped from another thread with `RcloneCanceller.cancel()`.
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+from datashuttle.utils.custom_exceptions import RcloneCallCancelledError
+
+# The canceller active on each thread, see `RcloneCanceller.activate()`.
+_thread_state = threading.local()
+
+
+class RcloneCanceller:
+    """Stop the rclone calls made on a thread.
+
+    Used as:
+
+        canceller = RcloneCanceller()
+
+        # On the worker thread
+        with canceller.activate():
+            rclone.perform_rclone_check(...)
+
+        # On any other thread
+        canceller.cancel()
+
+    When cancelled, running rclone processes are killed and running
+    daemon jobs are stopped. The interrupted call (and any later call on
+    the thread) raises `RcloneCallCancelledError`, so that incomplete
+    outputs are not used.
+    """
+
+    def __init__(self) -> None:
+        """Initialise the RcloneCanceller."""
+        self.cancelled = False
+        self._lock = threading.Lock()
+        self._stop_functions: Dict[int, Callable[[], None]] = {}
+        self._keys = itertools.count()
+
+    @contextmanager
+    def activate(self) -> Iterator[None]:
+        """Make this the canceller for rclone calls made on the current thread."""
+        previous_canceller = get_active_canceller()
+        _thread_state.canceller = self
+        try:
+            yield
+        finally:
+            _thread_state.canceller = previous_canceller
+
+    @contextmanager
+    def register(self, stop: Callable[[], None]) -> Iterator[None]:
+        """Register the function that stops an rclone call for the duration of the call.
+
+        Raises `RcloneCallCancelledError` on entry if already
+        cancelled, and on exit if cancelled during the call.
+        """
+        with self._lock:
+            self.raise_if_cancelled()
+            key = next(self._keys)
+            self._stop_functions[key] = stop
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._stop_functions.pop(key, None)
+
+        self.raise_if_cancelled()
+
+    def cancel(self) -> None:
+        """Stop all registered rclone calls and prevent any further calls."""
+        with self._lock:
+            self.cancelled = True
+            stop_functions = list(self._stop_functions.values())
+
+        for stop in stop_functions:
+            try:
+                stop()
+            except Exception:
+                # The call may have finished (e.g. process already exited).
+                pass
+
+    def raise_if_cancelled(self) -> None:
+        """Raise `RcloneCallCancelledError` if cancelled."""
+        if self.cancelled:
+            raise RcloneCallCancelledError("The rclone call was cancelled.")
+
+
+def get_active_canceller() -> Optional[RcloneCanceller]:
+    """Return the canceller for rclone calls made on the current thread, if any."""
+    return getattr(_thread_state, "canceller", None)
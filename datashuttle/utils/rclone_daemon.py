@@ -0,0 +1,642 @@
+"""Module for running rclone commands through a persistent `rclone rcd` daemon.
+
+Every `rclone` command-line call starts a new process, which must re-read
+(and possibly decrypt) the config file and open a new connection to the
+central storage. Instead, an `rclone rcd` (remote-control daemon) can be
+started once and commands sent to it over HTTP (see
+https://rclone.org/rc/). The daemon keeps connections to the backend open
+between calls.
+
+The functions here return `subprocess.CompletedProcess` objects with the
+same content as the equivalent command-line call, so callers can handle
+the outputs identically.
+"""
+
+from __future__ import annotations
+
+from typing import IO, TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from datashuttle.configs.config_class import Configs
+
+import atexit
+import base64
+import json
+import os
+import secrets
+import socket
+import subprocess
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from contextlib import nullcontext
+from datetime import datetime
+from subprocess import CompletedProcess
+
+from datashuttle.utils import rclone_canceller, rclone_encryption, utils
+
+# Daemons that are currently running, keyed by the path
+# of the rclone config file they were started with.
+_active_daemons: Dict[str, RcloneDaemon] = {}
+
+DAEMON_START_TIMEOUT_S = 20.0
+JOB_POLL_INTERVAL_S = 0.1
+
+TRANSFERRED_LIST_INCOMPLETE_MSG = (
+    "Not all transferred files could be listed by the rclone daemon."
+)
+
+
+class RcloneDaemon:
+    """A running `rclone rcd` process, listening on localhost.
+
+    Parameters
+    ----------
+    config_filepath
+        Path to the rclone config file to start the daemon with. If `None`,
+        rclone's default config file is used (as for local filesystem
+        connections).
+
+    """
+
+    def __init__(self, config_filepath: Optional[Path] = None) -> None:
+        """Initialise the RcloneDaemon. The daemon is started with `start()`."""
+        self.config_filepath = config_filepath
+        self.config_mtime = self.get_config_mtime()
+
+        self.process: Optional[subprocess.Popen] = None
+        self.url = ""
+        self._log_file: Optional[IO[bytes]] = None
+
+        self._user = utils.get_random_string()
+        self._password = secrets.token_urlsafe(24)
+
+    # -------------------------------------------------------------------------
+    # Process management
+    # -------------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the `rclone rcd` process and wait until it accepts requests.
+
+        If the config file is encrypted, the rclone password command must be
+        set as an environment variable when this is called (the config is
+        decrypted once, on start-up).
+        """
+        port = get_free_port()
+        self.url = f"http://127.0.0.1:{port}/"
+
+        command = [
+            "rclone",
+            "rcd",
+            f"--rc-addr=127.0.0.1:{port}",
+        ]
+        if self.config_filepath is not None:
+            command += [f"--config={self.config_filepath}"]
+
+        # stdout / stderr are written to a file rather than a pipe
+        # to ensure the daemon never blocks on a full pipe buffer.
+        self._log_file = tempfile.TemporaryFile()
+
+        try:
+            self.process = subprocess.Popen(
+                command,
+                stdout=self._log_file,
+                stderr=subprocess.STDOUT,
+                env=self.get_process_env(),
+            )
+        except FileNotFoundError:
+            utils.log_and_raise_error(
+                "RClone installation not found. Install by entering "
+                "the following into your terminal:\n"
+                "  conda install -c conda-forge rclone",
+                RuntimeError,
+            )
+
+        self.config_mtime = self.get_config_mtime()
+        self.wait_until_ready()
+
+    def get_process_env(self) -> Dict[str, str]:
+        """Return the environment to start the daemon with.
+
+        The remote-control user and password are passed as environment
+        variables rather than command-line arguments, which can be
+        read by any user on the machine (e.g. with `ps`).
+        """
+        return {
+            **os.environ,
+            "RCLONE_RC_USER": self._user,
+            "RCLONE_RC_PASS": self._password,
+        }
+
+    def wait_until_ready(self) -> None:
+        """Poll the daemon until it responds, raising if it fails to start."""
+        assert self.process is not None, "Daemon has not been started."
+
+        start_time = time.time()
+
+        while time.time() - start_time < DAEMON_START_TIMEOUT_S:
+            if self.process.poll() is not None:
+                break
+            try:
+                self.call("rc/noopauth")
+                return
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.05)
+
+        daemon_output = self.read_log()
+        self.stop()
+        utils.log_and_raise_error(
+            f"Could not start the rclone daemon.\n{daemon_output}",
+            RuntimeError,
+        )
+
+    def stop(self) -> None:
+        """Shut down the daemon, killing the process if it does not exit."""
+        if self.process is None:
+            return
+
+        if self.is_running():
+            try:
+                self.call("core/quit")
+                self.process.wait(timeout=5)
+            except (
+                urllib.error.URLError,
+                ConnectionError,
+                subprocess.TimeoutExpired,
+            ):
+                self.process.kill()
+                self.process.wait()
+
+        self.process = None
+
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+
+    def is_running(self) -> bool:
+        """Return a bool indicating whether the daemon process is alive."""
+        return self.process is not None and self.process.poll() is None
+
+    def read_log(self) -> str:
+        """Return everything the daemon has written to stdout and stderr."""
+        if self._log_file is None:
+            return ""
+        self._log_file.seek(0)
+        return self._log_file.read().decode("utf-8", errors="replace")
+
+    def get_config_mtime(self) -> Optional[float]:
+        """Return the modification time of the rclone config file, if it exists."""
+        if self.config_filepath is None or not self.config_filepath.is_file():
+            return None
+        return self.config_filepath.stat().st_mtime
+
+    def config_has_changed(self) -> bool:
+        """Return a bool indicating whether the config file changed since start.
+
+        The daemon reads the config file once, so it must be restarted
+        if the connection is set up again (e.g. a new SSH key or token).
+        """
+        return self.get_config_mtime() != self.config_mtime
+
+    # -------------------------------------------------------------------------
+    # Remote control API
+    # -------------------------------------------------------------------------
+
+    def call(self, command: str, params: Optional[Dict] = None) -> Dict:
+        """Send a command to the daemon and return the decoded response.
+
+        Raises `ConnectionError` with rclone's error message if the
+        command failed.
+        """
+        request = urllib.request.Request(
+            self.url + command,
+            data=json.dumps(params or {}).encode("utf-8"),
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": self.get_auth_header(),
+            },
+        )
+        try:
+            with urllib.request.urlopen(request) as response:
+                return json.loads(response.read())
+
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read())["error"]
+            except (json.JSONDecodeError, KeyError):
+                message = str(e)
+            raise ConnectionError(message) from e
+
+    def run_job(
+        self,
+        command: str,
+        params: Dict,
+        on_poll: Optional[Callable[[int], None]] = None,
+    ) -> Dict:
+        """Run a command as an asynchronous rclone job and wait for it to finish.
+
+        If interrupted (e.g. by KeyboardInterrupt), the job is stopped on
+        the daemon before re-raising. If `on_poll` is given, it is called
+        with the job id each time the job status is checked. If a canceller
+        is active on the thread (see `rclone_canceller`) it stops the job.
+
+        Returns
+        -------
+        The `job/status` output of the finished job. This contains
+        the command's output under "output".
+
+        """
+        canceller = rclone_canceller.get_active_canceller()
+
+        if canceller is not None:
+            canceller.raise_if_cancelled()
+
+        job_id = self.call(command, {**params, "_async": True})["jobid"]
+
+        def stop_job() -> None:
+            self.call("job/stop", {"jobid": job_id})
+
+        try:
+            with (
+                nullcontext()
+                if canceller is None
+                else canceller.register(stop_job)
+            ):
+                while True:
+                    status = self.call("job/status", {"jobid": job_id})
+                    if status["finished"]:
+                        break
+                    if on_poll is not None:
+                        on_poll(job_id)
+                    time.sleep(JOB_POLL_INTERVAL_S)
+
+        except BaseException:
+            if self.is_running():
+                self.call("job/stop", {"jobid": job_id})
+            raise
+
+        return status
+
+    def get_auth_header(self) -> str:
+        """Return the HTTP basic-authentication header for the daemon."""
+        credentials = f"{self._user}:{self._password}".encode("utf-8")
+        return "Basic " + base64.b64encode(credentials).decode("utf-8")
+
+    # -------------------------------------------------------------------------
+    # rclone commands
+    # -------------------------------------------------------------------------
+
+    def lsjson(
+        self, fs: str, max_depth: Optional[int] = None
+    ) -> CompletedProcess:
+        """List a folder, matching the output of `rclone lsjson`.
+
+        Parameters
+        ----------
+        fs
+            The remote and path to list e.g. "central_project_ssh:path/to/folder".
+
+        max_depth
+            If not `None`, list recursively to this depth
+            (i.e. `rclone lsjson -R --max-depth <max_depth>`).
+
+        """
+        params: Dict[str, Any] = {"fs": fs, "remote": ""}
+
+        if max_depth is not None:
+            params["opt"] = {"recurse": True}
+            params["_config"] = {"MaxDepth": max_depth}
+
+        try:
+            output = self.call("operations/list", params)
+        except ConnectionError as e:
+            return make_completed_process(f"lsjson {fs}", 1, stderr=str(e))
+
+        return make_completed_process(
+            f"lsjson {fs}", 0, stdout=json.dumps(output["list"])
+        )
+
+    def check(
+        self,
+        src_fs: str,
+        dst_fs: str,
+        exclude: List[str],
+        files_from: Optional[str] = None,
+    ) -> CompletedProcess:
+        """Compare two folders, matching the output of `rclone check --combined -`.
+
+        If `files_from` is given, only the files listed in
+        this file are checked (as `--files-from-raw`).
+        """
+        filter_options: Dict[str, Any] = {"ExcludeRule": exclude}
+
+        if files_from is not None:
+            filter_options["FilesFromRaw"] = [files_from]
+
+        try:
+            status = self.run_job(
+                "operations/check",
+                {
+                    "srcFs": src_fs,
+                    "dstFs": dst_fs,
+                    "combined": True,
+                    "_filter": filter_options,
+                },
+            )
+        except ConnectionError as e:
+            return make_completed_process(
+                f"check {src_fs} {dst_fs}", 1, stderr=str(e)
+            )
+
+        combined = status["output"].get("combined") or []
+
+        return make_completed_process(
+            f"check {src_fs} {dst_fs}",
+            0 if status["output"].get("success") else 1,
+            stdout="".join(f"{result}\n" for result in combined),
+            stderr=status["error"],
+        )
+
+    def copy(
+        self,
+        src_fs: str,
+        dst_fs: str,
+        filter_options: Dict[str, Any],
+        config_options: Dict[str, Any],
+        stats_callback: Optional[Callable[[Dict], None]] = None,
+    ) -> CompletedProcess:
+        """Copy files, returning output in the format of `rclone copy --use-json-log`.
+
+        Only the per-file results and the final stats are returned
+        (as json log lines), which is the information extracted from the
+        command-line output by `rclone.reformat_rclone_copy_output_line()`.
+
+        rclone keeps only the most recent completed transfers of a job
+        (see `transferred_list_is_incomplete()`). If some were dropped,
+        a line with the message `TRANSFERRED_LIST_INCOMPLETE_MSG`
+        is added. If not all errors are listed, an error
+        giving the total number of errors is added.
+
+        Parameters
+        ----------
+        src_fs
+            The source remote and path.
+
+        dst_fs
+            The destination remote and path.
+
+        filter_options
+            rclone filter options for the transfer,
+            see `make_filter_options()`.
+
+        config_options
+            rclone global options to set for the transfer,
+            e.g. `{"DryRun": True}`. See `rclone rc options/get`.
+
+        stats_callback
+            If not `None`, called with the job's `core/stats` output
+            while the copy runs.
+
+        """
+        try:
+            status = self.run_job(
+                "sync/copy",
+                {
+                    "srcFs": src_fs,
+                    "dstFs": dst_fs,
+                    "_filter": filter_options,
+                    "_config": config_options,
+                },
+                on_poll=(
+                    None
+                    if stats_callback is None
+                    else lambda job_id: stats_callback(
+                        self.call("core/stats", {"group": f"job/{job_id}"})
+                    )
+                ),
+            )
+        except ConnectionError as e:
+            return make_completed_process(
+                f"copy {src_fs} {dst_fs}",
+                1,
+                stderr=make_json_log_line("error", str(e)),
+            )
+
+        group = f"job/{status['id']}"
+        stats = self.call("core/stats", {"group": group})
+        transferred = self.call("core/transferred", {"group": group})[
+            "transferred"
+        ]
+        self.call("core/stats-delete", {"group": group})
+
+        log_lines = []
+        for transfer in transferred:
+            if transfer["error"]:
+                log_lines.append(
+                    make_json_log_line(
+                        "error", transfer["error"], object=transfer["name"]
+                    )
+                )
+            else:
+                # Match the message logged by `rclone copy` for copied files.
+                msg = (
+                    "Copied"
+                    if transfer["what"] == "transferring"
+                    else transfer["what"]
+                )
+                log_lines.append(
+                    make_json_log_line("info", msg, object=transfer["name"])
+                )
+
+        num_listed_errors = sum(
+            bool(transfer["error"]) for transfer in transferred
+        )
+        if status["error"] and not num_listed_errors:
+            log_lines.append(make_json_log_line("error", status["error"]))
+
+        list_is_incomplete = transferred_list_is_incomplete(transferred, stats)
+        has_unlisted_errors = stats["errors"] > num_listed_errors
+
+        if has_unlisted_errors and (list_is_incomplete or num_listed_errors):
+            log_lines.append(
+                make_json_log_line(
+                    "error",
+                    f"{stats['errors']} errors occurred during the "
+                    f"transfer, but only {num_listed_errors} could be listed.",
+                )
+            )
+
+        if list_is_incomplete:
+            log_lines.append(
+                make_json_log_line("warning", TRANSFERRED_LIST_INCOMPLETE_MSG)
+            )
+
+        log_lines.append(make_json_log_line("info", "Transfer stats", stats))
+
+        return make_completed_process(
+            f"copy {src_fs} {dst_fs}",
+            0 if status["success"] else 1,
+            stderr="\n".join(log_lines),
+        )
+
+    def touch(self, fs: str, remote: str) -> CompletedProcess:
+        """Create an empty file at `remote` within `fs`, as `rclone touch`."""
+        with tempfile.TemporaryDirectory() as tmp_folder:
+            with open(f"{tmp_folder}/empty_file", "w"):
+                pass
+            try:
+                self.call(
+                    "operations/copyfile",
+                    {
+                        "srcFs": tmp_folder,
+                        "srcRemote": "empty_file",
+                        "dstFs": fs,
+                        "dstRemote": remote,
+                    },
+                )
+            except ConnectionError as e:
+                return make_completed_process(
+                    f"touch {fs}{remote}", 1, stderr=str(e)
+                )
+
+        return make_completed_process(f"touch {fs}{remote}", 0)
+
+    def deletefile(self, fs: str, remote: str) -> CompletedProcess:
+        """Delete the file at `remote` within `fs`."""
+        try:
+            self.call("operations/deletefile", {"fs": fs, "remote": remote})
+        except ConnectionError as e:
+            return make_completed_process(
+                f"delete {fs}{remote}", 1, stderr=str(e)
+            )
+
+        return make_completed_process(f"delete {fs}{remote}", 0)
+
+
+# -----------------------------------------------------------------------------
+# Active daemons
+# -----------------------------------------------------------------------------
+
+
+def get_daemon_key(cfg: Configs) -> str:
+    """Return the key for the daemon serving the `connection_method` of `cfg`.
+
+    Local filesystem connections use rclone's default config
+    file (key ""), all others have a separate config file.
+    """
+    if rclone_encryption.connection_method_requires_encryption(
+        cfg["connection_method"]
+    ):
+        return cfg.rclone.get_rclone_central_connection_config_filepath().as_posix()
+    return ""
+
+
+def get_active_daemon(cfg: Configs) -> Optional[RcloneDaemon]:
+    """Return the running daemon for the `connection_method` of `cfg`, if there is one."""
+    if not _active_daemons:
+        return None
+
+    daemon = _active_daemons.get(get_daemon_key(cfg))
+
+    if daemon is None or not daemon.is_running():
+        return None
+
+    return daemon
+
+
+def register_daemon(cfg: Configs, daemon: RcloneDaemon) -> None:
+    """Store a started daemon so it is used for rclone calls made with `cfg`."""
+    stop_daemon(cfg)
+    _active_daemons[get_daemon_key(cfg)] = daemon
+
+
+def stop_daemon(cfg: Configs) -> None:
+    """Stop the daemon for the `connection_method` of `cfg`, if there is one."""
+    daemon = _active_daemons.pop(get_daemon_key(cfg), None)
+
+    if daemon is not None:
+        daemon.stop()
+
+
+@atexit.register
+def stop_all_daemons() -> None:
+    """Stop all daemons. This is run on interpreter exit."""
+    while _active_daemons:
+        _, daemon = _active_daemons.popitem()
+        daemon.stop()
+
+
+# -----------------------------------------------------------------------------
+# Utils
+# -----------------------------------------------------------------------------
+
+
+def get_free_port() -> int:
+    """Return a currently unused port on localhost."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def make_filter_options(filter_flag: str, filter_filepath: str) -> Dict:
+    """Convert an rclone filter-file flag to the equivalent `_filter` option.
+
+    See `rclone.write_transfer_filter_file()`.
+    """
+    option_name = {
+        "--files-from-raw": "FilesFromRaw",
+        "--filter-from": "FilterFrom",
+    }[filter_flag]
+
+    return {option_name: [filter_filepath]}
+
+
+def transferred_list_is_incomplete(
+    transferred: List[Dict], stats: Dict
+) -> bool:
+    """Return whether completed transfers are missing from a `core/transferred` list.
+
+    rclone keeps only the most recent completed transfers and checks of a
+    stats group (100 by default), so for large transfers the list is
+    incomplete. This is detected by comparing the number listed against
+    the counts in the `core/stats` output for the same group.
+    """
+    num_checks = sum(transfer["checked"] for transfer in transferred)
+    num_transfers = len(transferred) - num_checks
+
+    return num_transfers < stats["transfers"] or num_checks < stats["checks"]
+
+
+def make_json_log_line(
+    level: str,
+    msg: str,
+    stats: Optional[Dict] = None,
+    object: Optional[str] = None,
+) -> str:
+    """Format a log line as output by rclone with `--use-json-log`."""
+    line: Dict[str, Any] = {
+        "time": datetime.now().astimezone().isoformat(),
+        "level": level,
+        "msg": msg,
+    }
+    if object is not None:
+        line["object"] = object
+    if stats is not None:
+        line["stats"] = stats
+
+    return json.dumps(line)
+
+
+def make_completed_process(
+    args: str, returncode: int, stdout: str = "", stderr: str = ""
+) -> CompletedProcess:
+    """Return a `CompletedProcess` holding output as from an rclone command-line call."""
+    return CompletedProcess(
+        args=f"rclone {args}",
+        returncode=returncode,
+        stdout=stdout.encode("utf-8"),
+        stderr=stderr.encode("utf-8"),
+    )
@@ -5,13 +5,15 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from pathlib import Path
 
+    import paramiko
+
     from datashuttle.configs.config_class import Configs
 
 from io import StringIO
 from typing import Optional
 
-import paramiko
-
+# `paramiko` is slow to import, so is only imported
+# in the functions below when an SSH connection is used.
 from datashuttle.configs import canonical_configs
 from datashuttle.utils import utils
 
@@ -143,6 +145,8 @@ def add_public_key_to_central_authorized_keys(
         If `True`, log the client connection process.
 
     """
+    import paramiko
+
     client: paramiko.SSHClient
     with paramiko.SSHClient() as client:
         connect_client(client, cfg, password=server_password, log=log)
@@ -173,6 +177,8 @@ def generate_ssh_key_strings():
 
 def generate_ssh_key() -> paramiko.RSAKey:
     """Generate an RSA SSH key."""
+    import paramiko
+
     return paramiko.RSAKey.generate(4096)
 
 
@@ -183,6 +189,8 @@ def connect_client(
     log=True,
 ) -> None:
     """Connect client to central server using paramiko."""
+    import paramiko
+
     try:
         client.get_host_keys().load(cfg.hostkeys_path.as_posix())
         client.set_missing_host_key_policy(paramiko.RejectPolicy())
@@ -235,6 +243,8 @@ def save_hostkey_locally(key, central_host_id, hostkeys_path) -> None:
         The file path where host keys are stored locally.
 
     """
+    import paramiko
+
     client = paramiko.SSHClient()
 
     port = canonical_configs.get_default_ssh_port()
@@ -257,6 +267,8 @@ def get_remote_server_key(central_host_id: str):
         The hostname or IP address of the central host.
 
     """
+    import paramiko
+
     transport: paramiko.Transport
     with paramiko.Transport(
         (central_host_id, canonical_configs.get_default_ssh_port())
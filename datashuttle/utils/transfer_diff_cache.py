@@ -0,0 +1,422 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from datashuttle.configs.config_class import Configs
+    from datashuttle.utils.custom_types import TopLevelFolder
+
+import json
+import os
+import stat
+import threading
+import time
+
+from datashuttle.utils import project_index, project_snapshot, rclone, utils
+
+CACHE_VERSION = 1
+
+# Statuses output by `rclone check --combined`, see `rclone.get_local_and_central_file_differences()`.
+CHECK_SYMBOLS = {
+    "=": "same",
+    "*": "different",
+    "+": "local_only",
+    "-": "central_only",
+    "!": "error",
+}
+
+_cache_lock = threading.Lock()
+
+
+class TransferDiffCache:
+    """A record of the transfer status of every file in the project, stored on disk.
+
+    Finding differences between local and central with `rclone check`
+    compares every file in the project (by hash, where available),
+    which can take minutes on large projects. Instead, the status of
+    each file is stored together with the size and modification time
+    of the local and central file it was computed from.
+
+    When refreshed, local files are listed (see `ProjectIndex`) and central
+    files are listed with a single `rclone lsjson` call. Only files that are
+    new, or whose size or modification time has changed on either side
+    since they were last checked, are passed to `rclone check`.
+
+    The cache is stored in the project `.datashuttle` folder and
+    is discarded if the central project changes.
+
+    Parameters
+    ----------
+    cache_path
+        Path to the cache file.
+
+    central_key
+        Identifies the central project the statuses were computed against.
+
+    files
+        A dictionary where keys are file paths relative to the project
+        folder and values are a dictionary with the file "status" (see
+        `CHECK_SYMBOLS`), the "local" (size, mtime in ns, time checked
+        in ns) and "central" (size, mod time) of the file when checked.
+        The "central" entry is `None` if not yet known (e.g. after
+        the file was transferred).
+
+    """
+
+    def __init__(
+        self,
+        cache_path: Path,
+        central_key: List[str],
+        files: Dict[str, Dict[str, Any]],
+    ) -> None:
+        """Initialise the TransferDiffCache."""
+        self.cache_path = cache_path
+        self.central_key = central_key
+        self.files = files
+
+    @classmethod
+    def load(cls, cfg: Configs) -> TransferDiffCache:
+        """Load the cache for the project, or an empty cache if none is valid."""
+        cache_path = get_cache_path(cfg)
+        central_key = get_central_key(cfg)
+
+        try:
+            with open(cache_path, encoding="utf-8") as cache_file:
+                contents = json.load(cache_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return cls(cache_path, central_key, {})
+
+        if (
+            contents.get("version") != CACHE_VERSION
+            or contents.get("central_key") != central_key
+        ):
+            return cls(cache_path, central_key, {})
+
+        return cls(cache_path, central_key, contents["files"])
+
+    def save(self) -> None:
+        """Write the cache to disk, replacing any existing cache file."""
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        temp_path = self.cache_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as cache_file:
+            json.dump(
+                {
+                    "version": CACHE_VERSION,
+                    "central_key": self.central_key,
+                    "files": self.files,
+                },
+                cache_file,
+            )
+        os.replace(temp_path, self.cache_path)
+
+    def refresh(
+        self, cfg: Configs, top_level_folder: TopLevelFolder
+    ) -> Dict[str, List[str]]:
+        """Update the status of all files in the top-level folder.
+
+        Returns
+        -------
+        A dictionary where keys are the statuses (see `CHECK_SYMBOLS`)
+        and values are lists of the file paths (relative to the
+        project folder) with this status.
+
+        """
+        local_files = list_local_files(cfg, top_level_folder)
+        central_files = list_central_files(cfg, top_level_folder)
+
+        statuses: Dict[str, str] = {}
+        paths_to_check = []
+
+        for path_ in local_files.keys() | central_files.keys():
+            local = local_files.get(path_)
+            central = central_files.get(path_)
+
+            if central is None:
+                statuses[path_] = "local_only"
+            elif local is None:
+                statuses[path_] = "central_only"
+            elif self.is_up_to_date(path_, local, central):
+                self.files[path_]["central"] = central
+                statuses[path_] = self.files[path_]["status"]
+            else:
+                paths_to_check.append(path_)
+
+        checked_at_ns = time.time_ns()
+
+        for path_, status in check_files(
+            cfg, top_level_folder, paths_to_check
+        ).items():
+            if path_ not in local_files or path_ not in central_files:
+                continue
+            statuses[path_] = status
+            self.files[path_] = {
+                "status": status,
+                "local": local_files[path_] + [checked_at_ns],
+                "central": central_files[path_],
+            }
+
+        # Files only on one side are not stored, drop any that were
+        # previously checked (e.g. the file was deleted).
+        prefix = f"{top_level_folder}/"
+        for path_ in list(self.files):
+            if path_.startswith(prefix) and statuses.get(path_) in [
+                None,
+                "local_only",
+                "central_only",
+            ]:
+                del self.files[path_]
+
+        transfer_diffs: Dict[str, List[str]] = {
+            status: [] for status in CHECK_SYMBOLS.values()
+        }
+        for path_, status in sorted(statuses.items()):
+            transfer_diffs[status].append(path_)
+
+        return transfer_diffs
+
+    def is_up_to_date(
+        self, path_: str, local: List[int], central: List[Any]
+    ) -> bool:
+        """Return a bool indicating whether the stored status of a file can be used.
+
+        The local and central file must be unchanged since the status was
+        computed. A file modified just before it was checked may be modified
+        again without its mtime changing, so it is always re-checked (see
+        `project_index.RACY_MTIME_WINDOW_NS`). If the central file is not yet
+        known (i.e. it was just transferred) it is accepted if its size matches.
+        """
+        entry = self.files.get(path_)
+
+        if entry is None:
+            return False
+
+        size, mtime_ns, checked_at_ns = entry["local"]
+
+        if [size, mtime_ns] != local:
+            return False
+
+        if checked_at_ns - mtime_ns <= project_index.RACY_MTIME_WINDOW_NS:
+            return False
+
+        if entry["central"] is None:
+            return central[0] == size
+
+        return entry["central"] == central
+
+    def update_from_transferred_files(
+        self, cfg: Configs, transferred_file_names: List[str]
+    ) -> None:
+        """Mark files just copied by `rclone copy` as the same across local and central.
+
+        Parameters
+        ----------
+        cfg
+            datashuttle Configs.
+
+        transferred_file_names
+            Paths of the transferred files, relative to the project
+            folder (see `TransferOutput`).
+
+        """
+        checked_at_ns = time.time_ns()
+
+        for path_ in transferred_file_names:
+            local = stat_local_file(cfg["local_path"] / path_)
+
+            if local is None:
+                self.files.pop(path_, None)
+                continue
+
+            self.files[path_] = {
+                "status": "same",
+                "local": local + [checked_at_ns],
+                "central": None,
+            }
+
+
+# -----------------------------------------------------------------------------
+# Using the cache
+# -----------------------------------------------------------------------------
+
+
+def get_transfer_diffs(
+    cfg: Configs, top_level_folders_to_check: List[TopLevelFolder]
+) -> Dict[str, List[str]]:
+    """Refresh the cached transfer status of the top-level folders and return it.
+
+    See `rclone.get_local_and_central_file_differences()`.
+    """
+    with _cache_lock:
+        cache = TransferDiffCache.load(cfg)
+
+        transfer_diffs: Dict[str, List[str]] = {
+            status: [] for status in CHECK_SYMBOLS.values()
+        }
+        for top_level_folder in top_level_folders_to_check:
+            for status, paths in cache.refresh(cfg, top_level_folder).items():
+                transfer_diffs[status] += paths
+
+        cache.save()
+
+    return transfer_diffs
+
+
+def update_from_transferred_files(
+    cfg: Configs, transferred_file_names: Optional[List[str]]
+) -> None:
+    """Update the cache after a transfer, if transfer differences have been cached.
+
+    If `transferred_file_names` is `None` (i.e. too many files were transferred
+    to record, see `TransferOutput`) the cache is deleted instead.
+    """
+    if transferred_file_names is None:
+        with _cache_lock:
+            get_cache_path(cfg).unlink(missing_ok=True)
+        return
+
+    if not transferred_file_names:
+        return
+
+    with _cache_lock:
+        if not get_cache_path(cfg).is_file():
+            return
+
+        cache = TransferDiffCache.load(cfg)
+        cache.update_from_transferred_files(cfg, transferred_file_names)
+        cache.save()
+
+
+def get_cache_path(cfg: Configs) -> Path:
+    """Return the path to the transfer differences cache of the project."""
+    return cfg.project_metadata_path / "transfer_diffs.json"
+
+
+def get_central_key(cfg: Configs) -> List[str]:
+    """Return the rclone config name and central path the cache is computed against.
+
+    The central path may be `None` for Google Drive projects (see
+    `Configs.get_base_folder()`), in which case it is stored as "".
+    """
+    central_path = cfg["central_path"]
+
+    return [
+        cfg.rclone.get_rclone_config_name(cfg["connection_method"]),
+        "" if central_path is None else central_path.as_posix(),
+    ]
+
+
+# -----------------------------------------------------------------------------
+# Listing and checking files
+# -----------------------------------------------------------------------------
+
+
+def list_local_files(
+    cfg: Configs, top_level_folder: TopLevelFolder
+) -> Dict[str, List[int]]:
+    """Return the (size, mtime in ns) of all files in the local top-level folder.
+
+    Keys are the file paths relative to the project folder. As for
+    `rclone check`, symlinks are not followed.
+    """
+    local_path = cfg["local_path"]
+    local_files = {}
+
+    for folder, _, filenames in project_index.get_project_index().walk(
+        local_path / top_level_folder
+    ):
+        relative_folder = folder[len(local_path.as_posix()) + 1 :]
+
+        for filename in filenames:
+            local = stat_local_file(f"{folder}/{filename}")
+            if local is not None:
+                local_files[f"{relative_folder}/{filename}"] = local
+
+    return local_files
+
+
+def stat_local_file(filepath: Path | str) -> Optional[List[int]]:
+    """Return the (size, mtime in ns) of a file, or `None` if it is not a regular file."""
+    try:
+        file_stat = os.lstat(filepath)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+    if not stat.S_ISREG(file_stat.st_mode):
+        return None
+
+    return [file_stat.st_size, file_stat.st_mtime_ns]
+
+
+def list_central_files(
+    cfg: Configs, top_level_folder: TopLevelFolder
+) -> Dict[str, List[Any]]:
+    """Return the (size, mod time) of all files in the central top-level folder.
+
+    Keys are the file paths relative to the project folder. If the folder
+    does not exist on central no files are returned. If it cannot be listed
+    for any other reason (e.g. the connection failed) `ConnectionError` is
+    raised, so the cached statuses are not replaced.
+    """
+    central_folder = cfg.get_base_folder(
+        "central", top_level_folder
+    ).as_posix()
+
+    output = rclone.call_rclone_lsjson_for_central_connection(
+        cfg, central_folder, max_depth=-1
+    )
+
+    if output.returncode != 0:
+        stderr = output.stderr.decode("utf-8") if output.stderr else ""
+
+        if project_snapshot.RCLONE_FOLDER_NOT_FOUND_ERROR in stderr:
+            return {}
+
+        utils.log_and_raise_error(
+            f"Could not list the central folder {central_folder}.\n{stderr}",
+            ConnectionError,
+        )
+
+    return {
+        f"{top_level_folder}/{file_or_folder['Path']}": [
+            file_or_folder["Size"],
+            file_or_folder["ModTime"],
+        ]
+        for file_or_folder in json.loads(output.stdout)
+        if not file_or_folder.get("IsDir", False)
+    }
+
+
+def check_files(
+    cfg: Configs, top_level_folder: TopLevelFolder, paths_to_check: List[str]
+) -> Dict[str, str]:
+    """Compare files found on both local and central with `rclone check`.
+
+    Returns
+    -------
+    A dictionary where keys are the checked file paths (relative
+    to the project folder) and values their status.
+
+    """
+    if not paths_to_check:
+        return {}
+
+    rclone_output = rclone.perform_rclone_check(
+        cfg, top_level_folder, files_from=paths_to_check
+    )
+
+    statuses = {}
+    for result in rclone_output.split("\n"):
+        if result == "":
+            continue
+
+        symbol = result[0]
+
+        rclone.assert_rclone_check_output_is_as_expected(
+            result, symbol, CHECK_SYMBOLS
+        )
+        statuses[result[2:]] = CHECK_SYMBOLS[symbol]
+
+    return statuses
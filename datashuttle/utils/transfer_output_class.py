@@ -1,6 +1,11 @@
 from __future__ import annotations
 
 from collections import UserDict
+from typing import List, Optional
+
+# The maximum number of transferred file paths held in a `TransferOutput`,
+# so memory use does not grow without limit on large transfers.
+MAX_TRANSFERRED_FILE_NAMES = 100_000
 
 
 class TransferOutput(UserDict):
@@ -23,6 +28,11 @@ class TransferOutput(UserDict):
                 there will be an associated message, but it is also possible to
                 have messages that are not associated with any file name.
 
+        transferred_file_names:
+            A list of the paths of the files that were copied, relative
+            to the project folder (e.g. "rawdata/sub-001/file.txt").
+            `None` if more than `MAX_TRANSFERRED_FILE_NAMES` files were copied.
+
         num_transferred:
             rawdata or derivatives
                 A flag that can take the value `None` or an int.
@@ -36,6 +46,7 @@ class TransferOutput(UserDict):
         super().__init__(
             {
                 "errors": {"file_names": [], "messages": []},
+                "transferred_file_names": [],
                 "num_transferred": {
                     "rawdata": None,
                     "derivatives": None,
@@ -47,41 +58,60 @@ class TransferOutput(UserDict):
         """Return whether any errors occurred during transfer."""
         return any(self["errors"]["messages"])
 
+    def add_transferred_file_names(self, file_names: Optional[List[str]]):
+        """Add the paths of copied files, or stop recording them if there are too many.
+
+        If `file_names` is `None` (i.e. too many to record), or the total number of
+        paths exceeds `MAX_TRANSFERRED_FILE_NAMES`, "transferred_file_names" is set to `None`.
+        """
+        transferred_file_names = self["transferred_file_names"]
+
+        if transferred_file_names is None:
+            return
+
+        if (
+            file_names is None
+            or len(transferred_file_names) + len(file_names)
+            > MAX_TRANSFERRED_FILE_NAMES
+        ):
+            self["transferred_file_names"] = None
+        else:
+            transferred_file_names += file_names
+
     @classmethod
-    def merge_std_outputs(
-        cls, stdout_outputs: TransferOutput, stderr_outputs: TransferOutput
+    def merge_shard_outputs(
+        cls, top_level_folder: str, shard_outputs: List[TransferOutput]
     ):
-        """Instantiate the dictionary from stdout and stderr captures from RClone output.
+        """Instantiate the dictionary from the outputs of parallel `rclone copy` calls.
 
-        This merges stdout and stderr outputs of RClones transfers,
-        generated by the function `reformat_rclone_copy_output`.
+        Each shard transfers a subset of the files within `top_level_folder`
+        (see `TransferData.run()`). Errors and transferred files are
+        concatenated and the number of transferred files is summed across shards.
         """
-        # Note `stdout_outputs` 'num_transferred' entries are not expected to be filled in.
-        # This is not ideal, but beats having two dict formats just to handle this case.
-        # The std err entry is expected to be filled in, otherwise the RClone log format is not as we expect
-        for key in ["rawdata", "derivatives"]:
-            assert stdout_outputs["num_transferred"][key] is None
-
         instance = cls()
 
-        instance["errors"]["file_names"] = list(
-            set(
-                stdout_outputs["errors"]["file_names"]
-                + stderr_outputs["errors"]["file_names"]
+        num_transferred = None
+
+        for shard_output in shard_outputs:
+            instance["errors"]["file_names"] += shard_output["errors"][
+                "file_names"
+            ]
+            instance["errors"]["messages"] += shard_output["errors"][
+                "messages"
+            ]
+            instance.add_transferred_file_names(
+                shard_output["transferred_file_names"]
             )
-        )
 
-        instance["errors"]["messages"] = (
-            stdout_outputs["errors"]["messages"]
-            + stderr_outputs["errors"]["messages"]
-        )
+            shard_num_transferred = shard_output["num_transferred"][
+                top_level_folder
+            ]
+            if shard_num_transferred is not None:
+                num_transferred = (
+                    num_transferred or 0
+                ) + shard_num_transferred
 
-        instance["num_transferred"]["rawdata"] = stderr_outputs[
-            "num_transferred"
-        ]["rawdata"]
-        instance["num_transferred"]["derivatives"] = stderr_outputs[
-            "num_transferred"
-        ]["derivatives"]
+        instance["num_transferred"][top_level_folder] = num_transferred
 
         return instance
 
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+@dataclass
+class TransferProgress:
+    """The progress of a running transfer.
+
+    Built from the periodic `stats` lines output by `rclone copy`
+    (with `--use-json-log`). Passed to the `progress_callback`
+    of the upload and download functions while the transfer runs.
+
+    Attributes
+    ----------
+    top_level_folder
+        The top-level folder being transferred.
+
+    bytes_transferred
+        Number of bytes transferred so far.
+
+    total_bytes
+        Total number of bytes to transfer (known so far). As rclone
+        discovers files while transferring, this may increase over time.
+
+    files_transferred
+        Number of files transferred so far.
+
+    total_files
+        Total number of files to transfer (known so far).
+
+    speed
+        Current transfer speed, in bytes per second.
+
+    eta
+        Estimated time remaining, in seconds. `None` if not known.
+
+    elapsed_time
+        Time since the transfer started, in seconds.
+
+    """
+
+    top_level_folder: Optional[str]
+    bytes_transferred: int
+    total_bytes: int
+    files_transferred: int
+    total_files: int
+    speed: float
+    eta: Optional[float]
+    elapsed_time: float
+
+    @classmethod
+    def from_rclone_stats(
+        cls, top_level_folder: Optional[str], stats: Dict
+    ) -> TransferProgress:
+        """Instantiate from the `stats` entry of an rclone json log line (or `core/stats`)."""
+        return cls(
+            top_level_folder=top_level_folder,
+            bytes_transferred=stats.get("bytes", 0),
+            total_bytes=stats.get("totalBytes", 0),
+            files_transferred=stats.get("transfers", 0),
+            total_files=stats.get("totalTransfers", 0),
+            speed=stats.get("speed", 0.0),
+            eta=stats.get("eta"),
+            elapsed_time=stats.get("elapsedTime", 0.0),
+        )
+
+    @classmethod
+    def merge_shard_progress(
+        cls, shard_progress: List[TransferProgress]
+    ) -> TransferProgress:
+        """Combine the progress of transfers running in parallel (see `TransferData.run()`).
+
+        Bytes, files and speeds are summed. The combined ETA is that of the
+        slowest shard, and is `None` if any shard's ETA is unknown.
+        """
+        etas = [progress.eta for progress in shard_progress]
+
+        return cls(
+            top_level_folder=shard_progress[0].top_level_folder,
+            bytes_transferred=sum(p.bytes_transferred for p in shard_progress),
+            total_bytes=sum(p.total_bytes for p in shard_progress),
+            files_transferred=sum(p.files_transferred for p in shard_progress),
+            total_files=sum(p.total_files for p in shard_progress),
+            speed=sum(p.speed for p in shard_progress),
+            eta=None if None in etas else max(etas),  # type: ignore
+            elapsed_time=max(p.elapsed_time for p in shard_progress),
+        )
+
+    def fraction_complete(self) -> Optional[float]:
+        """Return the fraction of bytes transferred, or `None` if the total is not yet known."""
+        if self.total_bytes == 0:
+            return None
+        return self.bytes_transferred / self.total_bytes
+
+    def create_tui_message(self) -> str:
+        """Create a one-line summary of the progress, for display in the TUI."""
+        message = (
+            f"{self.files_transferred} / {self.total_files} files    "
+            f"{format_bytes(self.bytes_transferred)} / "
+            f"{format_bytes(self.total_bytes)}    "
+            f"{format_bytes(self.speed)}/s"
+        )
+
+        if self.eta is not None:
+            minutes, seconds = divmod(int(self.eta), 60)
+            hours, minutes = divmod(minutes, 60)
+            message += f"    ETA {hours:d}:{minutes:02d}:{seconds:02d}"
+
+        return message
+
+
+def format_bytes(num_bytes: float) -> str:
+    """Format a number of bytes as a human-readable string (e.g. "1.5 GiB")."""
+    for unit in ["B", "KiB", "MiB", "GiB", "TiB"]:
+        if abs(num_bytes) < 1024 or unit == "TiB":
+            break
+        num_bytes /= 1024
+
+    if unit == "B":
+        return f"{int(num_bytes)} B"
+
+    return f"{num_bytes:.1f} {unit}"
@@ -7,16 +7,31 @@ import string
 import sys
 import traceback
 import warnings
-from typing import TYPE_CHECKING, Any, List, Literal, Union, overload
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
 
 if TYPE_CHECKING:
     from pathlib import Path
 
-from rich import print as rich_print
-
 from datashuttle.utils import ds_logger
 from datashuttle.utils.custom_exceptions import NeuroBlueprintError
 
+T = TypeVar("T")
+R = TypeVar("R")
+
 # -----------------------------------------------------------------------------
 # Centralised logging, errors, outputs, inputs
 # -----------------------------------------------------------------------------
@@ -98,6 +113,8 @@ def print_message_to_user(
 
     """
     if use_rich:
+        from rich import print as rich_print
+
         rich_print(message)
     else:
         print(message)
@@ -245,24 +262,12 @@ def get_values_from_bids_formatted_name(
     """
     all_values = []
     for name in all_names:
-        if key not in name:
-            raise NeuroBlueprintError(
-                f"The key {key} is not found in {name}", KeyError
-            )
-
-        value = get_value_from_key_regexp(name, key)
-
-        if len(value) > 1:
-            raise NeuroBlueprintError(
-                f"There is more than one instance of {key} in {name}. "
-                f"NeuroBlueprint names must contain only one instance of "
-                f"each key.",
-            )
+        value = BidsName(name, key).get_value(key)
 
         if return_as_int:
-            value_to_append = sub_or_ses_value_to_int(value[0])
+            value_to_append = sub_or_ses_value_to_int(value)
         else:
-            value_to_append = value[0]  # type: ignore
+            value_to_append = value  # type: ignore
 
         all_values.append(value_to_append)
 
@@ -288,7 +293,139 @@ def get_value_from_key_regexp(name: str, key: str) -> List[str]:
 
     e.g. sub-001_ses-312 would find 312 for key "ses".
     """
-    return re.findall(f"{key}-(.*?)(?=_|$)", name)
+    return get_key_regexp(key).findall(name)
+
+
+@lru_cache(maxsize=128)
+def get_key_regexp(key: str) -> re.Pattern:
+    """Return the (compiled) regexp finding the value of a key, see `get_value_from_key_regexp()`."""
+    return re.compile(f"{key}-(.*?)(?=_|$)")
+
+
+class BidsName:
+    """A BIDS-style name (e.g. "sub-001_date-20240101"), parsed once.
+
+    Checks across all names in a project (e.g. for duplicate ids, or
+    to find the next subject number) need the sub- or ses- value of every
+    name. Names are parsed once into a `BidsName` that is passed to these
+    checks, rather than each check parsing the name again.
+
+    Parameters
+    ----------
+    name
+        The name e.g. "sub-001_date-20240101".
+
+    prefix
+        The key whose value is parsed, "sub" or "ses" (or any other key).
+
+    path
+        Path to the folder with this name, if it is a folder.
+
+    allow_letters_in_sub_ses_values
+        If `False`, the `id` is the value as `int`. Otherwise,
+        the `id` is the value as a string.
+
+    Attributes
+    ----------
+    values
+        All values of the `prefix` key found in the name (see
+        `get_value_from_key_regexp()`). NeuroBlueprint names contain one.
+
+    value
+        The value of the `prefix` key, or `None` if not exactly one found.
+
+    id
+        The value as `int` (ignoring leading zeros), or `None` if not
+        an integer. If `allow_letters_in_sub_ses_values`, the value.
+
+    value_length
+        The number of characters in the value, or `None`.
+
+    """
+
+    __slots__ = (
+        "name",
+        "path",
+        "prefix",
+        "values",
+        "value",
+        "id",
+        "value_length",
+        "_pairs",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        prefix: str,
+        path: Optional[Path] = None,
+        allow_letters_in_sub_ses_values: bool = False,
+    ) -> None:
+        """Initialise the BidsName."""
+        self.name = name
+        self.path = path
+        self.prefix = prefix
+        self.values = get_key_regexp(prefix).findall(name)
+
+        self.value: Optional[str] = None
+        self.id: Optional[Union[int, str]] = None
+        self.value_length: Optional[int] = None
+
+        if len(self.values) == 1:
+            self.value = self.values[0]
+            self.value_length = len(self.value)
+
+            if allow_letters_in_sub_ses_values:
+                self.id = self.value
+            else:
+                try:
+                    self.id = int(self.value)
+                except ValueError:
+                    pass
+
+        self._pairs: Optional[Tuple[Tuple[str, str], ...]] = None
+
+    @property
+    def pairs(self) -> Tuple[Tuple[str, str], ...]:
+        """The ordered (key, value) pairs of the name, e.g. (("sub", "001"), ("date", "20240101"))."""
+        if self._pairs is None:
+            self._pairs = tuple(
+                (key, value)
+                for key, _, value in (
+                    key_value.partition("-")
+                    for key_value in self.name.split("_")
+                )
+            )
+        return self._pairs
+
+    def get_value(self, key: str) -> str:
+        """Return the value of a key, raising if the key is not found once.
+
+        See `get_values_from_bids_formatted_name()`.
+        """
+        if key not in self.name:
+            raise NeuroBlueprintError(
+                f"The key {key} is not found in {self.name}", KeyError
+            )
+
+        values = (
+            self.values
+            if key == self.prefix
+            else get_value_from_key_regexp(self.name, key)
+        )
+
+        if len(values) > 1:
+            raise NeuroBlueprintError(
+                f"There is more than one instance of {key} in {self.name}. "
+                f"NeuroBlueprint names must contain only one instance of "
+                f"each key.",
+            )
+
+        return values[0]
+
+    def __repr__(self) -> str:
+        """Return the BidsName representation."""
+        return f"BidsName({self.name!r}, {self.prefix!r})"
 
 
 # -----------------------------------------------------------------------------
@@ -338,3 +475,38 @@ def get_random_string(num_chars: int = 15) -> str:
     random_string = "".join(random.choices(characters, k=num_chars))
 
     return random_string
+
+
+def map_in_threads(
+    function: Callable[[T], R], items: List[T], num_workers: int = 1
+) -> List[R]:
+    """Call a function on each item, on a pool of `num_workers` threads.
+
+    Used to run many calls that are bound by file system latency
+    (e.g. listing folders on network-mounted storage) concurrently.
+    The results are returned in the order of `items`, as
+    for the builtin `map`. If `num_workers` is 1, no threads are used.
+    """
+    return list(imap_in_threads(function, items, num_workers))
+
+
+def imap_in_threads(
+    function: Callable[[T], R], items: List[T], num_workers: int = 1
+) -> Iterator[R]:
+    """Yield the results of `map_in_threads()` in order, as they are ready.
+
+    If the iterator is closed before all results are yielded,
+    calls that have not yet started are cancelled.
+    """
+    if num_workers < 1:
+        raise ValueError("`num_workers` must be a positive integer.")
+
+    if num_workers == 1 or len(items) <= 1:
+        yield from map(function, items)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=min(num_workers, len(items)))
+    try:
+        yield from executor.map(function, items)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
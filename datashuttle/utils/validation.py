@@ -1,9 +1,14 @@
 from __future__ import annotations
 
 import re
+import time
 from typing import (
     TYPE_CHECKING,
+    Any,
     Dict,
+    Generator,
+    Iterable,
+    Iterator,
     List,
     Literal,
     Optional,
@@ -20,7 +25,10 @@ if TYPE_CHECKING:
         TopLevelFolder,
     )
 
+from bisect import bisect_left
+from contextlib import closing
 from datetime import datetime
+from functools import lru_cache
 from itertools import chain
 from pathlib import Path
 
@@ -29,20 +37,167 @@ from datashuttle.configs import (
     canonical_folders,
     canonical_tags,
 )
-from datashuttle.utils import formatting, getters, utils
+from datashuttle.utils import (
+    formatting,
+    getters,
+    project_snapshot,
+    utils,
+    validation_cache,
+)
 from datashuttle.utils.custom_exceptions import NeuroBlueprintError
 
+SPECIAL_CHARACTER_REGEXP = re.compile("^[A-Za-z0-9_-]*$")
+
+# Key-value pairs separated by underscores, e.g. sub-001_ses-001. Names start
+# with a key and end with a (non-empty) value, and "-" and "_" alternate.
+NAME_FORMAT_REGEXP = re.compile("[^-_]*(?:-[^-_]*_[^-_]*)*-[^-_]+")
+
+# Regexps to find the value of each datetime key (e.g. "date-<value>").
+DATETIME_VALUE_REGEXPS = {
+    key: re.compile(f"{key}-(.*?)(?=_|$)")
+    for key in canonical_tags.get_datetime_formats()
+}
+
 # -----------------------------------------------------------------------------
-# Formatted Error Messages
+# Validation Issues
 # -----------------------------------------------------------------------------
 
+# The message for each issue code. `{level}` is the prefix ("sub" or "ses")
+# for name issues, other fields are the issue `details`.
+ISSUE_MESSAGES = {
+    "MISSING_PREFIX": "The prefix {level} was not found in the name: {name}",
+    "BAD_VALUE": "The value for prefix {level} in name {name} is not {type_}.",
+    "DUPLICATE_PREFIX": "The name: {name} contains more than one instance of the prefix {level}.",
+    "BAD_NAME": "The name: {name} of type: {level} is not valid.",
+    "SPECIAL_CHAR": "The name: {name}, contains characters which are not alphanumeric, dash or underscore.",
+    "NAME_FORMAT": "The name {name} does not consist of key-value pairs separated by underscores.",
+    "VALUE_LENGTH": "Inconsistent value lengths for the prefix: {level} were found in the project.",
+    "DATETIME": "Name {name} contains an invalid {key}. It should be ISO format: {strfmt}.",
+    # The missing full-stop at the end is intentional, to avoid confusion when reading the regexp.
+    "TEMPLATE": "The name: {name} does not match the template: {regexp}",
+    "TOP_LEVEL_FOLDER": "The {local_or_central} project must contain a 'rawdata' or 'derivatives' folder.",
+    "DUPLICATE_NAME": "The prefix for {name} duplicates the name: {exist_name}.",
+    "DATATYPE": "{name} is not a valid datatype name.",
+    "PROJECT_NAME": "The {local_or_central} project name folder {name} contains non-alphanumeric characters.",
+}
+
+
+class ValidationIssue:
+    """A single validation issue found in the project.
+
+    Issues hold the fields of the issue rather than the formatted message,
+    so that large validation results can be filtered or grouped (e.g. by
+    `code` or `path`) without parsing messages, and the folder path is
+    shared with the search results rather than copied into each message.
+    The message is built when needed, with `str(issue)` or `issue.message`.
 
-def get_missing_prefix_error(name: str, prefix, path_: Path | None) -> str:
-    """Return error message when a required prefix is missing from a name."""
-    return handle_path(
-        f"MISSING_PREFIX: The prefix {prefix} was not found in the name: {name}",
-        path_,
-    )
+    Parameters
+    ----------
+    code
+        The type of issue, e.g. "BAD_VALUE" (see `ISSUE_MESSAGES`).
+
+    name
+        The name of the folder with the issue, if the issue is for a single folder.
+
+    path
+        The path to the folder with the issue, if known.
+
+    level
+        The project level of the issue: "sub", "ses", "datatype" or "project".
+
+    details
+        Any further values used in the message (e.g. the template
+        the name does not match).
+
+    """
+
+    __slots__ = ("code", "name", "path", "level", "details")
+
+    def __init__(
+        self,
+        code: str,
+        name: Optional[str] = None,
+        path: Optional[Path] = None,
+        level: Optional[str] = None,
+        details: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Initialise the ValidationIssue."""
+        self.code = code
+        self.name = name
+        self.path = path
+        self.level = level
+        self.details = details
+
+    @property
+    def message(self) -> str:
+        """The formatted message, as displayed to the user."""
+        message = ISSUE_MESSAGES[self.code].format(
+            name=self.name, level=self.level, **(self.details or {})
+        )
+        return handle_path(f"{self.code}: {message}", self.path)
+
+    def __str__(self) -> str:
+        """Return the formatted message."""
+        return self.message
+
+    def __repr__(self) -> str:
+        """Return a representation of the issue."""
+        return f"ValidationIssue({self.code!r}, {self.name!r}, {self.path!r})"
+
+    def __eq__(self, other: object) -> bool:
+        """Return a bool indicating whether two issues have the same fields."""
+        if not isinstance(other, ValidationIssue):
+            return NotImplemented
+        return self.to_tuple() == other.to_tuple()
+
+    def __hash__(self) -> int:
+        """Hash the issue fields."""
+        return hash(self.to_tuple())
+
+    def to_tuple(self) -> Tuple:
+        """Return the issue fields as a (hashable) tuple."""
+        return (
+            self.code,
+            self.name,
+            self.path,
+            self.level,
+            tuple(sorted((self.details or {}).items())),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the issue as a JSON-serialisable dictionary."""
+        return {
+            "code": self.code,
+            "name": self.name,
+            "path": None if self.path is None else self.path.as_posix(),
+            "level": self.level,
+            "details": self.details,
+        }
+
+    @classmethod
+    def from_dict(cls, issue_dict: Dict[str, Any]) -> ValidationIssue:
+        """Create an issue from the output of `to_dict()`."""
+        path_ = issue_dict["path"]
+
+        return cls(
+            issue_dict["code"],
+            issue_dict["name"],
+            None if path_ is None else Path(path_),
+            issue_dict["level"],
+            issue_dict["details"],
+        )
+
+
+def get_messages(issues: Iterable[ValidationIssue | str]) -> List[str]:
+    """Return the formatted message of each issue."""
+    return [str(issue) for issue in issues]
+
+
+def get_missing_prefix_error(
+    name: str, prefix, path_: Path | None
+) -> ValidationIssue:
+    """Return the issue when a required prefix is missing from a name."""
+    return ValidationIssue("MISSING_PREFIX", name, path_, prefix)
 
 
 def get_bad_value_error(
@@ -50,96 +205,109 @@ def get_bad_value_error(
     prefix,
     path_: Path | None,
     allow_letters_in_sub_ses_values: bool,
-) -> str:
-    """Return error message when the value for a prefix is not an integer."""
+) -> ValidationIssue:
+    """Return the issue when the value for a prefix is not an integer."""
     type_ = "alphanumeric" if allow_letters_in_sub_ses_values else "an integer"
 
-    return handle_path(
-        f"BAD_VALUE: The value for prefix {prefix} in name {name} is not {type_}.",
-        path_,
-    )
+    return ValidationIssue("BAD_VALUE", name, path_, prefix, {"type_": type_})
 
 
-def get_duplicate_prefix_error(name: str, prefix, path_: Path | None) -> str:
-    """Return error message when a name contains multiple instances of the same prefix."""
-    return handle_path(
-        f"DUPLICATE_PREFIX: The name: {name} contains more than one instance of the prefix {prefix}.",
-        path_,
-    )
+def get_duplicate_prefix_error(
+    name: str, prefix, path_: Path | None
+) -> ValidationIssue:
+    """Return the issue when a name contains multiple instances of the same prefix."""
+    return ValidationIssue("DUPLICATE_PREFIX", name, path_, prefix)
 
 
-def get_name_error(name: str, prefix: Prefix, path_: Path | None) -> str:
-    """Return error message when a name is invalid for a given prefix."""
-    return handle_path(
-        f"BAD_NAME: The name: {name} of type: {prefix} is not valid.", path_
-    )
+def get_name_error(
+    name: str, prefix: Prefix, path_: Path | None
+) -> ValidationIssue:
+    """Return the issue when a name is invalid for a given prefix."""
+    return ValidationIssue("BAD_NAME", name, path_, prefix)
 
 
-def get_special_char_error(name: str, path_: Path | None) -> str:
-    """Return error message when a name contains invalid characters."""
-    return handle_path(
-        f"SPECIAL_CHAR: The name: {name}, contains characters which are not alphanumeric, dash or underscore.",
-        path_,
-    )
+def get_special_char_error(
+    name: str, path_: Path | None, level: Optional[str] = None
+) -> ValidationIssue:
+    """Return the issue when a name contains invalid characters."""
+    return ValidationIssue("SPECIAL_CHAR", name, path_, level)
 
 
-def get_name_format_error(name: str, path_: Path | None) -> str:
-    """Return error message when a name does not follow key-value pair format."""
-    return handle_path(
-        f"NAME_FORMAT: The name {name} does not consist of key-value pairs separated by underscores.",
-        path_,
-    )
+def get_name_format_error(
+    name: str, path_: Path | None, level: Optional[str] = None
+) -> ValidationIssue:
+    """Return the issue when a name does not follow key-value pair format."""
+    return ValidationIssue("NAME_FORMAT", name, path_, level)
 
 
-def get_value_length_error(prefix: Prefix) -> str:
-    """Return error message for inconsistent value lengths for a prefix."""
-    return f"VALUE_LENGTH: Inconsistent value lengths for the prefix: {prefix} were found in the project."
+def get_value_length_error(prefix: Prefix) -> ValidationIssue:
+    """Return the issue for inconsistent value lengths for a prefix."""
+    return ValidationIssue("VALUE_LENGTH", level=prefix)
 
 
-def get_datetime_error(key, name: str, strfmt: str, path_: Path | None) -> str:
-    """Return error message when a datetime value is not in the expected ISO format."""
-    return handle_path(
-        f"DATETIME: Name {name} contains an invalid {key}. It should be ISO format: {strfmt}.",
-        path_,
+def get_datetime_error(
+    key,
+    name: str,
+    strfmt: str,
+    path_: Path | None,
+    level: Optional[str] = None,
+) -> ValidationIssue:
+    """Return the issue when a datetime value is not in the expected ISO format."""
+    return ValidationIssue(
+        "DATETIME", name, path_, level, {"key": key, "strfmt": strfmt}
     )
 
 
-def get_template_error(name: str, regexp: str, path_: Path | None) -> str:
-    """Return error message when a name does not match a given template.
-
-    The missing full-stop at the end is intentional, to avoid confusion when reading the regexp.
-    """
-    return handle_path(
-        f"TEMPLATE: The name: {name} does not match the template: {regexp}",
-        path_,
-    )
+def get_template_error(
+    name: str, regexp: str, path_: Path | None, level: Optional[str] = None
+) -> ValidationIssue:
+    """Return the issue when a name does not match a given template."""
+    return ValidationIssue("TEMPLATE", name, path_, level, {"regexp": regexp})
 
 
 def get_missing_top_level_folder_error(
     path_: Path | None, local_or_central: Literal["local", "central"]
-) -> str:
-    """Return error message when the top level folder is missing from the project."""
-    return handle_path(
-        f"TOP_LEVEL_FOLDER: The {local_or_central} project must contain a 'rawdata' or 'derivatives' folder.",
+) -> ValidationIssue:
+    """Return the issue when the top level folder is missing from the project."""
+    return ValidationIssue(
+        "TOP_LEVEL_FOLDER",
+        path=path_,
+        level="project",
+        details={"local_or_central": local_or_central},
+    )
+
+
+def get_project_name_error(
+    path_: Path, local_or_central: Literal["local", "central"]
+) -> ValidationIssue:
+    """Return the issue when the project folder name contains special characters."""
+    return ValidationIssue(
+        "PROJECT_NAME",
+        path_.name,
         path_,
+        "project",
+        {"local_or_central": local_or_central},
     )
 
 
 def get_duplicate_name_error(
-    new_name: str, exist_name: str, exist_path: Path | None
-) -> str:
-    """Return error message when a new name duplicates an existing name."""
-    return handle_path(
-        f"DUPLICATE_NAME: The prefix for {new_name} duplicates the name: {exist_name}.",
+    new_name: str, exist_name: str, exist_path: Path | None, prefix=None
+) -> ValidationIssue:
+    """Return the issue when a new name duplicates an existing name."""
+    return ValidationIssue(
+        "DUPLICATE_NAME",
+        new_name,
         exist_path,
+        prefix,
+        {"exist_name": exist_name},
     )
 
 
-def get_datatype_error(datatype_name: str, path_: Path | None) -> str:
-    """Return error message when an invalid datatype name is encountered."""
-    return handle_path(
-        f"DATATYPE: {datatype_name} is not a valid datatype name.", path_
-    )
+def get_datatype_error(
+    datatype_name: str, path_: Path | None
+) -> ValidationIssue:
+    """Return the issue when an invalid datatype name is encountered."""
+    return ValidationIssue("DATATYPE", datatype_name, path_, "datatype")
 
 
 def handle_path(message: str, path_: Path | None) -> str:
@@ -155,7 +323,9 @@ def handle_path(message: str, path_: Path | None) -> str:
 
 
 def validate_list_of_names(
-    path_or_name_list: List[Path] | List[str],
+    path_or_name_list: List[Path]
+    | List[str]
+    | List[str | formatting.NameRange],
     prefix: Prefix,
     validation_templates: Optional[Dict] = None,
     check_value_lengths: bool = True,
@@ -163,10 +333,42 @@ def validate_list_of_names(
 ) -> List[str]:
     """Validate a list of subject or session names against NeuroBlueprint.
 
+    See `get_list_of_names_issues()` for parameters.
+
+    Returns
+    -------
+    error_messages
+        A list of found validation errors.
+
+    """
+    return get_messages(
+        get_list_of_names_issues(
+            path_or_name_list,
+            prefix,
+            validation_templates,
+            check_value_lengths,
+            allow_letters_in_sub_ses_values,
+        )
+    )
+
+
+def get_list_of_names_issues(
+    path_or_name_list: List[Path]
+    | List[str]
+    | List[str | formatting.NameRange],
+    prefix: Prefix,
+    validation_templates: Optional[Dict] = None,
+    check_value_lengths: bool = True,
+    allow_letters_in_sub_ses_values: bool = False,
+) -> List[ValidationIssue]:
+    """Return the issues found validating a list of subject or session names against NeuroBlueprint.
+
     Parameters
     ----------
     path_or_name_list
-        A list of pathlib.Path to NeuroBlueprint-formatted folders to validate
+        A list of pathlib.Path to NeuroBlueprint-formatted folders to validate,
+        or of names. Names may include a `formatting.NameRange`, which is
+        checked without making every name in the range.
 
     prefix
         Whether these are subject (sub) or session (ses) level names
@@ -187,57 +389,230 @@ def validate_list_of_names(
 
     Returns
     -------
-    error_messages
-        A list of found validation errors.
+    issues
+        A list of found validation issues.
 
     """
     if len(path_or_name_list) == 0:
         return []
 
-    error_messages = []
+    # First, validate each name individually. The name of each
+    # sub- or ses- value is parsed at the same time, for the next checks.
+    rules = get_name_rules(
+        prefix,
+        get_template(validation_templates, prefix),
+        allow_letters_in_sub_ses_values,
+    )
+    issues, bids_names, name_ranges = rules.validate_names(path_or_name_list)
 
-    # First, just validate each name individually
-    for path_or_name in path_or_name_list:
-        path_, name = get_path_and_name(path_or_name)
+    # Next, check interactions between names (e.g. duplicates,
+    # inconsistent value lengths).  To do this we must strip names
+    # in which the ids (e.g. sub-001) is invalid). Names are
+    # grouped by id, so these checks scale linearly.
+    issues += names_duplicate_existing(
+        bids_names,
+        bids_names,
+        name_ranges,
+        name_ranges,
+        allow_letters_in_sub_ses_values,
+    )
 
-        error_messages += prefix_is_duplicate_or_has_bad_values(
-            name, prefix, path_, allow_letters_in_sub_ses_values
-        )
-        error_messages += name_begins_with_bad_key(name, prefix, path_)
-        error_messages += names_include_special_characters(name, path_)
-        error_messages += dashes_and_underscore_alternate_incorrectly(
-            name, path_
+    if not allow_letters_in_sub_ses_values and check_value_lengths:
+        issues += name_value_lengths_are_inconsistent(
+            bids_names, prefix, name_ranges
         )
-        error_messages += datetime_are_iso_format(name, path_)
-        error_messages += names_dont_match_templates(
-            name, path_, prefix, validation_templates
+
+    return issues
+
+
+class NameRules:
+    """The checks run on each subject or session name, compiled once.
+
+    Checking a name uses several regexps, and the validation template must
+    have its tags replaced (see `replace_tags_in_regexp()`) before use.
+    Rather than rebuilding these for every name, they are built once
+    for each prefix, template and setting (see `get_name_rules()`)
+    and reused for every name checked.
+
+    Parameters
+    ----------
+    prefix
+        "sub" or "ses".
+
+    template
+        The validation template regexp for the prefix, or `None` if there
+        is no template (see `get_template()`). Tags (e.g. @DATE@) are replaced.
+
+    allow_letters_in_sub_ses_values
+        If `True`, any alphanumeric character are allowed for the values
+        associated with sub- or ses- keys. Otherwise, values must be integer.
+
+    """
+
+    def __init__(
+        self,
+        prefix: Prefix,
+        template: Optional[str],
+        allow_letters_in_sub_ses_values: bool,
+    ) -> None:
+        """Initialise the NameRules."""
+        self.prefix = prefix
+        self.allow_letters_in_sub_ses_values = allow_letters_in_sub_ses_values
+
+        self.template: Optional[str] = None
+        self.template_regexp: Optional[re.Pattern] = None
+        if template is not None:
+            self.template = replace_tags_in_regexp(template)
+            self.template_regexp = re.compile(self.template)
+
+    def validate_names(
+        self,
+        path_or_name_list: List[Path]
+        | List[str]
+        | List[str | formatting.NameRange],
+    ) -> Tuple[
+        List[ValidationIssue], List[utils.BidsName], List[formatting.NameRange]
+    ]:
+        """Run all checks on each name, and parse the sub- or ses- value of each name.
+
+        Returns
+        -------
+        issues
+            A list of found validation issues.
+
+        bids_names
+            The parsed checkable names, see `get_checkable_bids_names()`.
+
+        name_ranges
+            The passed `formatting.NameRange`, see `validate_name_range()`.
+
+        """
+        issues = []
+        bids_names = []
+        name_ranges = []
+
+        for path_or_name in path_or_name_list:
+            if isinstance(path_or_name, formatting.NameRange):
+                issues += self.validate_name_range(path_or_name)
+                name_ranges.append(path_or_name)
+                continue
+
+            bids_name = self.parse_name(path_or_name)
+
+            issues += self.name_errors(bids_name)
+            issues += self.template_errors(bids_name.name, bids_name.path)
+
+            if bids_name.id is not None:
+                bids_names.append(bids_name)
+
+        return issues, bids_names, name_ranges
+
+    def validate_name_range(
+        self, name_range: formatting.NameRange
+    ) -> List[ValidationIssue]:
+        """Run all checks on a range of names, without checking every name.
+
+        Names in a range differ only in their sub- or ses- value, which is
+        always an integer. Therefore, other than the template, the checks
+        give the same result for every name and are run on the first name.
+        """
+        issues = self.name_errors(
+            self.parse_name(name_range.get_name(name_range.start))
         )
 
-    # Next, check interactions between names (e.g. duplicates,
-    # inconsistent value lengths).  To do this we must strip names
-    # in which the ids (e.g. sub-001) is invalid).
-    # Note this called functions again loop over the list (O(n^2)) so
-    # this is not very efficient but these lists should never be that long.
-    stripped_path_or_names_list = strip_uncheckable_names(
-        path_or_name_list, prefix, allow_letters_in_sub_ses_values
-    )
+        if self.template_regexp is not None:
+            for name in name_range:
+                issues += self.template_errors(name, None)
+
+        return issues
 
-    for path_or_name in stripped_path_or_names_list:
+    def name_errors(self, bids_name: utils.BidsName) -> List[ValidationIssue]:
+        """Run all checks on a name, other than the template check."""
+        path_, name = bids_name.path, bids_name.name
+
+        return [
+            *self.prefix_errors(name, bids_name.values, path_),
+            *name_begins_with_bad_key(name, self.prefix, path_),
+            *names_include_special_characters(name, path_, self.prefix),
+            *dashes_and_underscore_alternate_incorrectly(
+                name, path_, self.prefix
+            ),
+            *datetime_are_iso_format(name, path_, self.prefix),
+        ]
+
+    def parse_name(self, path_or_name: Path | str) -> utils.BidsName:
+        """Parse a name, or the name of a path.
+
+        The `id` is `None` if the name cannot be checked against
+        other names, see `get_checkable_bids_names()`.
+        """
         path_, name = get_path_and_name(path_or_name)
 
-        error_messages += new_name_duplicates_existing(
-            name,
-            stripped_path_or_names_list,
-            prefix,
-            allow_letters_in_sub_ses_values,
+        return utils.BidsName(
+            name, self.prefix, path_, self.allow_letters_in_sub_ses_values
         )
 
-    if not allow_letters_in_sub_ses_values and check_value_lengths:
-        error_messages += value_lengths_are_inconsistent(
-            stripped_path_or_names_list, prefix
+    def prefix_errors(
+        self, name: str, values: List[str], path_: Path | None
+    ) -> List[ValidationIssue]:
+        """Check the sub- or ses- prefix, see `prefix_is_duplicate_or_has_bad_values()`."""
+        if len(values) == 0:
+            return [get_missing_prefix_error(name, self.prefix, path_)]
+
+        if len(values) > 1:
+            return [get_duplicate_prefix_error(name, self.prefix, path_)]
+
+        is_valid = (
+            values[0].isalnum()
+            if self.allow_letters_in_sub_ses_values
+            else values[0].isdigit()
         )
 
-    return error_messages
+        if not is_valid:
+            return [
+                get_bad_value_error(
+                    name,
+                    self.prefix,
+                    path_,
+                    self.allow_letters_in_sub_ses_values,
+                )
+            ]
+
+        return []
+
+    def template_errors(
+        self, name: str, path_: Path | None
+    ) -> List[ValidationIssue]:
+        """Check the name matches the template, see `names_dont_match_templates()`."""
+        if self.template_regexp is None:
+            return []
+
+        if not self.template_regexp.fullmatch(name):
+            return [
+                get_template_error(name, self.template, path_, self.prefix)  # type: ignore
+            ]
+
+        return []
+
+
+@lru_cache(maxsize=32)
+def get_name_rules(
+    prefix: Prefix,
+    template: Optional[str],
+    allow_letters_in_sub_ses_values: bool,
+) -> NameRules:
+    """Return the (cached) `NameRules` for the prefix, template and setting."""
+    return NameRules(prefix, template, allow_letters_in_sub_ses_values)
+
+
+def get_template(
+    validation_templates: Optional[Dict], prefix: Prefix
+) -> Optional[str]:
+    """Return the template regexp for the prefix, or `None` if names are not checked against a template."""
+    if validation_templates is None or validation_templates["on"] is False:
+        return None
+
+    return validation_templates[prefix]
 
 
 def prefix_is_duplicate_or_has_bad_values(
@@ -275,29 +650,14 @@ def prefix_is_duplicate_or_has_bad_values(
         A list of validation errors.
 
     """
-    value = re.findall(f"{prefix}-(.*?)(?=_|$)", name)
-
-    if len(value) == 0:
-        return [get_missing_prefix_error(name, prefix, path_)]
+    rules = get_name_rules(prefix, None, allow_letters_in_sub_ses_values)
 
-    if len(value) > 1:
-        return [get_duplicate_prefix_error(name, prefix, path_)]
-
-    is_valid = (
-        value[0].isalnum()
-        if allow_letters_in_sub_ses_values
-        else value[0].isdigit()
+    return get_messages(
+        rules.prefix_errors(
+            name, utils.get_value_from_key_regexp(name, prefix), path_
+        )
     )
 
-    if not is_valid:
-        return [
-            get_bad_value_error(
-                name, prefix, path_, allow_letters_in_sub_ses_values
-            )
-        ]
-
-    return []
-
 
 def new_name_duplicates_existing(
     new_name: str,
@@ -335,33 +695,164 @@ def new_name_duplicates_existing(
         A list of validation errors.
 
     """
-    return_as_int = not allow_letters_in_sub_ses_values
+    return get_messages(
+        names_duplicate_existing(
+            get_checkable_bids_names(
+                [new_name],
+                prefix,
+                allow_letters_in_sub_ses_values,
+                raise_on_uncheckable=True,
+            ),
+            get_checkable_bids_names(
+                existing_path_or_name_list,
+                prefix,
+                allow_letters_in_sub_ses_values,
+                raise_on_uncheckable=True,
+            ),
+        )
+    )
 
-    # Make a list of matches between `new_name` and any in `existing_names`
-    new_name_id = utils.get_values_from_bids_formatted_name(
-        [new_name],
-        prefix,
-        return_as_int=return_as_int,  # type: ignore
-    )[0]
 
-    error_messages = []
-    for exist_path_or_name in existing_path_or_name_list:
-        exist_path, exist_name = get_path_and_name(exist_path_or_name)
+def names_duplicate_existing(
+    new_bids_names: List[utils.BidsName],
+    existing_bids_names: List[utils.BidsName],
+    new_name_ranges: Optional[List[formatting.NameRange]] = None,
+    existing_name_ranges: Optional[List[formatting.NameRange]] = None,
+    allow_letters_in_sub_ses_values: bool = False,
+) -> List[ValidationIssue]:
+    """Check that subject or session ids do not duplicate any existing id.
 
-        exist_name_id = utils.get_values_from_bids_formatted_name(
-            [exist_name],
-            prefix,
-            return_as_int=return_as_int,  # type: ignore
-        )[0]
+    See `new_name_duplicates_existing()`. The existing names are grouped
+    by id once, so each new name is checked with a single lookup.
+
+    Ranges of names (e.g. sub-0001@TO@9999) are checked without making
+    every name in the range. The ids of existing names are sorted once,
+    so the existing names within a range are found by bisection, and
+    ranges are compared to each other over their overlapping interval.
+
+    Parameters
+    ----------
+    new_bids_names
+        The parsed names to check, see `get_checkable_bids_names()`.
+
+    existing_bids_names
+        The parsed names to check against.
+
+    new_name_ranges
+        Ranges of names to check, see `formatting.NameRange`.
+
+    existing_name_ranges
+        Ranges of names to check against.
+
+    allow_letters_in_sub_ses_values
+        Whether ids are the values as strings, rather than `int`. Only
+        used to compare ranges, as the id of a parsed name is known.
+
+    Returns
+    -------
+        A list of validation issues, in the order of `new_bids_names`
+        then `existing_bids_names`.
 
-        if exist_name_id == new_name_id:
-            if new_name != exist_name:
-                message = get_duplicate_name_error(
-                    new_name, exist_name, exist_path
+    """
+    new_name_ranges = new_name_ranges or []
+    existing_name_ranges = existing_name_ranges or []
+
+    existing_names_by_id: Dict[int | str, List[Tuple[Optional[Path], str]]]
+    existing_names_by_id = {}
+
+    for exist in existing_bids_names:
+        existing_names_by_id.setdefault(exist.id, []).append(  # type: ignore
+            (exist.path, exist.name)
+        )
+
+    issues = []
+    for new in new_bids_names:
+        for exist_path, exist_name in existing_names_by_id.get(new.id, []):  # type: ignore
+            if new.name != exist_name:
+                issues.append(
+                    get_duplicate_name_error(
+                        new.name, exist_name, exist_path, new.prefix
+                    )
                 )
-                error_messages.append(message)
 
-    return error_messages
+        for exist_range in existing_name_ranges:
+            number = get_number_in_name_range(exist_range, new.id)  # type: ignore
+            if number is not None:
+                exist_name = exist_range.get_name(number)
+                if new.name != exist_name:
+                    issues.append(
+                        get_duplicate_name_error(
+                            new.name, exist_name, None, new.prefix
+                        )
+                    )
+
+    if not new_name_ranges:
+        return issues
+
+    # The existing ids that may be in a range, sorted by number.
+    existing_numbers = sorted(
+        (int(id_), id_)
+        for id_ in existing_names_by_id
+        if isinstance(id_, int) or id_.isdigit()
+    )
+
+    for new_range in new_name_ranges:
+        first = bisect_left(existing_numbers, (new_range.start,))
+        last = bisect_left(existing_numbers, (new_range.stop + 1,))
+
+        for _, id_ in existing_numbers[first:last]:
+            number = get_number_in_name_range(new_range, id_)
+            if number is None:
+                continue
+
+            new_name = new_range.get_name(number)
+            for exist_path, exist_name in existing_names_by_id[id_]:
+                if new_name != exist_name:
+                    issues.append(
+                        get_duplicate_name_error(
+                            new_name, exist_name, exist_path, new_range.prefix
+                        )
+                    )
+
+        for exist_range in existing_name_ranges:
+            if exist_range is new_range:
+                continue
+
+            for number in range(
+                max(new_range.start, exist_range.start),
+                min(new_range.stop, exist_range.stop) + 1,
+            ):
+                new_name = new_range.get_name(number)
+                exist_name = exist_range.get_name(number)
+
+                # If letters are allowed, ids are the values as strings
+                # and so differ if the number of leading zeros differ.
+                if new_name != exist_name and (
+                    not allow_letters_in_sub_ses_values
+                    or new_range.get_value(number)
+                    == exist_range.get_value(number)
+                ):
+                    issues.append(
+                        get_duplicate_name_error(
+                            new_name, exist_name, None, new_range.prefix
+                        )
+                    )
+
+    return issues
+
+
+def get_number_in_name_range(
+    name_range: formatting.NameRange, id_: int | str
+) -> Optional[int]:
+    """Return the number in the range with the sub- or ses- id `id_`, or `None`.
+
+    Ids are `int` unless letters are allowed in values, in which
+    case they are the value as a string (see `utils.BidsName`).
+    """
+    if isinstance(id_, int):
+        return id_ if name_range.start <= id_ <= name_range.stop else None
+
+    return name_range.get_number_from_value(id_)
 
 
 def names_dont_match_templates(
@@ -391,23 +882,14 @@ def names_dont_match_templates(
     A list of validation errors.
 
     """
-    if validation_templates is None:
-        return []
-
-    if validation_templates["on"] is False:
-        return []
-
-    regexp = validation_templates[prefix]
+    template = get_template(validation_templates, prefix)
 
-    if regexp is None:
+    if template is None:
         return []
 
-    regexp = replace_tags_in_regexp(regexp)
-
-    if not re.fullmatch(regexp, name):
-        return [get_template_error(name, regexp, path_)]
-    else:
-        return []
+    return get_messages(
+        get_name_rules(prefix, template, False).template_errors(name, path_)
+    )
 
 
 def get_path_and_name(path_or_name: Path | str) -> Tuple[Optional[Path], str]:
@@ -458,7 +940,7 @@ def replace_tags_in_regexp(regexp: str) -> str:
 
 def name_begins_with_bad_key(
     name: str, prefix: Prefix, path_: Path | None
-) -> List[str]:
+) -> List[ValidationIssue]:
     """Check that a list of NeuroBlueprint names begin with the required prefix (sub- or ses-).
 
     Parameters
@@ -484,8 +966,8 @@ def name_begins_with_bad_key(
 
 
 def names_include_special_characters(
-    name: str, path_: Path | None
-) -> List[str]:
+    name: str, path_: Path | None, level: Optional[str] = None
+) -> List[ValidationIssue]:
     """Check that a list of NeuroBlueprint formatted names do not contain special characters.
 
     Special characters are characters that are not integers, letters, dash or underscore.
@@ -498,25 +980,28 @@ def names_include_special_characters(
     path_
         Path of the folder that is being validated.
 
+    level
+        The project level of the folder (e.g. "sub"), if known.
+
     Returns
     -------
     A list of validation errors.
 
     """
     if name_has_special_character(name):
-        return [get_special_char_error(name, path_)]
+        return [get_special_char_error(name, path_, level)]
     else:
         return []
 
 
 def name_has_special_character(name: str) -> bool:
     """Return a bool indicating if the name contains special characters."""
-    return not re.match("^[A-Za-z0-9_-]*$", name)
+    return not SPECIAL_CHARACTER_REGEXP.match(name)
 
 
 def dashes_and_underscore_alternate_incorrectly(
-    name: str, path_: Path | None
-) -> List[str]:
+    name: str, path_: Path | None, level: Optional[str] = None
+) -> List[ValidationIssue]:
     """Check a list of names for expected Neuroblueprint underscore-dash order.
 
     Names should have the "-" and "-" ordered correctly. Names should be
@@ -530,27 +1015,16 @@ def dashes_and_underscore_alternate_incorrectly(
     path_
         Path of the folder that is being validated.
 
+    level
+        The project level of the folder (e.g. "sub"), if known.
+
     Returns
     -------
     A list of validation errors.
 
     """
-    discrim = {"-": 1, "_": -1}
-
-    dashes_underscores = [discrim[ele] for ele in name if ele in ["-", "_"]]
-
-    underscore_dash_not_interleaved = any(
-        [ele == 0 for ele in utils.diff(dashes_underscores)]
-    )
-
-    if (
-        not any(dashes_underscores)
-        or dashes_underscores[0] != 1  # first must be -
-        or dashes_underscores[-1] != 1  # last must be -
-        or underscore_dash_not_interleaved
-        or (name[-1] in discrim)  # name cannot end with - or _
-    ):
-        return [get_name_format_error(name, path_)]
+    if not NAME_FORMAT_REGEXP.fullmatch(name):
+        return [get_name_format_error(name, path_, level)]
     else:
         return []
 
@@ -576,33 +1050,45 @@ def value_lengths_are_inconsistent(
     A list of validation errors.
 
     """
-    names_list = [
-        path_or_name if isinstance(path_or_name, str) else path_or_name.name
-        for path_or_name in path_or_names_list
-    ]
-
-    prefix_values = utils.get_values_from_bids_formatted_name(
-        names_list, prefix, return_as_int=False
+    return get_messages(
+        name_value_lengths_are_inconsistent(
+            get_checkable_bids_names(
+                path_or_names_list,
+                prefix,
+                allow_letters_in_sub_ses_values=True,
+                raise_on_uncheckable=True,
+            ),
+            prefix,
+        )
     )
 
-    value_len = [len(value) for value in prefix_values]
 
-    inconsistent_value_len = value_len != [] and not utils.all_identical(
-        value_len
-    )
+def name_value_lengths_are_inconsistent(
+    bids_names: List[utils.BidsName],
+    prefix: Prefix,
+    name_ranges: Optional[List[formatting.NameRange]] = None,
+) -> List[ValidationIssue]:
+    """Determine if there are inconsistent value lengths in a list of parsed names.
 
-    error_messages = []
-    if inconsistent_value_len:
-        message = get_value_length_error(prefix)
-        error_messages.append(message)
+    See `value_lengths_are_inconsistent()`. The value lengths of
+    any `name_ranges` are found without making every name in the range.
+    """
+    value_lengths = {bids_name.value_length for bids_name in bids_names}
 
-    return error_messages
+    for name_range in name_ranges or []:
+        value_lengths.update(name_range.get_value_lengths())
+
+    if len(value_lengths) > 1:
+        return [get_value_length_error(prefix)]
+
+    return []
 
 
 def datetime_are_iso_format(
     name: str,
     path_: Path | None,
-) -> List[str]:
+    level: Optional[str] = None,
+) -> List[ValidationIssue]:
     """Check formatting for date-, time-, or datetime- tags.
 
     Parameters
@@ -613,27 +1099,29 @@ def datetime_are_iso_format(
     path_
         Path of the folder that is being validated.
 
+    level
+        The project level of the folder (e.g. "sub"), if known.
+
     Returns
     -------
     error_message
         A list of validation errors.
 
     """
-    datetime_keys = list(canonical_tags.get_datetime_formats().keys())
-    key = next((key for key in datetime_keys if f"_{key}-" in name), None)
+    key = next(
+        (key for key in DATETIME_VALUE_REGEXPS if f"_{key}-" in name), None
+    )
 
-    error_message: List[str]
+    error_message: List[ValidationIssue]
     if not key:
         error_message = []
     else:
-        try:
-            format_to_check = utils.get_values_from_bids_formatted_name(
-                [name], key, return_as_int=False
-            )[0]
-        except Exception:
+        values = DATETIME_VALUE_REGEXPS[key].findall(name)
+
+        if len(values) != 1:
             return []
 
-        if datetime_value_str_is_iso_format(format_to_check, key):
+        if datetime_value_str_is_iso_format(values[0], key):
             error_message = []
         else:
             error_message = [
@@ -642,12 +1130,14 @@ def datetime_are_iso_format(
                     name,
                     canonical_tags.get_datetime_formats()[key],
                     path_,
+                    level,
                 )
             ]
 
     return error_message
 
 
+@lru_cache(maxsize=4096)
 def datetime_value_str_is_iso_format(
     datetime_str: str, format_type: str
 ) -> bool:
@@ -725,7 +1215,11 @@ def validate_project(
     validation_templates: Optional[Dict] = None,
     strict_mode: bool = False,
     allow_letters_in_sub_ses_values: bool = False,
-) -> List[str]:
+    num_workers: int = 1,
+    use_cache: bool = False,
+    max_errors: Optional[int] = None,
+    return_issues: bool = False,
+) -> List[str] | List[ValidationIssue]:
     """Validate all subject and session folders within a project.
 
     Parameters
@@ -765,33 +1259,231 @@ def validate_project(
 
         - Labels must be the same length (e.g. sub-01 and sub-002 is invalid).
 
+    num_workers
+        Number of threads used to scan and validate subjects concurrently.
+        This is useful when the project is on network-mounted storage.
+        The errors (and their order) are the same for any number of workers.
+
+    use_cache
+        If `True`, the results for each local subject are stored in the project
+        `.datashuttle` folder, and only subjects that have changed since the
+        last validation are validated again (see `ValidationCache`). Not
+        used if `include_central` is `True`.
+
+    max_errors
+        If set, validation stops once this many errors are found
+        (e.g. 1 to stop at the first error). See `iter_validate_project()`.
+
+    return_issues
+        If `True`, return the `ValidationIssue` for each error rather
+        than its message, e.g. to group errors by `code` or `path`.
+
     Returns
     -------
     error_messages
         A list of validation errors.
 
     """
-    error_messages = []
+    issues = list(
+        iter_validate_project(
+            cfg,
+            top_level_folder_list,
+            include_central=include_central,
+            validation_templates=validation_templates,
+            strict_mode=strict_mode,
+            allow_letters_in_sub_ses_values=allow_letters_in_sub_ses_values,
+            num_workers=num_workers,
+            use_cache=use_cache,
+            max_errors=max_errors,
+        )
+    )
+
+    error_messages = get_messages(issues)
+
+    # Display the collected errors using the selected method
+    if any(error_messages):
+        for message in error_messages:
+            raise_display_mode(message, display_mode, log)
+    else:
+        utils.print_message_to_user("No validation issues detected.")
+
+    return issues if return_issues else error_messages
+
+
+def iter_validate_project(
+    cfg: Configs,
+    top_level_folder_list: List[TopLevelFolder],
+    include_central: bool = False,
+    validation_templates: Optional[Dict] = None,
+    strict_mode: bool = False,
+    allow_letters_in_sub_ses_values: bool = False,
+    num_workers: int = 1,
+    use_cache: bool = False,
+    max_errors: Optional[int] = None,
+) -> Generator[ValidationIssue, None, None]:
+    """Validate all subject and session folders within a project, yielding issues as they are found.
+
+    Issues are yielded in the same order as the errors returned by
+    `validate_project()`, but are not displayed. Subjects are validated as the errors are consumed,
+    so if iteration is stopped early the rest of the project is not scanned.
 
+    Parameters
+    ----------
+    cfg
+        datashuttle Configs.
+
+    top_level_folder_list
+        The top-level folders to validate.
+
+    include_central
+        If `True`, the central project is also validated.
+
+    validation_templates
+        A `validation_templates` dictionary (see `validate_project()`).
+
+    strict_mode
+        If `True`, only allow NeuroBlueprint-formatted folders to exist in
+        the project (see `validate_project()`).
+
+    allow_letters_in_sub_ses_values
+        If `True`, any alphanumeric character is allowed for the values associated
+        with sub- or ses- keys. Otherwise, values must be integer.
+
+    num_workers
+        Number of threads used to validate subjects concurrently.
+
+    use_cache
+        If `True`, unchanged subjects are not validated again
+        (see `validate_project()`).
+
+    max_errors
+        If set, stop once this many errors have been yielded
+        (e.g. 1 to stop at the first error).
+
+    Yields
+    ------
+    issue
+        A validation issue.
+
+    """
+    if max_errors is not None and max_errors < 1:
+        raise ValueError("`max_errors` must be a positive integer or `None`.")
+
+    with closing(
+        _iter_validate_project(
+            cfg,
+            top_level_folder_list,
+            include_central,
+            validation_templates,
+            strict_mode,
+            allow_letters_in_sub_ses_values,
+            num_workers,
+            use_cache,
+        )
+    ) as issues:
+        for num_errors, issue in enumerate(issues, start=1):
+            yield issue
+
+            if num_errors == max_errors:
+                return
+
+
+def _iter_validate_project(
+    cfg: Configs,
+    top_level_folder_list: List[TopLevelFolder],
+    include_central: bool,
+    validation_templates: Optional[Dict],
+    strict_mode: bool,
+    allow_letters_in_sub_ses_values: bool,
+    num_workers: int,
+    use_cache: bool,
+) -> Generator[ValidationIssue, None, None]:
+    """Yield all validation issues in the project, see `iter_validate_project()`."""
     # Check basic things about the project (e.g. contains a top-level folder)
-    error_messages += check_high_level_project_structure(cfg, include_central)
+    yield from check_high_level_project_structure(cfg, include_central)
 
+    cache = None
+    if use_cache and not include_central:
+        cache = validation_cache.ValidationCache.load(
+            cfg,
+            validation_cache.get_settings_key(
+                cfg,
+                validation_templates,
+                strict_mode,
+                allow_letters_in_sub_ses_values,
+            ),
+        )
+
+    try:
+        with project_snapshot.central_snapshots(
+            cfg, top_level_folder_list, include_central
+        ):
+            yield from validate_top_level_folders(
+                cfg,
+                top_level_folder_list,
+                include_central,
+                validation_templates,
+                strict_mode,
+                allow_letters_in_sub_ses_values,
+                num_workers,
+                cache,
+            )
+    finally:
+        # Results of all subjects validated so far are stored,
+        # even if iteration was stopped early.
+        if cache is not None:
+            cache.save()
+
+
+def validate_top_level_folders(
+    cfg: Configs,
+    top_level_folder_list: List[TopLevelFolder],
+    include_central: bool,
+    validation_templates: Optional[Dict],
+    strict_mode: bool,
+    allow_letters_in_sub_ses_values: bool,
+    num_workers: int = 1,
+    cache: Optional[validation_cache.ValidationCache] = None,
+) -> Iterator[ValidationIssue]:
+    """Validate the subject and session folders within each top-level folder.
+
+    See `validate_project()` for parameters. If a `cache` is
+    passed, only the local project can be validated.
+
+    Yields
+    ------
+    issue
+        A validation issue.
+
+    """
     for top_level_folder in top_level_folder_list:
+        if cache is not None:
+            assert not include_central, (
+                "The validation cache is only for the local project."
+            )
+            yield from validate_top_level_folder_with_cache(
+                cfg,
+                top_level_folder,
+                validation_templates,
+                strict_mode,
+                allow_letters_in_sub_ses_values,
+                num_workers,
+                cache,
+            )
+            continue
+
         if strict_mode:
-            error_messages += check_strict_mode(
-                cfg, top_level_folder, include_central
+            yield from check_strict_mode(
+                cfg, top_level_folder, include_central, num_workers
             )
 
-        # Get a list of paths to every sub- or ses- folder
-        folder_paths = getters.get_all_sub_and_ses_paths(
-            cfg,
-            top_level_folder,
-            include_central,
+        # Check subject folders are valid
+        sub_paths = getters.get_sub_paths(
+            cfg, top_level_folder, include_central
         )
 
-        # Check subject folders are valid
-        error_messages += validate_list_of_names(
-            folder_paths["sub"],
+        yield from get_list_of_names_issues(
+            sub_paths,
             prefix="sub",
             validation_templates=validation_templates,
             allow_letters_in_sub_ses_values=allow_letters_in_sub_ses_values,
@@ -802,9 +1494,16 @@ def validate_project(
         # However, we need to check inconsistent ses-<value> lengths
         # across the entire project.
 
-        # Check all names as well as duplicates per-subject
-        for ses_paths in folder_paths["ses"].values():
-            error_messages += validate_list_of_names(
+        # Check all names as well as duplicates per-subject. Subjects
+        # found in both local and central are checked once, with all
+        # sessions (see `getters.get_all_sub_and_ses_paths()`).
+        def validate_ses_names(
+            sub: str,
+        ) -> Tuple[List[Path], List[ValidationIssue]]:
+            ses_paths = getters.get_ses_paths(
+                cfg, top_level_folder, sub, include_central
+            )
+            return ses_paths, get_list_of_names_issues(
                 ses_paths,
                 "ses",
                 check_value_lengths=False,
@@ -812,38 +1511,234 @@ def validate_project(
                 allow_letters_in_sub_ses_values=allow_letters_in_sub_ses_values,
             )
 
+        all_ses_paths: List[Path] = []
+        for ses_paths, ses_issues in utils.imap_in_threads(
+            validate_ses_names,
+            list(dict.fromkeys(sub_path.name for sub_path in sub_paths)),
+            num_workers,
+        ):
+            all_ses_paths += ses_paths
+            yield from ses_issues
+
         # Next, check inconsistent value lengths across the entire project
         # (only required for integer ses values)
         if not allow_letters_in_sub_ses_values:
-            all_ses_paths = list(chain(*folder_paths["ses"].values()))
+            yield from name_value_lengths_are_inconsistent(
+                get_checkable_bids_names(
+                    all_ses_paths, "ses", allow_letters_in_sub_ses_values
+                ),
+                "ses",
+            )
 
-            stripped_ses_paths = strip_uncheckable_names(
-                all_ses_paths, "ses", allow_letters_in_sub_ses_values
+
+def validate_top_level_folder_with_cache(
+    cfg: Configs,
+    top_level_folder: TopLevelFolder,
+    validation_templates: Optional[Dict],
+    strict_mode: bool,
+    allow_letters_in_sub_ses_values: bool,
+    num_workers: int,
+    cache: validation_cache.ValidationCache,
+) -> Iterator[ValidationIssue]:
+    """Validate the local subject and session folders, using cached results for unchanged subjects.
+
+    The checks within each subject (see `validate_subject()`) are read from
+    the cache if the subject has not changed. The checks across subjects
+    are run on the (cached) names. The errors, and their order, are the
+    same as `validate_top_level_folders()` without a cache. As `strict_mode`
+    errors come first, all subjects are validated before errors are yielded.
+
+    See `validate_project()` for parameters.
+
+    Yields
+    ------
+    issue
+        A validation issue.
+
+    """
+    # For circular imports
+    from datashuttle.utils import folders
+
+    sub_paths = folders.search_project_for_sub_or_ses_names(
+        cfg,
+        top_level_folder,
+        None,
+        "sub-*",
+        include_central=False,
+        return_full_path=True,
+    )["local"]
+
+    def get_subject_results(sub_path: Path) -> Dict[str, List]:
+        cached_results = cache.get_results(cfg, sub_path)
+
+        if cached_results is None:
+            return validate_subject(
+                cfg,
+                top_level_folder,
+                sub_path,
+                validation_templates,
+                strict_mode,
+                allow_letters_in_sub_ses_values,
+                cache,
             )
-            error_messages += value_lengths_are_inconsistent(
-                stripped_ses_paths, "ses"
+
+        return {
+            "ses_names": cached_results["ses_names"],
+            "ses_errors": [
+                ValidationIssue.from_dict(issue)
+                for issue in cached_results["ses_errors"]
+            ],
+            "strict_errors": [
+                ValidationIssue.from_dict(issue)
+                for issue in cached_results["strict_errors"]
+            ],
+        }
+
+    results_by_sub = dict(
+        zip(
+            sub_paths,
+            utils.map_in_threads(get_subject_results, sub_paths, num_workers),
+        )
+    )
+    cache.remove_missing_subjects(cfg, top_level_folder, sub_paths)
+
+    if strict_mode:
+        sub_level_folder_paths = folders.search_project_for_sub_or_ses_names(
+            cfg,
+            top_level_folder,
+            None,
+            "*",
+            include_central=False,
+            return_full_path=True,
+        )["local"]
+
+        for sub_level_path in sub_level_folder_paths:
+            if sub_level_path in results_by_sub:
+                yield from results_by_sub[sub_level_path]["strict_errors"]
+            else:
+                yield from check_strict_mode_for_subject(
+                    cfg, top_level_folder, sub_level_path
+                )
+
+    yield from get_list_of_names_issues(
+        sub_paths,
+        prefix="sub",
+        validation_templates=validation_templates,
+        allow_letters_in_sub_ses_values=allow_letters_in_sub_ses_values,
+    )
+
+    for sub_path in sub_paths:
+        yield from results_by_sub[sub_path]["ses_errors"]
+
+    if not allow_letters_in_sub_ses_values:
+        all_ses_paths = [
+            sub_path / ses_name
+            for sub_path in sub_paths
+            for ses_name in results_by_sub[sub_path]["ses_names"]
+        ]
+
+        yield from name_value_lengths_are_inconsistent(
+            get_checkable_bids_names(
+                all_ses_paths, "ses", allow_letters_in_sub_ses_values
+            ),
+            "ses",
+        )
+
+
+def validate_subject(
+    cfg: Configs,
+    top_level_folder: TopLevelFolder,
+    sub_path: Path,
+    validation_templates: Optional[Dict],
+    strict_mode: bool,
+    allow_letters_in_sub_ses_values: bool,
+    cache: validation_cache.ValidationCache,
+) -> Dict[str, List]:
+    """Validate the contents of a local subject folder, and store the results in the cache.
+
+    Returns
+    -------
+    results
+        A dictionary with the names of the subject's sessions ("ses_names"),
+        the issues in these session names ("ses_errors", including duplicates
+        within the subject), and the `strict_mode` issues within the
+        subject ("strict_errors"). The subject name itself, and checks
+        across subjects, are not included. In the cache, issues are
+        stored with `ValidationIssue.to_dict()`.
+
+    """
+    # For circular imports
+    from datashuttle.utils import folders
+
+    # Read the mtimes of the folders before listing
+    # them, so that any later changes are detected.
+    checked_at_ns = time.time_ns()
+    mtimes = {".": validation_cache.get_mtime_ns(sub_path)}
+
+    if strict_mode:
+        for folder_name in folders.search_project_for_sub_or_ses_names(
+            cfg, top_level_folder, sub_path.name, "*", include_central=False
+        )["local"]:
+            mtimes[folder_name] = validation_cache.get_mtime_ns(
+                sub_path / folder_name
             )
 
-    # Display the collected errors using the selected method
-    if any(error_messages):
-        for message in error_messages:
-            raise_display_mode(message, display_mode, log)
-    else:
-        utils.print_message_to_user("No validation issues detected.")
+    ses_paths = folders.search_project_for_sub_or_ses_names(
+        cfg,
+        top_level_folder,
+        sub_path.name,
+        "ses-*",
+        include_central=False,
+        return_full_path=True,
+    )["local"]
 
-    return error_messages
+    results: Dict[str, List] = {
+        "ses_names": [ses_path.name for ses_path in ses_paths],
+        "ses_errors": get_list_of_names_issues(
+            ses_paths,
+            "ses",
+            check_value_lengths=False,
+            validation_templates=validation_templates,
+            allow_letters_in_sub_ses_values=allow_letters_in_sub_ses_values,
+        ),
+        "strict_errors": (
+            check_strict_mode_for_subject(cfg, top_level_folder, sub_path)
+            if strict_mode
+            else []
+        ),
+    }
+
+    if all(mtime_ns is not None for mtime_ns in mtimes.values()):
+        cache.set_results(
+            cfg,
+            sub_path,
+            mtimes,  # type: ignore
+            checked_at_ns,
+            {
+                "ses_names": results["ses_names"],
+                "ses_errors": [
+                    issue.to_dict() for issue in results["ses_errors"]
+                ],
+                "strict_errors": [
+                    issue.to_dict() for issue in results["strict_errors"]
+                ],
+            },
+        )
+
+    return results
 
 
 def validate_names_against_project(
     cfg: Configs,
     top_level_folder: TopLevelFolder,
-    sub_names: List[str],
-    ses_names: Optional[List[str]] = None,
+    sub_names: List[str] | List[str | formatting.NameRange],
+    ses_names: Optional[List[str] | List[str | formatting.NameRange]] = None,
     include_central: bool = False,
     display_mode: DisplayMode = "error",
     log: bool = True,
     validation_templates: Optional[Dict] = None,
     allow_letters_in_sub_ses_values: bool = False,
+    project_folder_paths: Optional[Dict] = None,
 ) -> None:
     """Check that sub / ses names are formatted consistently with the rest of the project.
 
@@ -863,13 +1758,15 @@ def validate_names_against_project(
 
     sub_names
         A list of subject-level names to validate against the
-        subject names that exist in the project.
+        subject names that exist in the project. Names may include
+        a `formatting.NameRange`, which is validated without making
+        every name in the range.
 
     ses_names
         A list of session-level names to validate against the
         session names that exist in the project. Note that
         duplicate checks will only be performed for sessions within
-        the passed `sub_names`.
+        the passed `sub_names`. May include a `formatting.NameRange`.
 
     include_central
         If `True`, only project folders in the `local_path` will
@@ -892,11 +1789,18 @@ def validate_names_against_project(
 
             - Labels must be the same length (e.g. sub-01 and sub-002 is invalid).
 
+    project_folder_paths
+        The subject and session paths in the project to validate against, as
+        returned by `getters.get_all_sub_and_ses_paths()`. If `None`, the
+        project is searched. Used for live validation in the TUI, where
+        names are validated against a snapshot of the project
+        (see `project_snapshot.LocalNamesSnapshot`).
+
     """
-    error_messages = []
+    error_messages: List[ValidationIssue | str] = []
 
     # First, check the list of passed names are valid
-    error_messages += validate_list_of_names(
+    error_messages += get_list_of_names_issues(
         sub_names,
         prefix="sub",
         validation_templates=validation_templates,
@@ -905,17 +1809,24 @@ def validate_names_against_project(
 
     # Next, get all of the subjects and sessions from
     # the project (local and possibly central)
-    folder_paths = getters.get_all_sub_and_ses_paths(
-        cfg, top_level_folder, include_central
-    )
+    if project_folder_paths is None:
+        folder_paths = getters.get_all_sub_and_ses_paths(
+            cfg, top_level_folder, include_central
+        )
+    else:
+        folder_paths = project_folder_paths
+
+    # Ranges of names (e.g. sub-001@TO@100) are checked against the
+    # project by interval, without making every name in the range.
+    single_sub_names, sub_ranges = formatting.split_name_ranges(sub_names)
 
     if folder_paths["sub"]:
         # Strip any totally invalid names which we can't extract
         # the sub integer value for the following checks
-        valid_sub_names = strip_uncheckable_names(
-            sub_names, "sub", allow_letters_in_sub_ses_values
+        valid_sub_names = get_checkable_bids_names(
+            single_sub_names, "sub", allow_letters_in_sub_ses_values
         )
-        valid_sub_in_project = strip_uncheckable_names(
+        valid_sub_in_project = get_checkable_bids_names(
             folder_paths["sub"], "sub", allow_letters_in_sub_ses_values
         )
 
@@ -923,7 +1834,9 @@ def validate_names_against_project(
         # for value-length violations and duplicates.
         if not allow_letters_in_sub_ses_values:
             if any(
-                value_lengths_are_inconsistent(valid_sub_in_project, "sub")
+                name_value_lengths_are_inconsistent(
+                    valid_sub_in_project, "sub"
+                )
             ):
                 error_messages += [
                     "Cannot check names for inconsistent value lengths "
@@ -931,22 +1844,21 @@ def validate_names_against_project(
                     "across the project."
                 ]
             else:
-                error_messages += value_lengths_are_inconsistent(
-                    valid_sub_names + valid_sub_in_project, "sub"
+                error_messages += name_value_lengths_are_inconsistent(
+                    valid_sub_names + valid_sub_in_project, "sub", sub_ranges
                 )
 
-        for new_sub in valid_sub_names:
-            error_messages += new_name_duplicates_existing(
-                new_sub,
-                valid_sub_in_project,
-                "sub",
-                allow_letters_in_sub_ses_values,
-            )
+        error_messages += names_duplicate_existing(
+            valid_sub_names,
+            valid_sub_in_project,
+            new_name_ranges=sub_ranges,
+            allow_letters_in_sub_ses_values=allow_letters_in_sub_ses_values,
+        )
 
     # Now we need to check the sessions.
     if ses_names is not None and any(ses_names):
         # First, validate the list of passed session names
-        error_messages += validate_list_of_names(
+        error_messages += get_list_of_names_issues(
             ses_names,
             "ses",
             validation_templates=validation_templates,
@@ -957,56 +1869,84 @@ def validate_names_against_project(
             # Next, we need to check that the passed session names
             # do not duplicate existing session names and
             # that do not create inconsistent ses-<value> lengths across the project.
-            valid_ses_names = strip_uncheckable_names(
-                ses_names, "ses", allow_letters_in_sub_ses_values
+            single_ses_names, ses_ranges = formatting.split_name_ranges(
+                ses_names
+            )
+            valid_ses_names = get_checkable_bids_names(
+                single_ses_names, "ses", allow_letters_in_sub_ses_values
             )
 
             # First, we need to check for duplicate session names
             # for each subject separately, as duplicate session names
             # are allowed across different subjects (but not within a single sub).
-            for new_sub in sub_names:
-                if new_sub in folder_paths["ses"]:
-                    valid_ses_in_sub = strip_uncheckable_names(
-                        folder_paths["ses"][new_sub],
-                        "ses",
-                        allow_letters_in_sub_ses_values,
-                    )
-                    for new_ses in valid_ses_names:
-                        error_messages += new_name_duplicates_existing(
-                            new_ses,
-                            valid_ses_in_sub,
-                            "ses",
-                            allow_letters_in_sub_ses_values,
-                        )
+            for new_sub in get_existing_sub_names(
+                sub_names, folder_paths["ses"]
+            ):
+                valid_ses_in_sub = get_checkable_bids_names(
+                    folder_paths["ses"][new_sub],
+                    "ses",
+                    allow_letters_in_sub_ses_values,
+                )
+                error_messages += names_duplicate_existing(
+                    valid_ses_names,
+                    valid_ses_in_sub,
+                    new_name_ranges=ses_ranges,
+                    allow_letters_in_sub_ses_values=allow_letters_in_sub_ses_values,
+                )
             # Next, we need to check for inconsistent session value lengths
             # across the entire project at once (because inconsistent
             # ses-<value> lengths are not allowed across different subs).
             all_ses_paths = list(chain(*folder_paths["ses"].values()))
 
-            all_valid_ses = strip_uncheckable_names(
+            all_valid_ses = get_checkable_bids_names(
                 all_ses_paths, "ses", allow_letters_in_sub_ses_values
             )
 
             if not allow_letters_in_sub_ses_values:
-                if any(value_lengths_are_inconsistent(all_valid_ses, "ses")):
+                if any(
+                    name_value_lengths_are_inconsistent(all_valid_ses, "ses")
+                ):
                     error_messages += [
                         "Cannot check names for inconsistent value lengths "
                         "because the session value lengths for this project "
                         "are not consistent."
                     ]
                 else:
-                    error_messages += value_lengths_are_inconsistent(
-                        valid_ses_names + all_valid_ses, "ses"
+                    error_messages += name_value_lengths_are_inconsistent(
+                        valid_ses_names + all_valid_ses, "ses", ses_ranges
                     )
 
     # Display the collected errors using the selected method
-    for message in error_messages:
+    for message in get_messages(error_messages):
         raise_display_mode(message, display_mode, log)
 
 
+def get_existing_sub_names(
+    sub_names: List[str] | List[str | formatting.NameRange],
+    existing_sub_names: Iterable[str],
+) -> List[str]:
+    """Return the passed subject names that already exist in the project.
+
+    For a `formatting.NameRange`, the existing names are
+    checked against the range rather than every name in the range.
+    """
+    existing_sub_names = set(existing_sub_names)
+
+    found_names = []
+    for sub_name in sub_names:
+        if isinstance(sub_name, formatting.NameRange):
+            found_names += [
+                name for name in existing_sub_names if name in sub_name
+            ]
+        elif sub_name in existing_sub_names:
+            found_names.append(sub_name)
+
+    return found_names
+
+
 def check_high_level_project_structure(
     cfg: Configs, include_central: bool
-) -> List[str]:
+) -> List[ValidationIssue]:
     """Perform basic validation checks on the project structure.
 
     This includes checking that the project folder name is valid, and that the
@@ -1022,8 +1962,8 @@ def check_high_level_project_structure(
 
     Returns
     -------
-    error_messages
-        A list of validation errors.
+    issues
+        A list of validation issues.
 
     """
     # To avoid circular imports
@@ -1032,20 +1972,16 @@ def check_high_level_project_structure(
     error_messages = []
 
     # Check the project name
-    if any(names_include_special_characters(cfg["local_path"].name, None)):
-        error_messages += [
-            f"PROJECT_NAME: The local project name folder {cfg['local_path'].name} "
-            f"contains non-alphanumeric characters. Path: {cfg['local_path']}"
-        ]
+    if name_has_special_character(cfg["local_path"].name):
+        error_messages.append(
+            get_project_name_error(cfg["local_path"], "local")
+        )
 
     if cfg["central_path"]:
-        if any(
-            names_include_special_characters(cfg["central_path"].name, None)
-        ):
-            error_messages += [
-                f"PROJECT_NAME: The central project name folder {cfg['central_path'].name} "
-                f"contains non-alphanumeric characters. Path: {cfg['central_path']}"
-            ]
+        if name_has_special_character(cfg["central_path"].name):
+            error_messages.append(
+                get_project_name_error(cfg["central_path"], "central")
+            )
 
     # Check the local project folder contains rawdata or derivatives
     if (
@@ -1082,8 +2018,11 @@ def check_high_level_project_structure(
 
 
 def check_strict_mode(
-    cfg: Configs, top_level_folder: TopLevelFolder, include_central: bool
-) -> List[str]:
+    cfg: Configs,
+    top_level_folder: TopLevelFolder,
+    include_central: bool,
+    num_workers: int = 1,
+) -> Iterator[ValidationIssue]:
     """Perform `strict_mode`  validation.
 
     `strict_mode` does not allow any non-NeuroBlueprint folder to exist
@@ -1107,10 +2046,13 @@ def check_strict_mode(
     include_central
         If `True`, the central project is also checked.
 
-    Returns
-    -------
-    error_messages
-        A list of validation errors.
+    num_workers
+        Number of threads used to check subject folders concurrently.
+
+    Yields
+    ------
+    issue
+        A validation issue.
 
     """
     # For circular imports
@@ -1121,8 +2063,6 @@ def check_strict_mode(
             "`strict_mode` is currently only available for `include_central=False`."
         )
 
-    error_messages = []
-
     sub_level_folder_paths = folders.search_project_for_sub_or_ses_names(
         cfg,
         top_level_folder,
@@ -1132,58 +2072,78 @@ def check_strict_mode(
         return_full_path=True,
     )
 
-    for sub_level_path in sub_level_folder_paths["local"]:
-        # Check all folders found in a top-level folder are
-        # sub- prefixed folders.
-        sub_level_name = sub_level_path.name
+    # Subjects are checked concurrently, but errors yielded in order.
+    for sub_issues in utils.imap_in_threads(
+        lambda sub_level_path: check_strict_mode_for_subject(
+            cfg, top_level_folder, sub_level_path
+        ),
+        sub_level_folder_paths["local"],
+        num_workers,
+    ):
+        yield from sub_issues
+
+
+def check_strict_mode_for_subject(
+    cfg: Configs, top_level_folder: TopLevelFolder, sub_level_path: Path
+) -> List[ValidationIssue]:
+    """Perform `strict_mode` validation on a folder within the top-level folder.
+
+    See `check_strict_mode()`.
+    """
+    # For circular imports
+    from datashuttle.utils import folders
+
+    # Check all folders found in a top-level folder are
+    # sub- prefixed folders.
+    sub_level_name = sub_level_path.name
+
+    if sub_level_name[:4] != "sub-":
+        return [get_name_error(sub_level_name, "sub", sub_level_path)]
+
+    error_messages = []
 
-        if sub_level_name[:4] != "sub-":
-            message = get_name_error(sub_level_name, "sub", sub_level_path)
+    ses_level_folder_paths = folders.search_project_for_sub_or_ses_names(
+        cfg,
+        top_level_folder,
+        sub_level_name,
+        "*",
+        include_central=False,
+        return_full_path=True,
+    )
+
+    for ses_level_path in ses_level_folder_paths["local"]:
+        # For each sub- prefixed folder, check that all folders within
+        # the subject folder are ses- prefixed folders.
+        ses_level_name = ses_level_path.name
+
+        if ses_level_name[:4] != "ses-":
+            message = get_name_error(ses_level_name, "ses", ses_level_path)
             error_messages.append(message)
-            continue
 
-        ses_level_folder_paths = folders.search_project_for_sub_or_ses_names(
+        base_folder = cfg.get_base_folder("local", top_level_folder)
+
+        search_results: List[Path]
+        search_results = folders.search_sub_or_ses_level(  # type: ignore
             cfg,
-            top_level_folder,
+            base_folder,
+            "local",
             sub_level_name,
-            "*",
-            include_central=False,
+            ses_level_name,
             return_full_path=True,
-        )
+        )[0]
 
-        for ses_level_path in ses_level_folder_paths["local"]:
-            # For each sub- prefixed folder, check that all folders within
-            # the subject folder are ses- prefixed folders.
-            ses_level_name = ses_level_path.name
+        canonical_datatypes = canonical_configs.get_datatypes()
+        for datatype_level_path in search_results:
+            # For each ses- prefixed folder, check that
+            # only valid datatypes are included within it.
+            datatype_level_name = datatype_level_path.name
 
-            if ses_level_name[:4] != "ses-":
-                message = get_name_error(ses_level_name, "ses", ses_level_path)
+            if datatype_level_name not in canonical_datatypes:
+                message = get_datatype_error(
+                    datatype_level_name, datatype_level_path
+                )
                 error_messages.append(message)
 
-            base_folder = cfg.get_base_folder("local", top_level_folder)
-
-            search_results: List[Path]
-            search_results = folders.search_sub_or_ses_level(  # type: ignore
-                cfg,
-                base_folder,
-                "local",
-                sub_level_name,
-                ses_level_name,
-                return_full_path=True,
-            )[0]
-
-            canonical_datatypes = canonical_configs.get_datatypes()
-            for datatype_level_path in search_results:
-                # For each ses- prefixed folder, check that
-                # only valid datatypes are included within it.
-                datatype_level_name = datatype_level_path.name
-
-                if datatype_level_name not in canonical_datatypes:
-                    message = get_datatype_error(
-                        datatype_level_name, datatype_level_path
-                    )
-                    error_messages.append(message)
-
     return error_messages
 
 
@@ -1231,28 +2191,67 @@ def strip_uncheckable_names(
     to be validated against) removed.
 
     """
-    new_list = []
+    return [
+        bids_name.path if bids_name.path else bids_name.name  # type: ignore
+        for bids_name in get_checkable_bids_names(
+            path_or_names_list, prefix, allow_letters_in_sub_ses_values
+        )
+    ]
 
-    return_as_int = not allow_letters_in_sub_ses_values
 
-    for path_or_name in path_or_names_list:
-        path_, name = get_path_and_name(path_or_name)
+def get_checkable_bids_names(
+    path_or_names_list: List[Path] | List[str] | List[Path | str],
+    prefix: Prefix,
+    allow_letters_in_sub_ses_values: bool,
+    raise_on_uncheckable: bool = False,
+) -> List[utils.BidsName]:
+    """Parse the `prefix` value of each name, skipping names in which it cannot be found.
 
-        try:
-            utils.get_values_from_bids_formatted_name(
-                [name],
-                prefix,
-                return_as_int=return_as_int,  # type: ignore
-            )[0]
-        except Exception:
+    Each name is parsed once, so checks across all names (e.g. for
+    duplicates) can use the parsed values rather than parsing names again.
+
+    Parameters
+    ----------
+    path_or_names_list
+        A path of names of folders to validate, or path to folders to validate.
+
+    prefix
+        "sub" or "ses".
+
+    allow_letters_in_sub_ses_values
+        If `False`, names in which the value is not an integer are skipped,
+        and the id is the value converted to `int` (ignoring leading zeros).
+        Otherwise, the id is the value.
+
+    raise_on_uncheckable
+        If `True`, raise the error of `utils.get_values_from_bids_formatted_name()`
+        rather than skip a name in which the value cannot be found.
+
+    Returns
+    -------
+    A list of the parsed checkable names, where the path
+    is `None` if a name was passed.
+
+    """
+    rules = get_name_rules(prefix, None, allow_letters_in_sub_ses_values)
+
+    bids_names: List[utils.BidsName] = []
+
+    for path_or_name in path_or_names_list:
+        bids_name = rules.parse_name(path_or_name)
+
+        if bids_name.id is None:
+            if raise_on_uncheckable:
+                utils.get_values_from_bids_formatted_name(
+                    [bids_name.name],
+                    prefix,
+                    return_as_int=not allow_letters_in_sub_ses_values,  # type: ignore
+                )
             continue
 
-        if path_:
-            new_list.append(path_)
-        else:
-            new_list.append(name)  # type: ignore
+        bids_names.append(bids_name)
 
-    return new_list
+    return bids_names
 
 
 # -----------------------------------------------------------------------------
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from datashuttle.configs.config_class import Configs
+    from datashuttle.utils.custom_types import TopLevelFolder
+
+import hashlib
+import json
+import os
+import threading
+
+import datashuttle
+from datashuttle.utils import project_index
+
+CACHE_VERSION = 2
+
+
+class ValidationCache:
+    """The validation results of each subject folder in the project, stored on disk.
+
+    Validating a project lists every subject and session folder (and,
+    in `strict_mode`, every datatype folder) and checks the names found.
+    On large projects on network-mounted storage this is slow, even
+    if only a single session has been added since the last validation.
+
+    Instead, the results for each subject (see `validation.validate_subject()`)
+    are stored together with the modification time of the folders they were
+    computed from. A subject is validated again only if one of these folders
+    has changed (e.g. a session was added). Checks across subjects (e.g. for
+    duplicate names) are always re-run, on the cached session names.
+
+    The cache is stored in the project `.datashuttle` folder and is
+    discarded if the validation settings change (see `get_settings_key()`).
+
+    Parameters
+    ----------
+    cache_path
+        Path to the cache file.
+
+    settings_key
+        Identifies the validation settings the results were computed with.
+
+    subjects
+        A dictionary where keys are subject folder paths relative to the
+        project folder and values a dictionary with the subject "results",
+        the "mtimes" (in ns) of the folders they were computed from (keyed
+        by path relative to the subject folder) and the time "checked_at_ns".
+
+    """
+
+    def __init__(
+        self,
+        cache_path: Path,
+        settings_key: str,
+        subjects: Dict[str, Dict[str, Any]],
+    ) -> None:
+        """Initialise the ValidationCache."""
+        self.cache_path = cache_path
+        self.settings_key = settings_key
+        self.subjects = subjects
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, cfg: Configs, settings_key: str) -> ValidationCache:
+        """Load the cache for the project, or an empty cache if none is valid."""
+        cache_path = get_cache_path(cfg)
+
+        try:
+            with open(cache_path, encoding="utf-8") as cache_file:
+                contents = json.load(cache_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return cls(cache_path, settings_key, {})
+
+        if (
+            contents.get("version") != CACHE_VERSION
+            or contents.get("settings_key") != settings_key
+        ):
+            return cls(cache_path, settings_key, {})
+
+        return cls(cache_path, settings_key, contents["subjects"])
+
+    def save(self) -> None:
+        """Write the cache to disk, replacing any existing cache file."""
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        temp_path = self.cache_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as cache_file:
+            json.dump(
+                {
+                    "version": CACHE_VERSION,
+                    "settings_key": self.settings_key,
+                    "subjects": self.subjects,
+                },
+                cache_file,
+            )
+        os.replace(temp_path, self.cache_path)
+
+    def get_results(
+        self, cfg: Configs, sub_path: Path
+    ) -> Optional[Dict[str, List]]:
+        """Return the cached results for a subject, or `None` if they are not up to date.
+
+        The results are up to date if none of the folders they were computed
+        from have changed. A folder modified just before it was checked may be
+        modified again without its mtime changing, so is always re-checked
+        (see `project_index.RACY_MTIME_WINDOW_NS`).
+        """
+        entry = self.subjects.get(get_subject_key(cfg, sub_path))
+
+        if entry is None:
+            return None
+
+        for relative_path, mtime_ns in entry["mtimes"].items():
+            if (
+                entry["checked_at_ns"] - mtime_ns
+                <= project_index.RACY_MTIME_WINDOW_NS
+            ):
+                return None
+
+            if get_mtime_ns(sub_path / relative_path) != mtime_ns:
+                return None
+
+        return entry["results"]
+
+    def set_results(
+        self,
+        cfg: Configs,
+        sub_path: Path,
+        mtimes: Dict[str, int],
+        checked_at_ns: int,
+        results: Dict[str, List],
+    ) -> None:
+        """Store the results for a subject.
+
+        Parameters
+        ----------
+        cfg
+            datashuttle Configs.
+
+        sub_path
+            Path to the subject folder.
+
+        mtimes
+            The mtime (in ns) of the folders the results were computed
+            from, keyed by path relative to the subject folder. These
+            must be read before the folders are listed.
+
+        checked_at_ns
+            The time the mtimes were read.
+
+        results
+            The subject results, see `validation.validate_subject()`.
+            Must be JSON-serialisable.
+
+        """
+        with self._lock:
+            self.subjects[get_subject_key(cfg, sub_path)] = {
+                "results": results,
+                "mtimes": mtimes,
+                "checked_at_ns": checked_at_ns,
+            }
+
+    def remove_missing_subjects(
+        self,
+        cfg: Configs,
+        top_level_folder: TopLevelFolder,
+        sub_paths: List[Path],
+    ) -> None:
+        """Drop subjects in the top-level folder that no longer exist."""
+        prefix = f"{top_level_folder}/"
+        existing_keys = {get_subject_key(cfg, path_) for path_ in sub_paths}
+
+        with self._lock:
+            for key in list(self.subjects):
+                if key.startswith(prefix) and key not in existing_keys:
+                    del self.subjects[key]
+
+
+def get_cache_path(cfg: Configs) -> Path:
+    """Return the path to the validation cache of the project."""
+    return cfg.project_metadata_path / "validation_cache.json"
+
+
+def get_settings_key(
+    cfg: Configs,
+    validation_templates: Optional[Dict],
+    strict_mode: bool,
+    allow_letters_in_sub_ses_values: bool,
+) -> str:
+    """Return a hash of the settings that validation results depend on.
+
+    The local path is included as validation errors include
+    the path, and the version as checks may change across versions.
+    """
+    settings = json.dumps(
+        [
+            getattr(datashuttle, "__version__", None),
+            cfg["local_path"].as_posix(),
+            validation_templates,
+            strict_mode,
+            allow_letters_in_sub_ses_values,
+        ],
+        sort_keys=True,
+    )
+    return hashlib.sha256(settings.encode("utf-8")).hexdigest()
+
+
+def get_subject_key(cfg: Configs, sub_path: Path) -> str:
+    """Return the subject path relative to the project folder, used as the cache key."""
+    return sub_path.relative_to(cfg["local_path"]).as_posix()
+
+
+def get_mtime_ns(folder_path: Path) -> Optional[int]:
+    """Return the mtime (in ns) of a folder, or `None` if it does not exist."""
+    try:
+        return os.stat(folder_path).st_mtime_ns
+    except (FileNotFoundError, NotADirectoryError):
+        return None
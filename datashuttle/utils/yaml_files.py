@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+import copy
+import os
+import threading
+import time
+
+from datashuttle.utils import project_index
+
+# Loaded file contents, keyed by path. Each entry holds the
+# (modification time in ns, size) of the file when it was read,
+# its contents and whether the entry can be reused while the file
+# version is unchanged (see `load_yaml()`).
+_cache: Dict[str, Tuple[Tuple[int, int], Any, bool]] = {}
+_cache_lock = threading.Lock()
+
+
+def get_loader():
+    """Return the C-accelerated YAML loader, or the Python loader if unavailable.
+
+    The C loader requires PyYAML to be built against libyaml.
+    """
+    import yaml
+
+    return getattr(yaml, "CFullLoader", yaml.FullLoader)
+
+
+def get_dumper():
+    """Return the C-accelerated YAML dumper, or the Python dumper if unavailable."""
+    import yaml
+
+    return getattr(yaml, "CDumper", yaml.Dumper)
+
+
+def load_yaml(
+    path: Path, update: Optional[Callable[[Any], None]] = None
+) -> Any:
+    """Load a YAML file, returning cached contents if the file has not changed.
+
+    The file is parsed again only if its modification time or size
+    has changed since it was last read (or written with `dump_yaml()`)
+    in this process. A file read within `project_index.RACY_MTIME_WINDOW_NS`
+    of being modified is always parsed again, as it may be modified
+    again without its modification time changing. A copy of the contents
+    is returned, so it may be changed by the caller without affecting the cache.
+
+    Parameters
+    ----------
+    path
+        Path to the YAML file.
+
+    update
+        A function that updates the loaded contents in place (e.g. to add keys
+        missing from files written by older versions). This is run only when
+        the file is parsed, and the updated contents are cached. All callers
+        loading the same `path` must pass the same `update`.
+
+    """
+    key = os.fspath(path)
+    file_version = _get_file_version(key)
+
+    with _cache_lock:
+        cached = _cache.get(key)
+
+    if cached is None or cached[0] != file_version or not cached[2]:
+        read_at_ns = time.time_ns()
+
+        with open(key) as file:
+            contents = file.read()
+
+        data = _parse(contents)
+
+        if update is not None:
+            update(data)
+
+        reusable = (
+            read_at_ns - file_version[0] > project_index.RACY_MTIME_WINDOW_NS
+        )
+
+        with _cache_lock:
+            _cache[key] = (file_version, data, reusable)
+    else:
+        data = cached[1]
+
+    return copy.deepcopy(data)
+
+
+def dump_yaml(data: Any, path: Path, sort_keys: bool = True) -> None:
+    """Write `data` to a YAML file and cache it, so it is not re-parsed on load.
+
+    As in `load_yaml()`, if the file is loaded within
+    `project_index.RACY_MTIME_WINDOW_NS` of being written, it is parsed
+    again, as another process may write it without the modification time
+    or size changing (e.g. on filesystems with coarse timestamps).
+
+    Parameters
+    ----------
+    data
+        The data to write. This should contain only
+        YAML-native types (e.g. dict, list, str, bool).
+
+    path
+        Path to the YAML file.
+
+    sort_keys
+        If `True`, dictionary keys are written in sorted order.
+
+    """
+    import yaml
+
+    key = os.fspath(path)
+
+    with open(key, "w") as file:
+        yaml.dump(data, file, Dumper=get_dumper(), sort_keys=sort_keys)
+
+    written_at_ns = time.time_ns()
+    file_version = _get_file_version(key)
+
+    reusable = (
+        written_at_ns - file_version[0] > project_index.RACY_MTIME_WINDOW_NS
+    )
+
+    with _cache_lock:
+        _cache[key] = (file_version, copy.deepcopy(data), reusable)
+
+
+def clear_cache() -> None:
+    """Remove all loaded files from the cache."""
+    with _cache_lock:
+        _cache.clear()
+
+
+def _parse(contents: str) -> Any:
+    """Parse the contents of a YAML file."""
+    import yaml
+
+    return yaml.load(contents, Loader=get_loader())
+
+
+def _get_file_version(key: str) -> Tuple[int, int]:
+    """Return the (modification time in ns, size) of a file, which change when it is written."""
+    stat = os.stat(key)
+    return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,392 @@
+"""Time datashuttle hot paths on a synthetic project and write the results as JSON.
+
+A synthetic project (see `synthetic_project.py`) is made in a temporary
+folder, and each benchmark is run `--repeats` times. Project configs are
+written to the temporary folder, not the user's datashuttle folder.
+
+Pass `--baseline` with the JSON output of a previous run to compare
+against it. The run exits with status 1 if the median time of any
+benchmark is slower than the baseline by more than `--tolerance`, or
+if importing datashuttle takes longer than its budget
+(see `IMPORT_BENCHMARKS`).
+
+Example
+-------
+python -m tests.benchmarks.run_benchmarks --output main.json
+python -m tests.benchmarks.run_benchmarks --output branch.json --baseline main.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from unittest import mock
+
+import datashuttle
+from datashuttle import DataShuttle
+from datashuttle.configs import canonical_tags
+from datashuttle.utils import (
+    data_transfer,
+    folders,
+    rclone,
+    validation_cache,
+)
+
+from . import synthetic_project
+
+PROJECT_NAME = "ds-benchmark-project"
+
+RESULTS_VERSION = 1
+
+# Statements run in a new Python process, and the wall-clock
+# time (in seconds, including interpreter start-up) they must take less than.
+IMPORT_BENCHMARKS = {
+    "import_datashuttle": ("import datashuttle", 0.25),
+    "import_validate_project_from_path": (
+        "from datashuttle import validate_project_from_path",
+        0.5,
+    ),
+}
+
+
+def time_function(
+    func: Callable[[], Any],
+    repeats: int,
+    setup: Optional[Callable[[], Any]] = None,
+) -> Dict[str, Any]:
+    """Run `func` `repeats` times and return the times in seconds.
+
+    `setup` is run (untimed) before each repeat. Anything
+    printed by `func` is discarded.
+    """
+    times = []
+
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+
+    return {
+        "times_s": times,
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "mean_s": statistics.mean(times),
+    }
+
+
+def time_import(
+    statement: str, budget_s: float, repeats: int
+) -> Dict[str, Any]:
+    """Time running `statement` in a new Python process.
+
+    The result includes the `budget_s` and whether the
+    median time is over budget.
+    """
+    result = time_function(
+        lambda: subprocess.run([sys.executable, "-c", statement], check=True),
+        repeats,
+    )
+    result["budget_s"] = budget_s
+    result["over_budget"] = result["median_s"] > budget_s
+
+    return result
+
+
+def run_benchmarks(
+    tmp_path: Path, project_settings: Dict[str, Any], repeats: int
+) -> Dict[str, Any]:
+    """Make a synthetic project in `tmp_path` and time each benchmark.
+
+    Returns
+    -------
+    A dictionary of the results of each benchmark, keyed by name. If a
+    benchmark cannot be run, its result is {"skipped": <reason>}.
+
+    """
+    local_path = tmp_path / "local" / PROJECT_NAME
+    central_path = tmp_path / "central" / PROJECT_NAME
+    central_path.mkdir(parents=True)
+
+    rclone_installed = rclone.check_rclone_with_default_call()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        project = DataShuttle(PROJECT_NAME, print_startup_message=False)
+
+        if rclone_installed:
+            project.make_config_file(
+                local_path.as_posix(),
+                central_path.as_posix(),
+                "local_filesystem",
+            )
+        else:
+            project.make_config_file(local_path.as_posix())
+
+    synthetic_project.make_synthetic_project(local_path, **project_settings)
+
+    sub_names = synthetic_project.get_sub_names(project_settings["num_subs"])
+    num_ses = project_settings["num_ses"]
+
+    results: Dict[str, Any] = {}
+
+    # Start-up time, e.g. of scripts that only validate a project.
+    for name, (statement, budget_s) in IMPORT_BENCHMARKS.items():
+        results[name] = time_import(statement, budget_s, repeats)
+
+    # Validation, without and then with the validation cache.
+    def delete_validation_cache():
+        validation_cache.get_cache_path(project.cfg).unlink(missing_ok=True)
+
+    def validate_project():
+        project.validate_project("rawdata", display_mode="print")
+
+    results["validate_project"] = time_function(
+        validate_project, repeats, setup=delete_validation_cache
+    )
+    results["validate_project_cached"] = time_function(
+        validate_project, repeats
+    )
+
+    # Get the next subject or session number.
+    results["get_next_sub"] = time_function(
+        lambda: project.get_next_sub("rawdata"), repeats
+    )
+    results["get_next_ses"] = time_function(
+        lambda: project.get_next_ses("rawdata", sub_names[-1]), repeats
+    )
+
+    # Building the list of files to upload, without transferring.
+    def build_transfer_list():
+        data_transfer.TransferData(
+            project.cfg,
+            "upload",
+            "rawdata",
+            "all",
+            "all",
+            "all",
+            overwrite_existing_files="never",
+            dry_run=True,
+        ).build_include_lists_for_each_shard()
+
+    results["build_transfer_list"] = time_function(
+        build_transfer_list, repeats
+    )
+
+    # Make the folder tree of the project in an empty top-level folder.
+    def delete_derivatives():
+        shutil.rmtree(local_path / "derivatives", ignore_errors=True)
+
+    sub_range = (
+        f"{sub_names[0]}{canonical_tags.tags('to')}{len(sub_names):03d}"
+    )
+    ses_range = f"ses-001{canonical_tags.tags('to')}{num_ses:03d}"
+
+    results["create_folders"] = time_function(
+        lambda: project.create_folders(
+            "derivatives",
+            sub_range,
+            ses_range,
+            list(project_settings["datatypes"]),
+        ),
+        repeats,
+        setup=delete_derivatives,
+    )
+    delete_derivatives()
+
+    # Search for the sessions of every subject in the middle half of the dates.
+    start_date = synthetic_project.DEFAULT_START_DATE
+    date_range = (
+        f"{(start_date + timedelta(days=num_ses // 4)).strftime('%Y%m%d')}"
+        f"{canonical_tags.tags('DATETO')}"
+        f"{(start_date + timedelta(days=(3 * num_ses) // 4)).strftime('%Y%m%d')}"
+    )
+    ses_search = f"ses-{canonical_tags.tags('*')}_{date_range}"
+
+    def search_date_range():
+        for sub in sub_names:
+            folders.search_with_tags(
+                project.cfg,
+                local_path / "rawdata",
+                "local",
+                [ses_search],
+                sub=sub,
+            )
+
+    results["search_with_tags_date_range"] = time_function(
+        search_date_range, repeats
+    )
+
+    # Upload the entire project to an empty central folder.
+    if rclone_installed:
+
+        def empty_central():
+            shutil.rmtree(central_path / "rawdata", ignore_errors=True)
+
+        results["upload_entire_project"] = time_function(
+            lambda: project.upload_entire_project(),
+            repeats,
+            setup=empty_central,
+        )
+    else:
+        results["upload_entire_project"] = {
+            "skipped": "rclone is not installed."
+        }
+
+    return results
+
+
+def compare_to_baseline(
+    results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> Dict[str, Any]:
+    """Compare the median time of each benchmark to a baseline run.
+
+    Returns
+    -------
+    A dictionary keyed by benchmark name, with the "ratio" of the median
+    time to the baseline median time and whether this is a "regression"
+    (slower than the baseline by more than `tolerance`).
+
+    """
+    comparison = {}
+
+    for name, result in results["benchmarks"].items():
+        baseline_result = baseline["benchmarks"].get(name)
+
+        if (
+            baseline_result is None
+            or "skipped" in result
+            or "skipped" in baseline_result
+        ):
+            continue
+
+        ratio = result["median_s"] / baseline_result["median_s"]
+
+        comparison[name] = {
+            "baseline_median_s": baseline_result["median_s"],
+            "median_s": result["median_s"],
+            "ratio": ratio,
+            "regression": ratio > 1 + tolerance,
+        }
+
+    return comparison
+
+
+def main() -> None:
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmark_results.json"),
+        help="Path to write the JSON results to.",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=None,
+        help="Path to the JSON results of a previous run to compare against.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Fraction slower than the baseline that is reported as a regression.",
+    )
+    parser.add_argument("--repeats", type=int, default=5)
+    synthetic_project.add_generator_arguments(parser)
+    args = parser.parse_args()
+
+    project_settings = {
+        "num_subs": args.num_subs,
+        "num_ses": args.num_ses,
+        "datatypes": args.datatypes,
+        "num_files": args.num_files,
+        "file_size": args.file_size,
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+
+        with mock.patch(
+            "datashuttle.configs.canonical_folders.get_datashuttle_path",
+            return_value=tmp_path / "datashuttle_configs",
+        ):
+            benchmarks = run_benchmarks(
+                tmp_path, project_settings, args.repeats
+            )
+
+    results: Dict[str, Any] = {
+        "version": RESULTS_VERSION,
+        "datashuttle_version": getattr(datashuttle, "__version__", None),
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "repeats": args.repeats,
+        "project": project_settings,
+        "benchmarks": benchmarks,
+    }
+
+    regressions = []
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())
+
+        if baseline.get("project") != project_settings:
+            print(
+                "Warning: the baseline was run on a different synthetic project."
+            )
+
+        results["comparison"] = compare_to_baseline(
+            results, baseline, args.tolerance
+        )
+        regressions = [
+            name
+            for name, compared in results["comparison"].items()
+            if compared["regression"]
+        ]
+
+    args.output.write_text(json.dumps(results, indent=4))
+
+    for name, result in benchmarks.items():
+        if "skipped" in result:
+            print(f"{name}: skipped ({result['skipped']})")
+        else:
+            line = f"{name}: median {result['median_s']:.4f} s"
+            if name in results.get("comparison", {}):
+                line += (
+                    f" ({results['comparison'][name]['ratio']:.2f}x baseline)"
+                )
+            print(line)
+
+    over_budget = [
+        name
+        for name, result in benchmarks.items()
+        if result.get("over_budget")
+    ]
+
+    if regressions:
+        print(f"Regressions against the baseline: {', '.join(regressions)}")
+
+    if over_budget:
+        print(f"Over the import time budget: {', '.join(over_budget)}")
+
+    if regressions or over_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
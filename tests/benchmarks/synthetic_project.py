@@ -0,0 +1,154 @@
+"""Generate large synthetic NeuroBlueprint projects for benchmarking.
+
+The generated project is fully determined by the arguments, so runs
+on different machines or commits benchmark the same project.
+
+Example
+-------
+python -m tests.benchmarks.synthetic_project path/to/my_project \
+    --num-subs 200 --num-ses 20 --datatypes behav ephys --file-size 1024
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+DEFAULT_START_DATE = datetime.date(2024, 1, 1)
+
+
+def make_synthetic_project(
+    project_path: Path,
+    num_subs: int = 10,
+    num_ses: int = 5,
+    datatypes: Sequence[str] = ("behav", "ephys"),
+    num_files: int = 2,
+    file_size: int = 1024,
+    top_level_folder: str = "rawdata",
+    start_date: datetime.date = DEFAULT_START_DATE,
+) -> Dict[str, int]:
+    """Write a synthetic NeuroBlueprint project to `project_path`.
+
+    Subjects are named sub-001, sub-002, ... and each has the sessions
+    ses-001_date-<date>, ses-002_date-<date>, ... where the date of each
+    session is one day after the last, starting at `start_date` (so
+    date-range searches can be benchmarked). Every session contains
+    the `datatypes` folders, each with `num_files` files.
+
+    Parameters
+    ----------
+    project_path
+        Path to the project folder (i.e. the `local_path` of the project).
+
+    num_subs
+        Number of subject folders.
+
+    num_ses
+        Number of session folders per subject.
+
+    datatypes
+        Datatype folders (e.g. "behav") made in each session.
+
+    num_files
+        Number of files in each datatype folder.
+
+    file_size
+        Size of each file, in bytes.
+
+    top_level_folder
+        "rawdata" or "derivatives".
+
+    start_date
+        Date of the first session of each subject.
+
+    Returns
+    -------
+    A dictionary with the number of "subs", "sessions",
+    "folders" and "files" made, and their total "bytes".
+
+    """
+    # Contents are deterministic, and not all zeros so
+    # that file systems do not store files sparsely.
+    contents = bytes(i % 251 for i in range(file_size))
+
+    sub_names = get_sub_names(num_subs)
+    ses_names = get_ses_names(num_ses, start_date)
+
+    num_folders = 0
+    num_files_made = 0
+
+    for sub in sub_names:
+        for ses in ses_names:
+            for datatype in datatypes:
+                datatype_path = (
+                    project_path / top_level_folder / sub / ses / datatype
+                )
+                datatype_path.mkdir(parents=True, exist_ok=True)
+                num_folders += 1
+
+                for file_idx in range(num_files):
+                    file_path = (
+                        datatype_path
+                        / f"{sub}_{ses.split('_')[0]}_{datatype}_{file_idx:03d}.bin"
+                    )
+                    file_path.write_bytes(contents)
+                    num_files_made += 1
+
+    return {
+        "subs": len(sub_names),
+        "sessions": len(sub_names) * len(ses_names),
+        "folders": num_folders,
+        "files": num_files_made,
+        "bytes": num_files_made * file_size,
+    }
+
+
+def get_sub_names(num_subs: int) -> List[str]:
+    """Return the subject names of a synthetic project."""
+    return [f"sub-{idx:03d}" for idx in range(1, num_subs + 1)]
+
+
+def get_ses_names(
+    num_ses: int, start_date: datetime.date = DEFAULT_START_DATE
+) -> List[str]:
+    """Return the session names of each subject in a synthetic project."""
+    return [
+        f"ses-{idx:03d}_date-"
+        f"{(start_date + datetime.timedelta(days=idx - 1)).strftime('%Y%m%d')}"
+        for idx in range(1, num_ses + 1)
+    ]
+
+
+def add_generator_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the arguments of `make_synthetic_project()` to a parser."""
+    parser.add_argument("--num-subs", type=int, default=10)
+    parser.add_argument("--num-ses", type=int, default=5)
+    parser.add_argument("--datatypes", nargs="+", default=["behav", "ephys"])
+    parser.add_argument("--num-files", type=int, default=2)
+    parser.add_argument(
+        "--file-size", type=int, default=1024, help="File size in bytes."
+    )
+
+
+def main() -> None:
+    """Make a synthetic project from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("project_path", type=Path)
+    add_generator_arguments(parser)
+    args = parser.parse_args()
+
+    counts = make_synthetic_project(
+        args.project_path,
+        num_subs=args.num_subs,
+        num_ses=args.num_ses,
+        datatypes=args.datatypes,
+        num_files=args.num_files,
+        file_size=args.file_size,
+    )
+    print(counts)
+
+
+if __name__ == "__main__":
+    main()
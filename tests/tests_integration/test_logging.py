@@ -3,6 +3,7 @@ import logging
 import os
 import platform
 import re
+from logging.handlers import QueueHandler
 from pathlib import Path
 
 import pytest
@@ -11,7 +12,7 @@ from filelock import FileLock
 from datashuttle.configs import canonical_configs
 from datashuttle.configs.canonical_configs import get_broad_datatypes
 from datashuttle.configs.canonical_tags import tags
-from datashuttle.utils import ds_logger
+from datashuttle.utils import ds_logger, utils
 from datashuttle.utils.custom_exceptions import (
     ConfigError,
     NeuroBlueprintError,
@@ -59,7 +60,11 @@ class TestLogging:
         logger = logging.getLogger("datashuttle")
         assert logger.propagate is False
         assert len(logger.handlers) == 1
-        assert isinstance(logger.handlers[0], logging.FileHandler)
+        assert isinstance(logger.handlers[0], QueueHandler)
+
+        file_handlers = ds_logger.get_file_handlers()
+        assert len(file_handlers) == 1
+        assert isinstance(file_handlers[0], logging.FileHandler)
 
     def test_shutdown_logger(self, tmp_path, teardown_logger):
         """Check the log handler remover indeed removes the handles."""
@@ -73,6 +78,73 @@ class TestLogging:
 
         assert len(logger.handlers) == 0
         assert ds_logger.logging_is_active() is False
+        assert ds_logger.get_file_handlers() == []
+
+    def test_queued_records_written_on_close(self, tmp_path):
+        """Check records logged through the queue are all
+        written to the log file, in order, once logging is closed.
+        """
+        ds_logger.start(tmp_path, "test-command", variables=[])
+
+        for idx in range(1000):
+            utils.log(f"Message {idx}")
+
+        ds_logger.close_log_filehandler()
+
+        log = test_utils.read_log_file(tmp_path)
+
+        messages = re.findall(r"Message (\d+)\n", log)
+        assert messages == [str(idx) for idx in range(1000)]
+        assert log.rstrip().endswith("Finished logging.")
+
+    def test_start_logging_lightweight(self, tmp_path, teardown_logger):
+        """Check "lightweight" logging writes a log file for each
+        command, with the same sections as `start`, while reusing
+        a single handler between commands.
+        """
+        handlers = []
+        for command_name in ["command-one", "command-two"]:
+            (tmp_path / command_name).mkdir()
+
+            ds_logger.start_lightweight(
+                tmp_path / command_name,
+                command_name,
+                local_vars={"sub_names": ["sub-001"]},
+                cfg_snapshot="{'local_path': 'my_path'}",
+            )
+            assert ds_logger.logging_is_active() is True
+
+            logger = logging.getLogger("datashuttle")
+            assert logger.propagate is False
+            assert len(logger.handlers) == 1
+            handlers.extend(ds_logger.get_file_handlers())
+
+            ds_logger.get_logger().info(f"Message for {command_name}")
+            ds_logger.close_log_filehandler()
+
+            assert ds_logger.logging_is_active() is False
+
+            log = test_utils.read_log_file(tmp_path / command_name)
+
+            for section in [
+                "LOG",
+                "GIT INFO",
+                "COMMAND LINE ARGUMENTS",
+                "PYTHON VERSION",
+                "VARIABLES",
+                "LOGGING",
+            ]:
+                assert f"**************  {section}  **************" in log
+
+            assert (
+                "VariablesState:\nlocals: {'sub_names': ['sub-001']}\n"
+                "cfg: {'local_path': 'my_path'}" in log
+            )
+            assert f"Starting logging for command {command_name}" in log
+            assert f"Message for {command_name}" in log
+            assert "Finished logging." in log
+
+        assert handlers[0] is handlers[1]
 
     def test_logging_an_error(self, project, teardown_logger):
         """Check that errors are caught and logged properly."""
@@ -242,6 +314,47 @@ class TestLogging:
             in log
         )
 
+    @pytest.mark.parametrize("project", ["local", "full"], indirect=True)
+    def test_lightweight_logging_mode(self, project):
+        """Check commands run in "lightweight" logging mode are logged,
+        and the logged configs are updated when the configs change.
+        """
+        assert project.get_logging_mode() == "full"
+
+        with pytest.raises(ValueError) as e:
+            project.set_logging_mode("verbose")
+        assert "`logging_mode` not recognised" in str(e.value)
+
+        project.set_logging_mode("lightweight")
+        assert project.get_logging_mode() == "lightweight"
+
+        project.create_folders("rawdata", "sub-001", "ses-001")
+
+        log = test_utils.read_log_file(project.cfg.logging_path)
+
+        assert "Starting logging for command create-folders" in log
+        assert "**************  GIT INFO  **************" in log
+        assert (
+            "VariablesState:\nlocals: {'top_level_folder': 'rawdata', 'sub_names': 'sub-001',"
+            in log
+        )
+        assert f"cfg: {str(project.cfg)}" in log
+        assert "Made folder at path:" in log
+
+        old_cfg = str(project.cfg)
+
+        project.update_config_file(
+            local_path=project.cfg["local_path"] / "new"
+        )
+        test_utils.delete_log_files(project.cfg.logging_path)
+
+        project.create_folders("rawdata", "sub-002")
+
+        log = test_utils.read_log_file(project.cfg.logging_path)
+
+        assert f"cfg: {str(project.cfg)}" in log
+        assert f"cfg: {old_cfg}" not in log
+
     @pytest.mark.parametrize("upload_or_download", ["upload", "download"])
     @pytest.mark.parametrize(
         "transfer_method", ["entire_project", "top_level_folder", "custom"]
@@ -297,8 +410,8 @@ class TestLogging:
         # 'remote' here is rclone terminology
         assert "Creating backend with remote" in log
         assert "Using config file from" in log
-        assert "--include" in log
-        assert "sub-11/ses-123/anat/**" in log
+        assert "--filter-from" in log
+        assert "+ /sub-11/ses-123/anat/**" in log
         assert f"/central/{TEST_PROJECT_NAME}/rawdata" in log
 
     @pytest.mark.parametrize("upload_or_download", ["upload", "download"])
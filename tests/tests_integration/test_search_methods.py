@@ -1,9 +1,13 @@
 import json
+import os
+import shutil
 import subprocess
+import time
 from pathlib import Path
 
 import pytest
 
+from datashuttle.utils import project_index
 from datashuttle.utils.folders import (
     search_central_via_connection,
     search_local_filesystem,
@@ -174,3 +178,314 @@ class TestSubSesSearches(BaseTest):
             assert files == ["rawdata.md"]
 
         assert len(captured_commands) == 1, "Expected exactly one rclone call"
+
+    @pytest.mark.parametrize("return_full_path", [True, False])
+    def test_project_snapshot_matches_search_methods(
+        self, project, monkeypatch, return_full_path
+    ):
+        """
+        Test that searches answered from a central project snapshot
+        match `search_local_filesystem` and that the central project is
+        listed with a single rclone call per top-level folder.
+        """
+        from datashuttle.utils import project_snapshot, rclone
+
+        central_path = project.get_central_path()
+
+        # fmt: off
+        for i in range(1, 4):
+            for path_ in (
+                Path(f"rawdata/sub-00{i}/ses-001/behav"),
+                Path(f"rawdata/sub-00{i}/ses-002_date-20250402/anat"),
+            ):
+                (central_path / path_).mkdir(parents=True)
+                test_utils.write_file(central_path / path_ / "file.md", contents="hello_world")
+                test_utils.write_file(central_path / path_.parent / "ses_file.md", contents="hello_world")
+                test_utils.write_file(central_path / path_.parent.parent / "sub_file.md", contents="hello_world")
+        test_utils.write_file(central_path / "rawdata" / "rawdata_file.md", contents="hello_world")
+        # fmt: on
+
+        # Use a local rclone remote in place of the central connection
+        call_rclone(r"config create local local nounc true")
+
+        monkeypatch.setattr(
+            project.cfg.rclone,
+            "get_rclone_config_name",
+            lambda *args, **kwargs: "local",
+        )
+        monkeypatch.setattr(
+            project.cfg,
+            "data",
+            {**project.cfg.data, "connection_method": "ssh"},
+        )
+        monkeypatch.setattr(rclone, "get_config_arg", lambda cfg: "")
+
+        rclone_commands = []
+
+        def mock_rclone_caller(cfg, command, pipe_std=False):
+            rclone_commands.append(command)
+            return call_rclone(command, pipe_std)
+
+        monkeypatch.setattr(
+            rclone, "call_rclone_for_central_connection", mock_rclone_caller
+        )
+
+        with project_snapshot.central_snapshots(project.cfg, ["rawdata"]):
+            assert len(rclone_commands) == 1
+            assert "-R --max-depth 3" in rclone_commands[0]
+
+            # fmt: off
+            for search_path, search_str in (
+                (central_path / "rawdata", "*"),
+                (central_path / "rawdata", "sub-*"),
+                (central_path / "rawdata" / "sub-002", "ses-*"),
+                (central_path / "rawdata" / "sub-002", "*"),
+                (central_path / "rawdata/sub-001/ses-002_date-20250402", "*"),
+                (central_path / "rawdata/sub-003/ses-001", "behav"),
+            ):
+            # fmt: on
+                snapshot_folders, snapshot_files = (
+                    search_central_via_connection(
+                        project.cfg,
+                        search_path,
+                        search_str,
+                        return_full_path=return_full_path,
+                    )
+                )
+                local_folders, local_files = search_local_filesystem(
+                    search_path, search_str, return_full_path=return_full_path
+                )
+                assert snapshot_folders == local_folders
+                assert snapshot_files == local_files
+
+            # Folders that do not exist are empty, searching beneath
+            # the session level falls back to rclone.
+            assert search_central_via_connection(
+                project.cfg, central_path / "rawdata" / "sub-999", "*"
+            ) == ([], [])
+            assert len(rclone_commands) == 1
+
+            search_central_via_connection(
+                project.cfg, central_path / "rawdata/sub-001/ses-001/behav", "*"
+            )
+            assert len(rclone_commands) == 2
+
+        assert project_snapshot._active_snapshots == {}
+
+    def test_project_snapshot_shared_by_contexts(self, project, monkeypatch):
+        """Check a snapshot used by overlapping `central_snapshots` contexts
+        (e.g. in different threads) is kept until the last context exits.
+        """
+        from datashuttle.utils import project_snapshot, rclone
+
+        central_path = project.get_central_path()
+
+        lsjson_calls = []
+
+        def mock_lsjson(cfg, search_path, max_depth=None):
+            lsjson_calls.append(search_path)
+            return subprocess.CompletedProcess(
+                "",
+                0,
+                stdout=json.dumps(
+                    [{"Path": "sub-001", "Name": "sub-001", "IsDir": True}]
+                ).encode(),
+                stderr=b"",
+            )
+
+        monkeypatch.setattr(
+            project.cfg,
+            "data",
+            {**project.cfg.data, "connection_method": "ssh"},
+        )
+        monkeypatch.setattr(
+            rclone, "call_rclone_lsjson_for_central_connection", mock_lsjson
+        )
+
+        first = project_snapshot.central_snapshots(project.cfg, ["rawdata"])
+        second = project_snapshot.central_snapshots(project.cfg, ["rawdata"])
+
+        first.__enter__()
+        second.__enter__()
+        assert len(lsjson_calls) == 1
+
+        first.__exit__(None, None, None)
+
+        assert search_central_via_connection(
+            project.cfg, central_path / "rawdata", "sub-*"
+        ) == (["sub-001"], [])
+        assert len(lsjson_calls) == 1
+
+        second.__exit__(None, None, None)
+
+        assert project_snapshot._active_snapshots == {}
+        assert project_snapshot._snapshot_users == {}
+
+    @pytest.mark.parametrize(
+        "returncode, stdout, stderr",
+        [
+            (1, b"", b"Failed to lsjson: couldn't connect SSH"),
+            (0, b'[{"Path": "sub-0', b""),
+        ],
+    )
+    def test_project_snapshot_failed_listing(
+        self, project, monkeypatch, returncode, stdout, stderr
+    ):
+        """Check a folder missing from central falls back to searching
+        central directly, but other failed listings raise.
+        """
+        from datashuttle.utils import project_snapshot, rclone
+
+        output = subprocess.CompletedProcess(
+            "", returncode, stdout=stdout, stderr=stderr
+        )
+        monkeypatch.setattr(
+            rclone,
+            "call_rclone_lsjson_for_central_connection",
+            lambda *args, **kwargs: output,
+        )
+
+        with pytest.raises(ConnectionError) as e:
+            project_snapshot.take_central_snapshot(project.cfg, "rawdata")
+
+        assert "Could not" in str(e.value)
+        assert stderr.decode() in str(e.value)
+
+        output.returncode = 3
+        output.stderr = b"error listing: directory not found"
+
+        assert (
+            project_snapshot.take_central_snapshot(project.cfg, "rawdata")
+            is None
+        )
+
+    @pytest.mark.parametrize("return_full_path", [True, False])
+    def test_project_index_matches_glob(self, project, return_full_path):
+        """
+        Check searches of the local `ProjectIndex` match the outputs of
+        searching with `Path.glob`, which was previously used to search the
+        local filesystem.
+        """
+        local_path = project.get_local_path()
+
+        # fmt: off
+        for path_ in [
+            "rawdata/sub-001/ses-001/behav",
+            "rawdata/sub-001/ses-002/ephys",
+            "rawdata/sub-002_id-a/ses-001",
+            "rawdata/extra_folder",
+        ]:
+            (local_path / path_).mkdir(parents=True)
+            test_utils.write_file(local_path / path_ / "file.md", "hello")
+            test_utils.write_file(local_path / path_ / ".hidden_file.md", "hello")
+
+        os.symlink(local_path / "rawdata" / "sub-001", local_path / "rawdata" / "sub-003")
+        # fmt: on
+
+        index = project_index.ProjectIndex()
+
+        for search_path, search_str in (
+            (local_path / "rawdata", "*"),
+            (local_path / "rawdata", "sub-*"),
+            (local_path / "rawdata", "sub-002_id-a"),
+            (local_path / "rawdata", "sub-00[12]*"),
+            (local_path / "rawdata" / "sub-001", "ses-*"),
+            (local_path / "rawdata" / "sub-001" / "ses-001" / "behav", "*"),
+            (local_path / "rawdata" / "sub-003" / "ses-001", "*"),
+            (local_path / "rawdata" / "extra_folder", "*.md"),
+        ):
+            index_folders, index_files = index.search(
+                search_path, search_str, return_full_path
+            )
+            glob_folders, glob_files = self.search_with_glob(
+                search_path, search_str, return_full_path
+            )
+            assert index_folders == glob_folders
+            assert index_files == glob_files
+
+        # Folders that do not exist, or are files
+        assert index.search(local_path / "rawdata" / "sub-999", "*") is None
+        assert (
+            index.search(local_path / "rawdata/extra_folder/file.md", "*")
+            is None
+        )
+
+        # Walking the index matches `os.walk`, including not following symlinks.
+        assert sorted(index.walk(local_path / "rawdata")) == [
+            (Path(root).as_posix(), sorted(dirs), sorted(files))
+            for root, dirs, files in sorted(os.walk(local_path / "rawdata"))
+        ]
+
+        # Folder levels are recorded.
+        assert index.get_level(local_path / "rawdata") == "top_level_folder"
+        assert index.get_level(local_path / "rawdata" / "sub-001") == "sub"
+        assert (
+            index.get_level(local_path / "rawdata" / "sub-001" / "ses-001")
+            == "ses"
+        )
+        assert (
+            index.get_level(local_path / "rawdata/sub-001/ses-001/behav")
+            == "datatype"
+        )
+        assert index.get_level(local_path / "rawdata/extra_folder") is None
+
+    def test_project_index_invalidated_on_folder_change(
+        self, project, monkeypatch
+    ):
+        """
+        Check a folder is read once and not again until its contents change
+        (which updates the folder modification time).
+        """
+        rawdata_path = project.get_local_path() / "rawdata"
+        (rawdata_path / "sub-001").mkdir(parents=True)
+
+        # Set the folder modification time in the past,
+        # so it is not within the 'racy' window.
+        old_time = time.time() - 100
+        os.utime(rawdata_path, (old_time, old_time))
+
+        num_scans = []
+        scandir = os.scandir
+
+        def count_scandir(path_):
+            num_scans.append(path_)
+            return scandir(path_)
+
+        monkeypatch.setattr(project_index.os, "scandir", count_scandir)
+
+        index = project_index.ProjectIndex()
+
+        for _ in range(3):
+            assert index.search(rawdata_path, "sub-*") == (["sub-001"], [])
+        assert len(num_scans) == 1
+
+        # Adding a folder changes the modification time
+        # and the folder is read again.
+        (rawdata_path / "sub-002").mkdir()
+        assert index.search(rawdata_path, "sub-*") == (
+            ["sub-001", "sub-002"],
+            [],
+        )
+        assert len(num_scans) == 2
+
+        # Recently modified folders are read on every search,
+        # in case they change again without the modification time changing.
+        index.search(rawdata_path, "sub-*")
+        assert len(num_scans) == 3
+
+        shutil.rmtree(rawdata_path)
+        assert index.search(rawdata_path, "sub-*") is None
+
+    def search_with_glob(self, search_path, search_prefix, return_full_path):
+        all_folder_names = []
+        all_filenames = []
+
+        for item in search_path.glob(search_prefix):
+            to_append = item if return_full_path else item.name
+
+            if item.is_dir():
+                all_folder_names.append(to_append)
+            elif item.is_file():
+                all_filenames.append(to_append)
+
+        return sorted(all_folder_names), sorted(all_filenames)
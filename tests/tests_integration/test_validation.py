@@ -1,12 +1,16 @@
 import os.path
 import re
 import shutil
+import time
 import warnings
 from datetime import datetime
 
 import pytest
 
-from datashuttle import validate_project_from_path
+from datashuttle import (
+    iter_validate_project_from_path,
+    validate_project_from_path,
+)
 from datashuttle.configs import canonical_folders, canonical_tags
 from datashuttle.utils import formatting, validation
 from datashuttle.utils.custom_exceptions import NeuroBlueprintError
@@ -988,6 +992,170 @@ class TestValidation(BaseTest):
             in str(e.value)
         )
 
+    @pytest.mark.parametrize("strict_mode", [True, False])
+    def test_validate_project_num_workers(self, project, strict_mode):
+        """Check validating subjects concurrently finds the same
+        errors, in the same order, as validating them one at a time.
+        """
+        project.create_folders(
+            "rawdata",
+            [f"sub-{i:03d}" for i in range(1, 21)],
+            ["ses-001", "ses-002"],
+            ["ephys"],
+        )
+        for bad_path in [
+            "sub-003/ses-01",
+            "sub-007/ses-001_date-2024",
+            "sub-011/bad_sesname",
+            "sub-015/ses-002/bad_datatype_name",
+            "sub-19",
+            "bad_sub_name",
+        ]:
+            os.makedirs(project.cfg["local_path"] / "rawdata" / bad_path)
+
+        error_messages = {}
+        for num_workers in [1, 4]:
+            error_messages[num_workers] = validate_project_from_path(
+                project.cfg["local_path"],
+                "rawdata",
+                display_mode="print",
+                strict_mode=strict_mode,
+                num_workers=num_workers,
+            )
+
+        assert len(error_messages[1]) > 0
+        assert error_messages[1] == error_messages[4]
+
+    @pytest.mark.parametrize("strict_mode", [True, False])
+    def test_validate_project_max_errors(self, project, strict_mode):
+        """Check streamed validation yields the same errors as
+        `validate_project_from_path`, and that `max_errors`
+        stops validation after the first errors.
+        """
+        project.create_folders(
+            "rawdata", ["sub-001", "sub-002"], ["ses-001"], ["ephys"]
+        )
+        for bad_path in [
+            "sub-001/ses-01",
+            "sub-002/ses-001_date-2024",
+            "sub-03",
+            "bad_sub_name",
+        ]:
+            os.makedirs(project.cfg["local_path"] / "rawdata" / bad_path)
+
+        error_messages = validate_project_from_path(
+            project.cfg["local_path"],
+            "rawdata",
+            display_mode="print",
+            strict_mode=strict_mode,
+        )
+        assert len(error_messages) > 2
+
+        issues = list(
+            iter_validate_project_from_path(
+                project.cfg["local_path"], "rawdata", strict_mode
+            )
+        )
+        assert [str(issue) for issue in issues] == error_messages
+        assert issues == validate_project_from_path(
+            project.cfg["local_path"],
+            "rawdata",
+            display_mode="print",
+            strict_mode=strict_mode,
+            return_issues=True,
+        )
+
+        for max_errors in [1, 2]:
+            assert (
+                validate_project_from_path(
+                    project.cfg["local_path"],
+                    "rawdata",
+                    display_mode="print",
+                    strict_mode=strict_mode,
+                    max_errors=max_errors,
+                )
+                == error_messages[:max_errors]
+            )
+
+        with pytest.raises(ValueError) as e:
+            list(
+                iter_validate_project_from_path(
+                    project.cfg["local_path"], max_errors=0
+                )
+            )
+        assert "`max_errors` must be a positive integer" in str(e.value)
+
+    @pytest.mark.parametrize("strict_mode", [True, False])
+    def test_validate_project_cache(self, mocker, project, strict_mode):
+        """Check subject results are cached, and only subjects that
+        have changed are validated again, with the same errors
+        as validating without the cache.
+        """
+        project.create_folders(
+            "rawdata",
+            ["sub-001", "sub-002", "sub-003"],
+            ["ses-001", "ses-002"],
+            ["ephys"],
+        )
+        rawdata_path = project.cfg["local_path"] / "rawdata"
+
+        def make_folders_old():
+            # Recently modified folders are always validated again, so make
+            # them old. Their new mtime differs from that of any previous call.
+            now_ns = time.time_ns()
+            old_ns = now_ns - 60_000_000_000
+            for folder, _, _ in os.walk(rawdata_path):
+                if os.stat(folder).st_mtime_ns > now_ns - 30_000_000_000:
+                    os.utime(folder, ns=(old_ns, old_ns))
+
+        spy = mocker.spy(validation, "validate_subject")
+
+        def validate():
+            spy.reset_mock()
+            error_messages = project.validate_project(
+                "rawdata", "print", strict_mode=strict_mode
+            )
+            num_validated = spy.call_count
+
+            assert error_messages == validation.validate_project(
+                project.cfg,
+                ["rawdata"],
+                display_mode="print",
+                strict_mode=strict_mode,
+            )
+            return error_messages, num_validated
+
+        make_folders_old()
+        assert validate() == ([], 3)
+        assert (
+            project.cfg.project_metadata_path / "validation_cache.json"
+        ).is_file()
+
+        # Nothing has changed, use the cache.
+        assert validate() == ([], 0)
+
+        # Add a bad session, only this subject is validated again.
+        os.makedirs(rawdata_path / "sub-002" / "ses-03")
+        make_folders_old()
+
+        error_messages, num_validated = validate()
+        assert num_validated == 1
+        assert len(error_messages) == 1
+        assert "VALUE_LENGTH" in error_messages[0]
+
+        # Changing the settings discards the cache.
+        _, num_validated = validate()
+        assert num_validated == 0
+
+        project.validate_project(
+            "rawdata",
+            "print",
+            strict_mode=strict_mode,
+            allow_letters_in_sub_ses_values=True,
+        )
+        _, num_validated = validate()
+        assert num_validated == 3
+
     @pytest.mark.parametrize("top_level_folder", ["rawdata", "derivatives"])
     def test_check_high_level_project_structure(
         self, project, top_level_folder
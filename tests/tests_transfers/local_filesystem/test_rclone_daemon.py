@@ -0,0 +1,335 @@
+import json
+import os
+import time
+
+import pytest
+
+from datashuttle.utils import project_snapshot, rclone, rclone_daemon
+from datashuttle.utils.folders import search_central_via_connection
+
+from ... import test_utils
+from ...base import BaseTest
+
+
+class TestRcloneDaemon(BaseTest):
+    """Test running rclone calls through a persistent `rclone rcd`.
+
+    These tests use a local filesystem connection, which is set up
+    as an rclone "local" remote. They check the outputs when using
+    the daemon match those of the command-line calls.
+    """
+
+    @pytest.fixture(scope="function")
+    def daemon_project(self, project):
+        project.start_rclone_daemon()
+        yield project
+        project.stop_rclone_daemon()
+
+    def block_rclone_command_line_calls(self, monkeypatch):
+        """Error if rclone is called through the command line, to ensure
+        the daemon is used.
+        """
+
+        def raise_error(*args, **kwargs):
+            raise AssertionError("rclone command-line call was made.")
+
+        for function_name in [
+            "call_rclone",
+            "call_rclone_for_central_connection",
+            "call_rclone_through_script_for_central_connection",
+        ]:
+            monkeypatch.setattr(rclone, function_name, raise_error)
+
+    def test_daemon_start_and_stop(self, project):
+        assert rclone_daemon.get_active_daemon(project.cfg) is None
+
+        project.start_rclone_daemon()
+
+        daemon = rclone_daemon.get_active_daemon(project.cfg)
+        assert daemon.is_running()
+        assert daemon.call("core/version")["version"]
+
+        process = daemon.process
+        project.stop_rclone_daemon()
+
+        assert process.poll() is not None
+        assert rclone_daemon.get_active_daemon(project.cfg) is None
+
+    def test_daemon_credentials_not_in_command(self, daemon_project):
+        """Check the remote-control credentials are not passed as
+        arguments, which are visible to all users (e.g. with `ps`).
+        """
+        daemon = rclone_daemon.get_active_daemon(daemon_project.cfg)
+
+        command = " ".join(daemon.process.args)
+
+        assert daemon._password not in command
+        assert daemon._user not in command
+        assert daemon.call("core/version")["version"]
+
+    def test_daemon_restarts_on_config_change(self, daemon_project):
+        daemon = rclone_daemon.get_active_daemon(daemon_project.cfg)
+
+        daemon.config_filepath = daemon_project.cfg["local_path"] / "cfg.conf"
+        test_utils.write_file(daemon.config_filepath, "")
+
+        new_daemon = rclone.get_rclone_daemon(daemon_project.cfg)
+
+        assert new_daemon is not daemon
+        assert new_daemon.is_running()
+        assert not daemon.is_running()
+
+    @pytest.mark.parametrize("max_depth", [None, 3])
+    def test_daemon_lsjson_matches_command_line(
+        self, daemon_project, max_depth
+    ):
+        project = daemon_project
+        subs, sessions = test_utils.get_default_sub_sessions_to_test()
+
+        test_utils.make_local_folders_with_files_in(
+            project, "rawdata", subs, sessions, ["behav", "ephys"]
+        )
+        search_path = (project.get_local_path() / "rawdata").as_posix()
+
+        daemon_output = rclone.call_rclone_lsjson_for_central_connection(
+            project.cfg, search_path, max_depth
+        )
+
+        recurse_arg = (
+            "" if max_depth is None else f"-R --max-depth {max_depth}"
+        )
+        cli_output = rclone.call_rclone(
+            f"lsjson {project.cfg.rclone.get_rclone_config_name()}:"
+            f'"{search_path}" {recurse_arg}',
+            pipe_std=True,
+        )
+
+        assert daemon_output.returncode == cli_output.returncode == 0
+        assert self.lsjson_paths(daemon_output) == self.lsjson_paths(
+            cli_output
+        )
+
+        # A folder that does not exist
+        output = rclone.call_rclone_lsjson_for_central_connection(
+            project.cfg, f"{search_path}/sub-999"
+        )
+        assert output.returncode != 0
+        assert "directory not found" in output.stderr.decode("utf-8")
+
+    def test_daemon_search_and_snapshot(self, daemon_project, monkeypatch):
+        """Check central searches are run through the daemon, both directly
+        and when taking project snapshots.
+        """
+        project = daemon_project
+
+        test_utils.make_local_folders_with_files_in(
+            project, "rawdata", ["sub-001", "sub-002"], ["ses-001"], "behav"
+        )
+        rawdata_path = project.get_local_path() / "rawdata"
+
+        self.block_rclone_command_line_calls(monkeypatch)
+
+        folder_names, _ = search_central_via_connection(
+            project.cfg, rawdata_path, "sub-*"
+        )
+        assert folder_names == ["sub-001", "sub-002"]
+
+        snapshot = project_snapshot.ProjectSnapshot.from_lsjson_output(
+            rawdata_path.as_posix(),
+            self.lsjson(project.cfg, rawdata_path, max_depth=3),
+        )
+        folder_names, _ = snapshot.search(rawdata_path / "sub-002", "ses-*")
+        assert folder_names == ["ses-001"]
+
+    def test_daemon_transfer(self, daemon_project, monkeypatch):
+        project = daemon_project
+        subs, sessions = test_utils.get_default_sub_sessions_to_test()
+
+        test_utils.make_local_folders_with_files_in(
+            project, "rawdata", subs, sessions, ["behav", "ephys"]
+        )
+        local_files = self.get_relative_filepaths(
+            project.get_local_path() / "rawdata"
+        )
+
+        self.block_rclone_command_line_calls(monkeypatch)
+
+        # Dry run, no files are transferred
+        project.upload_custom("rawdata", "all", "all", "all", dry_run=True)
+        assert not (project.get_central_path() / "rawdata").exists()
+
+        # Transfer a single subject
+        transfer_output = project.upload_custom(
+            "rawdata", subs[0], "all", "behav"
+        )
+        assert transfer_output["num_transferred"]["rawdata"] == len(sessions)
+        assert not any(transfer_output["errors"]["messages"])
+
+        central_files = self.get_relative_filepaths(
+            project.get_central_path() / "rawdata"
+        )
+        assert central_files == sorted(
+            path_
+            for path_ in local_files
+            if path_.startswith(f"{subs[0]}/") and "/behav/" in path_
+        )
+
+        # Transfer everything else
+        transfer_output = project.upload_rawdata()
+        assert transfer_output["num_transferred"]["rawdata"] == len(
+            local_files
+        ) - len(central_files)
+
+        assert (
+            self.get_relative_filepaths(project.get_central_path() / "rawdata")
+            == local_files
+        )
+
+    @pytest.mark.parametrize(
+        "overwrite_existing_files", ["never", "always", "if_source_newer"]
+    )
+    def test_daemon_transfer_overwrite_options(
+        self, daemon_project, overwrite_existing_files
+    ):
+        project = daemon_project
+        local_file = project.get_local_path() / "rawdata" / "sub-001" / "a.txt"
+        central_file = (
+            project.get_central_path() / "rawdata" / "sub-001" / "a.txt"
+        )
+        test_utils.write_file(local_file, "local")
+        test_utils.write_file(central_file, "central-newer")
+
+        # Make the central file newer than the local file
+        os.utime(local_file, (time.time() - 100, time.time() - 100))
+
+        project.upload_rawdata(
+            overwrite_existing_files=overwrite_existing_files
+        )
+
+        if overwrite_existing_files == "always":
+            assert test_utils.read_file(central_file) == ["local"]
+        else:
+            assert test_utils.read_file(central_file) == ["central-newer"]
+
+    def test_daemon_transfer_errors(self, daemon_project):
+        """Check errors in individual files are reported as with
+        the command-line call. An error is caused by making the
+        target folder on central a file.
+        """
+        project = daemon_project
+        local_file = project.get_local_path() / "rawdata" / "sub-001" / "a.txt"
+        test_utils.write_file(local_file, "text")
+        test_utils.write_file(
+            project.get_central_path() / "rawdata" / "sub-001", "not a folder"
+        )
+
+        daemon_output = project.upload_rawdata()
+
+        project.stop_rclone_daemon()
+
+        cli_output = project.upload_rawdata()
+
+        assert (
+            daemon_output["errors"]["file_names"]
+            == cli_output["errors"]["file_names"]
+            == ["rawdata/sub-001/a.txt"]
+        )
+        assert (
+            daemon_output["num_transferred"] == cli_output["num_transferred"]
+        )
+
+    def test_daemon_transfer_many_files(self, daemon_project):
+        """rclone lists only the most recent completed transfers
+        (100 by default), check the transferred files are not
+        reported from a partial list and errors are not dropped.
+        """
+        project = daemon_project
+        num_files = 150
+
+        for i in range(num_files):
+            test_utils.write_file(
+                project.get_local_path()
+                / "rawdata"
+                / "sub-001"
+                / f"file_{i}.txt",
+                "text",
+            )
+        test_utils.write_file(
+            project.get_local_path() / "rawdata" / "sub-002" / "a.txt", "text"
+        )
+        test_utils.write_file(
+            project.get_central_path() / "rawdata" / "sub-002", "not a folder"
+        )
+
+        transfer_output = project.upload_rawdata()
+
+        assert transfer_output["transferred_file_names"] is None
+        assert transfer_output.errors_detected()
+
+        assert (
+            len(
+                self.get_relative_filepaths(
+                    project.get_central_path() / "rawdata" / "sub-001"
+                )
+            )
+            == num_files
+        )
+
+    def test_daemon_check_matches_command_line(self, daemon_project):
+        project = daemon_project
+        local = project.get_local_path()
+        central = project.get_central_path()
+
+        test_utils.write_file(local / "rawdata" / "local_only.txt", "a")
+        test_utils.write_file(central / "rawdata" / "central_only.txt", "b")
+        test_utils.write_file(local / "rawdata" / "same.txt", "c")
+        test_utils.write_file(central / "rawdata" / "same.txt", "c")
+        test_utils.write_file(local / "rawdata" / "different.txt", "d")
+        test_utils.write_file(central / "rawdata" / "different.txt", "dd")
+
+        daemon_diffs = rclone.get_local_and_central_file_differences(
+            project.cfg, ["rawdata"]
+        )
+
+        project.stop_rclone_daemon()
+
+        cli_diffs = rclone.get_local_and_central_file_differences(
+            project.cfg, ["rawdata"]
+        )
+
+        assert daemon_diffs == cli_diffs
+        assert daemon_diffs["local_only"] == ["rawdata/local_only.txt"]
+        assert daemon_diffs["central_only"] == ["rawdata/central_only.txt"]
+
+    def test_daemon_check_connection(self, daemon_project, monkeypatch):
+        project = daemon_project
+        project.get_central_path().mkdir(parents=True, exist_ok=True)
+
+        self.block_rclone_command_line_calls(monkeypatch)
+
+        rclone.check_successful_connection_and_raise_error_on_fail(project.cfg)
+
+        assert list(project.get_central_path().glob("*_temp.txt")) == []
+
+    # -------------------------------------------------------------------------
+    # Utils
+    # -------------------------------------------------------------------------
+
+    def lsjson(self, cfg, path_, max_depth=None):
+        output = rclone.call_rclone_lsjson_for_central_connection(
+            cfg, path_.as_posix(), max_depth
+        )
+        return json.loads(output.stdout)
+
+    def lsjson_paths(self, output):
+        return sorted(
+            (entry["Path"], entry["IsDir"])
+            for entry in json.loads(output.stdout)
+        )
+
+    def get_relative_filepaths(self, base_path):
+        return sorted(
+            path_.relative_to(base_path).as_posix()
+            for path_ in base_path.rglob("*")
+            if path_.is_file()
+        )
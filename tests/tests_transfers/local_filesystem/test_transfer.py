@@ -667,7 +667,7 @@ class TestFileTransfer(BaseTest):
         that contains information about any errors that were encountered
         during transfer.
         """
-        # Monkeypatch the error-parsing function so it returns
+        # Monkeypatch the transfer function so it returns
         # predictable values.
         import datashuttle
 
@@ -684,15 +684,15 @@ class TestFileTransfer(BaseTest):
             }
             return transfer_output
 
-        def monkeypatch_parse_output(top_level_folder, b):
-            stdout = "stdout"
-            stderr = "stderr"
-            return stdout, stderr, test_errors(top_level_folder)
+        def monkeypatch_transfer_data(
+            cfg, upload_or_download, top_level_folder, *args
+        ):
+            return 0, test_errors(top_level_folder)
 
         monkeypatch.setattr(
             datashuttle.utils.rclone,
-            "parse_rclone_copy_output",
-            monkeypatch_parse_output,
+            "transfer_data",
+            monkeypatch_transfer_data,
         )
 
         # Generate some test files so the transfer runs properly
@@ -791,6 +791,111 @@ class TestFileTransfer(BaseTest):
 
         return path_earlier, path_later
 
+    @pytest.mark.parametrize("parallel_shards", [1, 2, 3, 100])
+    def test_parallel_shards(self, project, parallel_shards, capsys):
+        """Check transfers split into shards transfer all files, and the
+        outputs of each shard are merged. The number of rclone calls is
+        capped by the number of subjects (and non-subject items).
+        """
+        subs = ["sub-001", "sub-002", "sub-003", "sub-004"]
+
+        test_utils.make_local_folders_with_files_in(
+            project,
+            "rawdata",
+            subs,
+            ["ses-001", "ses-002"],
+            ["behav", "ephys"],
+        )
+        test_utils.write_file(
+            project.cfg["local_path"] / "rawdata" / "a_file.txt", "hello"
+        )
+
+        test_utils.clear_capsys(capsys)
+
+        transfer_output = project.upload_custom(
+            "rawdata", "all", "all", "all", parallel_shards=parallel_shards
+        )
+
+        # 4 subjects * 2 sessions * 2 datatypes placeholder files, and `a_file.txt`
+        assert transfer_output["num_transferred"]["rawdata"] == 17
+        assert not transfer_output.errors_detected()
+
+        local_files = sorted(
+            path_.relative_to(project.cfg["local_path"])
+            for path_ in (project.cfg["local_path"] / "rawdata").rglob("*")
+        )
+        central_files = sorted(
+            path_.relative_to(project.cfg["central_path"])
+            for path_ in (project.cfg["central_path"] / "rawdata").rglob("*")
+        )
+        assert local_files == central_files
+
+        log = capsys.readouterr().out
+
+        expected_num_shards = min(parallel_shards, len(subs) + 1)
+        assert log.count("**************  RCLONE OUTPUT  **************") == (
+            expected_num_shards
+        )
+
+        if parallel_shards == 1:
+            assert "--transfers" not in log
+        else:
+            assert "--transfers" in log
+
+    @pytest.mark.parametrize("parallel_shards", [1, 2])
+    def test_progress_callback(
+        self, project, parallel_shards, capsys, monkeypatch
+    ):
+        """Check the progress callback is called with rclone's transfer stats
+        while the transfer runs, and the final progress matches the
+        transferred files.
+        """
+        from datashuttle.utils import data_transfer
+
+        subs = ["sub-001", "sub-002"]
+        test_utils.make_local_folders_with_files_in(
+            project, "rawdata", subs, ["ses-001"], ["behav"]
+        )
+        for sub in subs:
+            (
+                project.get_local_path()
+                / "rawdata"
+                / sub
+                / "ses-001"
+                / "behav"
+                / "large_file.bin"
+            ).write_bytes(os.urandom(512 * 1024))
+
+        # Limit the transfer speed (rclone reads flags from the environment)
+        # so the transfer takes long enough to output stats during it.
+        monkeypatch.setenv("RCLONE_BWLIMIT", "512K")
+        monkeypatch.setattr(data_transfer, "PROGRESS_STATS_INTERVAL", "200ms")
+
+        progress = []
+
+        test_utils.clear_capsys(capsys)
+        transfer_output = project.upload_rawdata(
+            parallel_shards=parallel_shards, progress_callback=progress.append
+        )
+
+        log = capsys.readouterr().out
+        assert "--stats" in log
+        assert "--progress" not in log
+
+        assert transfer_output["num_transferred"]["rawdata"] == 4
+
+        intermediate_progress = [
+            progress_
+            for progress_ in progress
+            if 0 < progress_.bytes_transferred < progress_.total_bytes
+        ]
+        assert len(intermediate_progress) > 1
+
+        assert progress[-1].top_level_folder == "rawdata"
+        assert progress[-1].files_transferred == 4
+        assert progress[-1].total_files == 4
+        assert progress[-1].bytes_transferred == progress[-1].total_bytes
+
     @pytest.mark.parametrize("top_level_folder", ["rawdata", "derivatives"])
     @pytest.mark.parametrize(
         "transfer_method", ["entire_project", "top_level_folder", "custom"]
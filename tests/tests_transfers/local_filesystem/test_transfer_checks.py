@@ -4,6 +4,7 @@ from pathlib import Path
 
 import pytest
 
+from datashuttle.utils import transfer_diff_cache
 from datashuttle.utils.rclone import get_local_and_central_file_differences
 
 from ... import test_utils
@@ -90,6 +91,62 @@ class TestTransferChecks(BaseTest):
                 else:
                     assert path_ not in results_paths
 
+    def test_cached_transfer_diffs(self, project):
+        """Test the cached transfer differences match a full `rclone check`,
+        and are updated when files change on local or central, or are transferred.
+        """
+        local = project.cfg["local_path"]
+        central = project.cfg["central_path"]
+
+        for path_, type_ in self.get_folder_structure("rawdata"):
+            if type_ != "central_only":
+                test_utils.write_file(local / path_)
+            if type_ != "local_only":
+                test_utils.write_file(central / path_)
+            if type_ == "newer_in_local":
+                test_utils.write_file(local / path_, "new text", append=True)
+            elif type_ == "newer_in_central":
+                test_utils.write_file(central / path_, "new text", append=True)
+
+        def check_matches_rclone_check():
+            cached_results = transfer_diff_cache.get_transfer_diffs(
+                project.cfg, ["rawdata"]
+            )
+            results = get_local_and_central_file_differences(
+                project.cfg, ["rawdata"]
+            )
+            for key in cached_results:
+                assert sorted(cached_results[key]) == sorted(results[key])
+            return cached_results
+
+        check_matches_rclone_check()
+        assert transfer_diff_cache.get_cache_path(project.cfg).is_file()
+
+        # Change a file that was the same on local and on central.
+        test_utils.write_file(
+            local / "rawdata/sub-001/ses-001/behav/same_2.txt",
+            "new text",
+            append=True,
+        )
+        test_utils.write_file(
+            central / "rawdata/sub-002/ses-002/anat/same_6.txt",
+            "new text",
+            append=True,
+        )
+        cached_results = check_matches_rclone_check()
+        assert (
+            "rawdata/sub-001/ses-001/behav/same_2.txt"
+            in cached_results["different"]
+        )
+
+        # Transferring updates the cache with the copied files.
+        project.upload_custom("rawdata", "sub-001", "ses-001", "all", "always")
+        cached_results = check_matches_rclone_check()
+        assert (
+            "rawdata/sub-001/ses-001/ephys/local_only_1.txt"
+            in cached_results["same"]
+        )
+
     def test_datashuttle_log_path_assumption(self, project):
         """
         Rclone check must exclude logs, and rclone requires
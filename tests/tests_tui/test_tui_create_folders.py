@@ -1,3 +1,4 @@
+import os
 import re
 
 import pytest
@@ -8,6 +9,7 @@ from datashuttle.tui.screens.create_folder_settings import (
     CreateFoldersSettingsScreen,
 )
 from datashuttle.tui.screens.project_manager import ProjectManagerScreen
+from datashuttle.utils import validation
 
 from .. import test_utils
 from .tui_base import TuiBase
@@ -645,6 +647,57 @@ class TestTuiCreateFolders(TuiBase):
                 .plain
             )
 
+    @pytest.mark.asyncio
+    async def test_validation_uses_names_snapshot(
+        self, setup_project_paths, mocker
+    ):
+        """Check live validation of the inputs does not search the project
+        on every key press, but the project is searched again once the
+        project changes, so errors are up to date.
+        """
+        tmp_config_path, tmp_path, project_name = setup_project_paths.values()
+
+        app = TuiApp()
+        async with app.run_test(size=self.tui_size()) as pilot:
+            await self.check_and_click_onto_existing_project(
+                pilot, project_name
+            )
+            project = pilot.app.screen.interface.project
+
+            project.create_folders("rawdata", ["sub-001", "sub-002"])
+
+            # Set an old mtime, as recently modified
+            # folders are always searched again.
+            rawdata_path = project.cfg["local_path"] / "rawdata"
+            os.utime(rawdata_path, ns=(0, 0))
+
+            spy_get_paths = mocker.spy(
+                validation.getters, "get_all_sub_and_ses_paths"
+            )
+
+            await self.fill_input(
+                pilot, "#create_folders_subject_input", "sub-003"
+            )
+            assert spy_get_paths.call_count == 1
+
+            # A subject created outside of the tab is found
+            # as it changes the top-level folder.
+            (rawdata_path / "sub-003_id-abc").mkdir()
+            os.utime(rawdata_path, ns=(10**9, 10**9))
+
+            await self.fill_input(
+                pilot, "#create_folders_subject_input", "sub-003"
+            )
+            assert (
+                "DUPLICATE_NAME"
+                in pilot.app.screen.query_one(
+                    "#create_folders_subject_input"
+                ).tooltip
+            )
+            assert spy_get_paths.call_count == 2
+
+            await pilot.pause()
+
     # -------------------------------------------------------------------------
     # Test Top Level Folders
     # -------------------------------------------------------------------------
@@ -1,6 +1,7 @@
 import pytest
 
 from datashuttle.tui.app import TuiApp
+from datashuttle.utils import rclone_daemon
 
 from .tui_base import TuiBase
 
@@ -106,3 +107,54 @@ class TestTuiSettings(TuiBase):
             assert transfer_tab.query_one("#transfer_legend").visible is True
 
             await pilot.pause()
+
+    @pytest.mark.asyncio
+    async def test_use_rclone_daemon(self, setup_project_paths):
+        """Check that when the 'persistent rclone connection' option is
+        on, an rclone daemon is run while a project is open and stopped
+        when returning to the main menu.
+        """
+        tmp_config_path, tmp_path, project_name = setup_project_paths.values()
+
+        app = TuiApp()
+        async with app.run_test(size=self.tui_size()) as pilot:
+            assert (
+                pilot.app.load_global_settings()["use_rclone_daemon"] is False
+            )
+
+            await self.check_and_click_onto_existing_project(
+                pilot, project_name
+            )
+            assert pilot.app.screen.interface.rclone_daemon_started is False
+            await self.scroll_to_click_pause(pilot, "#all_main_menu_buttons")
+
+            # Turn on the persistent rclone connection.
+            await self.scroll_to_click_pause(
+                pilot, "#mainwindow_settings_button"
+            )
+            await self.scroll_to_click_pause(
+                pilot, "#use_rclone_daemon_checkbox"
+            )
+            assert (
+                pilot.app.load_global_settings()["use_rclone_daemon"] is True
+            )
+            await self.scroll_to_click_pause(pilot, "#all_main_menu_buttons")
+
+            await self.check_and_click_onto_existing_project(
+                pilot, project_name
+            )
+            interface = pilot.app.screen.interface
+            cfg = interface.get_configs()
+
+            assert interface.rclone_daemon_started is True
+            daemon = rclone_daemon.get_active_daemon(cfg)
+            assert daemon.is_running()
+
+            # The daemon is stopped when the project is closed.
+            await self.scroll_to_click_pause(pilot, "#all_main_menu_buttons")
+
+            assert interface.rclone_daemon_started is False
+            assert not daemon.is_running()
+            assert rclone_daemon.get_active_daemon(cfg) is None
+
+            await pilot.pause()
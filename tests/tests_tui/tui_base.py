@@ -8,6 +8,7 @@ from datashuttle.configs import canonical_configs
 from datashuttle.tui.app import TuiApp
 from datashuttle.tui.screens.project_manager import ProjectManagerScreen
 from datashuttle.tui.screens.project_selector import ProjectSelectorScreen
+from datashuttle.tui.tabs.create_folders import CreateFoldersTab
 
 from .. import test_utils
 
@@ -88,10 +89,14 @@ class TuiBase:
         )
 
     async def fill_input(self, pilot, id, value):
-        """Fill and input of `id` with `value`."""
+        """Fill and input of `id` with `value`.
+
+        Waits for the (debounced) validation of Create tab inputs.
+        """
         await self.scroll_to_click_pause(pilot, id)
         pilot.app.screen.query_one(id).value = ""
         await pilot.press(*value)
+        await pilot.pause(CreateFoldersTab.VALIDATION_DEBOUNCE_S * 2)
         await pilot.pause()
 
     async def setup_existing_project_create_tab_filled_sub_and_ses(
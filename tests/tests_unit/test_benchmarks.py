@@ -0,0 +1,85 @@
+from ..benchmarks import run_benchmarks, synthetic_project
+
+
+class TestBenchmarks:
+    def test_make_synthetic_project(self, tmp_path):
+        """Check the synthetic project used for benchmarking
+        is the same every time it is made.
+        """
+        counts = synthetic_project.make_synthetic_project(
+            tmp_path / "project_1", num_subs=3, num_ses=2, file_size=10
+        )
+        synthetic_project.make_synthetic_project(
+            tmp_path / "project_2", num_subs=3, num_ses=2, file_size=10
+        )
+
+        assert counts == {
+            "subs": 3,
+            "sessions": 6,
+            "folders": 12,
+            "files": 24,
+            "bytes": 240,
+        }
+
+        files_1, files_2 = [
+            sorted(
+                (
+                    path_.relative_to(tmp_path / project).as_posix(),
+                    path_.read_bytes(),
+                )
+                for path_ in (tmp_path / project).rglob("*")
+                if path_.is_file()
+            )
+            for project in ["project_1", "project_2"]
+        ]
+        assert files_1 == files_2
+        assert len(files_1) == 24
+
+        assert (
+            tmp_path
+            / "project_1"
+            / "rawdata"
+            / "sub-003"
+            / "ses-002_date-20240102"
+        ).is_dir()
+
+    def test_compare_to_baseline(self):
+        """Check benchmarks slower than the baseline by more than
+        the tolerance are reported as regressions.
+        """
+        baseline = {
+            "benchmarks": {
+                "faster": {"median_s": 1.0},
+                "slower": {"median_s": 1.0},
+                "skipped": {"skipped": "rclone is not installed."},
+            }
+        }
+        results = {
+            "benchmarks": {
+                "faster": {"median_s": 0.5},
+                "slower": {"median_s": 1.5},
+                "skipped": {"median_s": 1.0},
+                "new": {"median_s": 1.0},
+            }
+        }
+
+        comparison = run_benchmarks.compare_to_baseline(
+            results, baseline, tolerance=0.2
+        )
+
+        assert list(comparison) == ["faster", "slower"]
+        assert comparison["faster"]["ratio"] == 0.5
+        assert comparison["faster"]["regression"] is False
+        assert comparison["slower"]["regression"] is True
+
+    def test_time_import(self):
+        """Check import times are compared to their budget."""
+        result = run_benchmarks.time_import("pass", budget_s=60, repeats=1)
+
+        assert len(result["times_s"]) == 1
+        assert result["budget_s"] == 60
+        assert result["over_budget"] is False
+
+        result = run_benchmarks.time_import("pass", budget_s=0, repeats=1)
+
+        assert result["over_budget"] is True
@@ -0,0 +1,67 @@
+import subprocess
+import sys
+
+import pytest
+
+# Slow to import, and so only imported when used.
+HEAVY_MODULES = [
+    "fancylog",
+    "paramiko",
+    "rich",
+    "textual",
+    "typeguard",
+    "yaml",
+]
+
+
+def get_modules_imported_by(statement: str) -> set:
+    """Return the modules imported by running `statement`
+    in a new Python process.
+    """
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"{statement}; import sys; print(' '.join(sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(output.stdout.split())
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import datashuttle",
+        "from datashuttle import validate_project_from_path",
+    ],
+)
+def test_heavy_modules_are_not_imported(statement):
+    """Check `import datashuttle` and API-only use do not
+    import dependencies that are slow to import.
+    """
+    imported = get_modules_imported_by(statement)
+
+    assert not imported & set(HEAVY_MODULES)
+
+    if statement == "import datashuttle":
+        assert "datashuttle.datashuttle_class" not in imported
+
+
+def test_lazy_public_api():
+    """Check the public API and version are available
+    when imported on first use.
+    """
+    import datashuttle
+    from datashuttle.datashuttle_class import DataShuttle
+    from datashuttle.datashuttle_functions import validate_project_from_path
+
+    assert datashuttle.DataShuttle is DataShuttle
+    assert datashuttle.validate_project_from_path is validate_project_from_path
+    assert set(datashuttle.__all__) <= set(dir(datashuttle))
+    assert isinstance(datashuttle.__version__, str)
+
+    with pytest.raises(AttributeError):
+        datashuttle.not_an_attribute
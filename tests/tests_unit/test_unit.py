@@ -1,10 +1,35 @@
+import json
+import os
 import re
+import subprocess
+import sys
+import threading
+import time
 
 import pytest
 
 from datashuttle.configs.canonical_configs import get_connection_methods_list
 from datashuttle.configs.canonical_tags import tags
-from datashuttle.utils import formatting, getters, utils
+from datashuttle.configs.config_class import Configs
+from datashuttle.utils import (
+    folders,
+    formatting,
+    getters,
+    project_index,
+    rclone,
+    rclone_canceller,
+    rclone_daemon,
+    transfer_diff_cache,
+    transfer_output_class,
+    utils,
+    yaml_files,
+)
+from datashuttle.utils.custom_exceptions import (
+    NeuroBlueprintError,
+    RcloneCallCancelledError,
+)
+from datashuttle.utils.transfer_output_class import TransferOutput
+from datashuttle.utils.transfer_progress_class import TransferProgress
 
 
 class TestUnit:
@@ -81,6 +106,39 @@ class TestUnit:
             f"{prefix}-0007_hello",
         ]
 
+    @pytest.mark.parametrize("prefix", ["sub", "ses"])
+    def test_name_range(self, prefix):
+        """Check names with the @TO@ keyword can be kept as a `NameRange`
+        that makes the same names as expanding the range.
+        """
+        names = [
+            f"{prefix}-001",
+            f"{prefix}-8{tags('to')}011_@DATE@",
+        ]
+        formatted_names = formatting.format_names(
+            names, prefix, expand_ranges=False
+        )
+
+        assert formatted_names[0] == f"{prefix}-001"
+
+        name_range = formatted_names[1]
+        assert isinstance(name_range, formatting.NameRange)
+        assert len(name_range) == 4
+        assert name_range.get_value_lengths() == {2}
+
+        assert formatting.expand_names(formatted_names) == (
+            formatting.format_names(names, prefix)
+        )
+
+        date = name_range.name_end_str
+        assert re.fullmatch(r"_date-\d{8}", date)
+        assert str(name_range) == f"{prefix}-08{tags('to')}11{date}"
+
+        assert f"{prefix}-09{date}" in name_range
+        assert f"{prefix}-9{date}" not in name_range
+        assert f"{prefix}-12{date}" not in name_range
+        assert f"{prefix}-09" not in name_range
+
     @pytest.mark.parametrize("prefix", ["sub", "ses"])
     @pytest.mark.parametrize(
         "bad_input",
@@ -123,6 +181,36 @@ class TestUnit:
         id = utils.get_value_from_key_regexp(bids_name, "id")[0]
         assert id == "3asd@523"
 
+    def test_bids_name(self):
+        """Test a BIDS-name is parsed once into its key-value pairs,
+        and the value, id and value length of the prefix key.
+        """
+        bids_name = utils.BidsName("sub-0012_ses-003_date-20240101", "ses")
+
+        assert bids_name.pairs == (
+            ("sub", "0012"),
+            ("ses", "003"),
+            ("date", "20240101"),
+        )
+        assert bids_name.value == "003"
+        assert bids_name.id == 3
+        assert bids_name.value_length == 3
+        assert bids_name.get_value("sub") == "0012"
+
+        bids_name = utils.BidsName(
+            "sub-0a1", "sub", allow_letters_in_sub_ses_values=True
+        )
+        assert bids_name.id == "0a1"
+        assert utils.BidsName("sub-0a1", "sub").id is None
+
+        bids_name = utils.BidsName("sub-001_sub-002", "sub")
+        assert bids_name.value is None
+        assert bids_name.id is None
+
+        with pytest.raises(NeuroBlueprintError) as e:
+            bids_name.get_value("sub")
+        assert "more than one instance of sub" in str(e.value)
+
     def test_num_leading_zeros(self):
         """Check num_leading_zeros handles prefixed and non-prefixed
         case from -1 to -(101x 0)1.
@@ -247,6 +335,521 @@ class TestUnit:
             "local_only",
         ]
 
+    def test_write_transfer_filter_file(self, mocker):
+        """Check exact file paths are written for `--files-from-raw`
+        and any wildcard rules for `--filter-from`, excluding all else.
+        """
+        mocker.patch("datashuttle.utils.utils.log")
+
+        filter_flag, filter_filepath = rclone.write_transfer_filter_file(
+            ["/sub-001/file.txt", "/sub-002/ses-001/file.csv"]
+        )
+        with open(filter_filepath) as file:
+            lines = file.read().splitlines()
+        os.remove(filter_filepath)
+
+        assert filter_flag == "--files-from-raw"
+        assert lines == ["sub-001/file.txt", "sub-002/ses-001/file.csv"]
+
+        filter_flag, filter_filepath = rclone.write_transfer_filter_file(
+            ["/sub-001/ses-001/behav/**", "/file.txt"]
+        )
+        with open(filter_filepath) as file:
+            lines = file.read().splitlines()
+        os.remove(filter_filepath)
+
+        assert filter_flag == "--filter-from"
+        assert lines == [
+            "+ /sub-001/ses-001/behav/**",
+            "+ /file.txt",
+            "- **",
+        ]
+
+    def test_rclone_canceller_kills_running_call(self):
+        """Check cancelling an `RcloneCanceller` from another thread kills
+        a running process, and that later calls on the thread are not run.
+        """
+        canceller = rclone_canceller.RcloneCanceller()
+        command = f'"{sys.executable}" -c "import time; time.sleep(30)"'
+
+        timer = threading.Timer(0.5, canceller.cancel)
+        timer.start()
+
+        start_time = time.time()
+        with canceller.activate():
+            with pytest.raises(RcloneCallCancelledError):
+                rclone.run_cancellable_command(command, True, canceller)
+
+            with pytest.raises(RcloneCallCancelledError):
+                rclone.run_cancellable_command(command, True, canceller)
+
+        assert time.time() - start_time < 10
+        assert rclone_canceller.get_active_canceller() is None
+
+    def test_stream_rclone_copy_output(self):
+        """Check `rclone copy` output is parsed line by line as it is
+        streamed from both stdout and stderr, keeping only errors, copied
+        files and stats.
+        """
+        time_ = "2025-01-01T00:00:00.000000+00:00"
+        stderr_lines = [
+            {
+                "level": "info",
+                "msg": "Copied (new)",
+                "object": "a.txt",
+                "time": time_,
+            },
+            {
+                "level": "error",
+                "msg": "failed",
+                "object": "sub-001/b.txt",
+                "time": time_,
+            },
+            {"level": "critical", "msg": "something broke", "time": time_},
+            {
+                "level": "info",
+                "msg": "stats",
+                "stats": {"totalTransfers": 5},
+                "time": time_,
+            },
+        ]
+        stderr_text = "".join(json.dumps(line) + "\n" for line in stderr_lines)
+
+        script = (
+            "import sys\n"
+            "for i in range(1000):\n"
+            "    print(f'progress {i}')\n"
+            f"sys.stderr.write({stderr_text!r})\n"
+        )
+
+        transfer_output = TransferOutput()
+        lines = []
+
+        output = rclone.stream_process_output(
+            [sys.executable, "-c", script],
+            lambda line: lines.append(
+                rclone.reformat_rclone_copy_output_line(
+                    line, transfer_output, "rawdata"
+                )
+            ),
+        )
+
+        assert output.returncode == 0
+        assert output.stdout is None and output.stderr is None
+
+        assert len(lines) == 1000 + len(stderr_lines)
+        assert "progress 999" in lines
+        assert "2025-01-01T00:00:00 ERROR : failed" in lines
+
+        assert transfer_output["errors"]["file_names"] == [
+            "rawdata/sub-001/b.txt"
+        ]
+        assert transfer_output["errors"]["messages"] == [
+            "The file rawdata/sub-001/b.txt failed to transfer. Reason: failed",
+            "ERROR : something broke",
+        ]
+        assert transfer_output["transferred_file_names"] == ["rawdata/a.txt"]
+        assert transfer_output["num_transferred"]["rawdata"] == 5
+
+    @pytest.mark.skipif(
+        sys.platform == "win32", reason="Uses a bash script as the wrapper."
+    )
+    def test_stream_process_output_kills_child_on_interrupt(self, tmp_path):
+        """Check interrupting a process run through a script (as for rclone
+        transfers) also kills the process started by the script.
+        """
+        script_path = tmp_path / "script.sh"
+        script_path.write_text("#!/bin/bash\nsleep 60 &\necho $!\nwait\n")
+        os.chmod(script_path, 0o700)
+
+        child_pids = []
+
+        def process_line(line):
+            child_pids.append(int(line))
+            raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            rclone.stream_process_output([str(script_path)], process_line)
+
+        for _ in range(50):
+            if not os.path.exists(f"/proc/{child_pids[0]}"):
+                break
+            time.sleep(0.1)
+
+        with pytest.raises(ProcessLookupError):
+            os.kill(child_pids[0], 0)
+
+    def test_transfer_diff_cache_gdrive_no_central_path(self, tmp_path):
+        """Check the transfer differences cache can be used for Google
+        Drive projects, where `central_path` may be `None`.
+        """
+        cfg = Configs(
+            "my_project",
+            tmp_path / "config.yaml",
+            {
+                "local_path": tmp_path / "my_project",
+                "central_path": None,
+                "connection_method": "gdrive",
+            },
+        )
+        cfg.project_metadata_path = tmp_path / "my_project" / ".datashuttle"
+
+        cache = transfer_diff_cache.TransferDiffCache.load(cfg)
+        assert cache.central_key == ["central_my_project_gdrive", ""]
+
+        cache.files = {"rawdata/a.txt": {"status": "same"}}
+        cache.save()
+
+        assert transfer_diff_cache.TransferDiffCache.load(cfg).files == (
+            cache.files
+        )
+
+        # Too many files were transferred to record, so the cache is discarded.
+        transfer_diff_cache.update_from_transferred_files(cfg, None)
+        assert not transfer_diff_cache.get_cache_path(cfg).is_file()
+
+    def test_transfer_diff_cache_central_listing_fails(
+        self, tmp_path, monkeypatch
+    ):
+        """Check that if central cannot be listed (e.g. the connection
+        failed) an error is raised and the cache is left unchanged, but
+        if the folder does not exist on central, all files are local only.
+        """
+        cfg = Configs(
+            "my_project",
+            tmp_path / "config.yaml",
+            {
+                "local_path": tmp_path / "my_project",
+                "central_path": tmp_path / "central" / "my_project",
+                "connection_method": "ssh",
+            },
+        )
+        cfg.project_metadata_path = tmp_path / "my_project" / ".datashuttle"
+        cfg.project_metadata_path.mkdir(parents=True)
+
+        (tmp_path / "my_project" / "rawdata").mkdir()
+        (tmp_path / "my_project" / "rawdata" / "a.txt").write_text("text")
+
+        cache = transfer_diff_cache.TransferDiffCache.load(cfg)
+        cache.files = {"rawdata/a.txt": {"status": "same"}}
+        cache.save()
+
+        cache_path = transfer_diff_cache.get_cache_path(cfg)
+        cache_contents = cache_path.read_text()
+
+        def failed_lsjson(stderr):
+            return lambda *args, **kwargs: subprocess.CompletedProcess(
+                args="rclone lsjson",
+                returncode=3,
+                stdout=b"",
+                stderr=stderr.encode("utf-8"),
+            )
+
+        monkeypatch.setattr(
+            rclone,
+            "call_rclone_lsjson_for_central_connection",
+            failed_lsjson("Failed to lsjson: connection refused"),
+        )
+        with pytest.raises(ConnectionError) as e:
+            transfer_diff_cache.get_transfer_diffs(cfg, ["rawdata"])
+
+        assert "connection refused" in str(e.value)
+        assert cache_path.read_text() == cache_contents
+
+        monkeypatch.setattr(
+            rclone,
+            "call_rclone_lsjson_for_central_connection",
+            failed_lsjson("Failed to lsjson: directory not found"),
+        )
+        transfer_diffs = transfer_diff_cache.get_transfer_diffs(
+            cfg, ["rawdata"]
+        )
+
+        assert transfer_diffs["local_only"] == ["rawdata/a.txt"]
+        assert transfer_diff_cache.TransferDiffCache.load(cfg).files == {}
+
+    def test_transfer_output_max_transferred_file_names(self, monkeypatch):
+        """Check transferred file paths stop being recorded once
+        there are more than `MAX_TRANSFERRED_FILE_NAMES`.
+        """
+        monkeypatch.setattr(
+            transfer_output_class, "MAX_TRANSFERRED_FILE_NAMES", 2
+        )
+
+        transfer_output = TransferOutput()
+        transfer_output.add_transferred_file_names(["rawdata/a.txt"])
+        transfer_output.add_transferred_file_names(["rawdata/b.txt"])
+        assert transfer_output["transferred_file_names"] == [
+            "rawdata/a.txt",
+            "rawdata/b.txt",
+        ]
+
+        merged = TransferOutput.merge_shard_outputs(
+            "rawdata", [transfer_output, TransferOutput()]
+        )
+        assert merged["transferred_file_names"] == [
+            "rawdata/a.txt",
+            "rawdata/b.txt",
+        ]
+
+        transfer_output.add_transferred_file_names(["rawdata/c.txt"])
+        assert transfer_output["transferred_file_names"] is None
+
+        merged = TransferOutput.merge_shard_outputs(
+            "rawdata", [TransferOutput(), transfer_output]
+        )
+        assert merged["transferred_file_names"] is None
+
+    @pytest.mark.parametrize("num_listed", [3, 2])
+    def test_rclone_daemon_copy_incomplete_transferred_list(self, num_listed):
+        """Check that when rclone has dropped completed transfers from
+        `core/transferred`, the transferred file names are not recorded
+        and the number of unlisted errors is reported.
+        """
+        transferred = [
+            {"name": "a.txt", "what": "transferring", "checked": False},
+            {"name": "b.txt", "what": "transferring", "checked": False},
+            {"name": "c.txt", "what": "transferring", "checked": False},
+        ][:num_listed]
+        for transfer in transferred:
+            transfer["error"] = ""
+
+        stats = {
+            "transfers": 3,
+            "checks": 0,
+            "errors": 0 if num_listed == 3 else 2,
+        }
+        responses = {
+            "core/stats": stats,
+            "core/transferred": {"transferred": transferred},
+            "core/stats-delete": {},
+        }
+
+        daemon = rclone_daemon.RcloneDaemon()
+        daemon.run_job = lambda *args, **kwargs: {
+            "id": 1,
+            "success": False,
+            "error": "",
+        }
+        daemon.call = lambda command, params=None: responses[command]
+
+        output = daemon.copy("src", "dst", {}, {})
+
+        transfer_output = TransferOutput()
+        for line in output.stderr.decode("utf-8").splitlines():
+            rclone.reformat_rclone_copy_output_line(
+                line, transfer_output, "rawdata"
+            )
+
+        if num_listed == 3:
+            assert transfer_output["transferred_file_names"] == [
+                "rawdata/a.txt",
+                "rawdata/b.txt",
+                "rawdata/c.txt",
+            ]
+            assert not transfer_output.errors_detected()
+        else:
+            assert transfer_output["transferred_file_names"] is None
+            assert transfer_output["errors"]["messages"] == [
+                "ERROR : 2 errors occurred during the transfer, "
+                "but only 0 could be listed."
+            ]
+
+    def test_rclone_arguments_progress_or_stats(self):
+        """Check `--progress` is not passed when stats are output for the
+        progress callback, as it stops rclone logging the stats.
+        """
+        rclone_options = rclone.make_rclone_transfer_options("never", False)
+
+        arguments = rclone.handle_rclone_arguments(rclone_options, [])
+        assert "--progress" in arguments
+        assert "--stats" not in arguments
+
+        rclone_options["stats_interval"] = "1s"
+
+        arguments = rclone.handle_rclone_arguments(rclone_options, [])
+        assert "--progress" not in arguments
+        assert "--stats 1s" in arguments
+
+    def test_transfer_progress_from_rclone_stats(self):
+        """Check rclone stats lines are passed to the progress callback,
+        and progress from parallel shards is combined.
+        """
+        stats = {
+            "bytes": 1536,
+            "totalBytes": 3072,
+            "transfers": 1,
+            "totalTransfers": 4,
+            "speed": 2048.0,
+            "eta": 3725,
+            "elapsedTime": 1.5,
+        }
+        line = json.dumps(
+            {
+                "level": "info",
+                "msg": "stats",
+                "stats": stats,
+                "time": "2025-01-01T00:00:00.000000+00:00",
+            }
+        )
+
+        progress = []
+        rclone.reformat_rclone_copy_output_line(
+            line, TransferOutput(), "rawdata", progress.append
+        )
+
+        assert progress == [
+            TransferProgress("rawdata", 1536, 3072, 1, 4, 2048.0, 3725, 1.5)
+        ]
+        assert progress[0].fraction_complete() == 0.5
+        assert progress[0].create_tui_message() == (
+            "1 / 4 files    1.5 KiB / 3.0 KiB    2.0 KiB/s    ETA 1:02:05"
+        )
+
+        merged = TransferProgress.merge_shard_progress(
+            [
+                progress[0],
+                TransferProgress("rawdata", 10, 20, 2, 3, 5.0, 10, 3.0),
+            ]
+        )
+        assert merged == TransferProgress(
+            "rawdata", 1546, 3092, 3, 7, 2053.0, 3725, 3.0
+        )
+
+        unknown_eta = TransferProgress("rawdata", 0, 0, 0, 0, 0.0, None, 0.0)
+        assert unknown_eta.fraction_complete() is None
+        assert (
+            TransferProgress.merge_shard_progress([merged, unknown_eta]).eta
+            is None
+        )
+
+    @pytest.mark.parametrize("num_workers", [1, 4])
+    def test_create_folders_in_bulk(self, tmp_path, num_workers):
+        """Check only missing folders (and their missing parents) are
+        made, parent-first and in the order the paths are passed.
+        """
+        base = tmp_path / "project" / "rawdata"
+        (base / "sub-001" / "ses-001").mkdir(parents=True)
+        (base / "sub-001" / "ses-002").write_text("not a folder")
+
+        paths = [
+            base / "sub-002" / "ses-001" / "behav",
+            base / "sub-001",
+            base / "sub-001" / "ses-001",
+            base / "sub-001" / "ses-001" / "ephys",
+            base / "sub-002" / "ses-001",
+            base / "sub-002",
+            base / "sub-003",
+        ]
+
+        missing_folders = [
+            base / "sub-002",
+            base / "sub-002" / "ses-001",
+            base / "sub-002" / "ses-001" / "behav",
+            base / "sub-001" / "ses-001" / "ephys",
+            base / "sub-003",
+        ]
+        assert folders.find_missing_folders(paths, base) == missing_folders
+
+        made_folders = []
+        folders.create_folders_in_bulk(
+            paths, base, num_workers=num_workers, made_folders=made_folders
+        )
+
+        assert made_folders == missing_folders
+        assert all(path_.is_dir() for path_ in paths)
+        assert folders.find_missing_folders(paths, base) == []
+
+        # A file with the name of a folder to make raises, as for `mkdir`.
+        with pytest.raises(FileExistsError):
+            folders.create_folders_in_bulk(
+                [base / "sub-001" / "ses-002" / "behav"], base
+            )
+
+    def test_create_folders_in_bulk_missing_base_folder(self, tmp_path):
+        """Check the base folder, and its parents, are made if they do not exist."""
+        base = tmp_path / "project" / "derivatives"
+
+        made_folders = []
+        folders.create_folders_in_bulk(
+            [base / "sub-001"], base, made_folders=made_folders
+        )
+
+        assert made_folders == [tmp_path / "project", base, base / "sub-001"]
+        assert (base / "sub-001").is_dir()
+
+    def test_project_index_max_folders(self, tmp_path):
+        """Check the least recently used folders are
+        removed when the index is full.
+        """
+        for name in ["a", "b", "c"]:
+            (tmp_path / name).mkdir()
+
+        index = project_index.ProjectIndex(max_folders=2)
+
+        index.get_node(tmp_path / "a")
+        index.get_node(tmp_path / "b")
+        index.get_node(tmp_path / "a")
+        index.get_node(tmp_path / "c")
+
+        assert list(index._nodes) == [
+            (tmp_path / "a").as_posix(),
+            (tmp_path / "c").as_posix(),
+        ]
+
+    def test_load_yaml_cached(self, tmp_path, mocker, monkeypatch):
+        """Check a YAML file is parsed (and updated) only when it changes on disk,
+        and a file written with `dump_yaml()` is not parsed on load unless
+        it was written within `RACY_MTIME_WINDOW_NS`.
+        """
+        path = tmp_path / "settings.yaml"
+        path.write_text("a: 1\nb: [x, y]\n")
+        old_ns = time.time_ns() - 10 * project_index.RACY_MTIME_WINDOW_NS
+        os.utime(path, ns=(old_ns, old_ns))
+
+        spy_parse = mocker.spy(yaml_files, "_parse")
+
+        def update(data):
+            data["c"] = True
+
+        data = yaml_files.load_yaml(path, update=update)
+        assert data == {"a": 1, "b": ["x", "y"], "c": True}
+
+        # Changing the returned data does not change the cache.
+        data["b"].append("z")
+        assert yaml_files.load_yaml(path, update=update) == {
+            "a": 1,
+            "b": ["x", "y"],
+            "c": True,
+        }
+        assert spy_parse.call_count == 1
+
+        # As the file was just written, another process may write it
+        # without its version changing, so it is parsed again.
+        yaml_files.dump_yaml({"a": 2}, path)
+        assert yaml_files.load_yaml(path, update=update) == {
+            "a": 2,
+            "c": True,
+        }
+        assert spy_parse.call_count == 2
+
+        # A file changed outside of `dump_yaml()` is parsed again. As it
+        # was just modified, it is parsed again on each load.
+        path.write_text("a: 30\n")
+        for _ in range(2):
+            assert yaml_files.load_yaml(path, update=update) == {
+                "a": 30,
+                "c": True,
+            }
+        assert spy_parse.call_count == 4
+
+        # Outside of the window, written contents are reused.
+        monkeypatch.setattr(project_index, "RACY_MTIME_WINDOW_NS", -1)
+
+        yaml_files.dump_yaml({"a": 3}, path)
+        assert yaml_files.load_yaml(path, update=update) == {"a": 3}
+        assert spy_parse.call_count == 4
+
     # -------------------------------------------------------------------------
     # Utils
     # -------------------------------------------------------------------------
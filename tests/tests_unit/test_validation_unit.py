@@ -232,6 +232,42 @@ class TestValidationUnit:
             == error_messages[0]
         )
 
+    @pytest.mark.parametrize("prefix", ["sub", "ses"])
+    def test_duplicate_names_in_list(self, prefix):
+        """Check every pair of names sharing an id (ignoring leading
+        zeros) is reported by `validate_list_of_names()`, in list order,
+        while invalid and exactly-repeated names are not reported.
+        """
+        names = [
+            f"{prefix}-001",
+            f"{prefix}-002",
+            f"{prefix}-1_date-20250101",
+            f"{prefix}-abc",
+            f"{prefix}-002",
+            f"{prefix}-001_id-a",
+        ]
+        error_messages = validation.validate_list_of_names(
+            names, prefix, check_value_lengths=False
+        )
+        duplicate_errors = [
+            message
+            for message in error_messages
+            if message.startswith("DUPLICATE_NAME")
+        ]
+
+        expected_pairs = [
+            (f"{prefix}-001", f"{prefix}-1_date-20250101"),
+            (f"{prefix}-001", f"{prefix}-001_id-a"),
+            (f"{prefix}-1_date-20250101", f"{prefix}-001"),
+            (f"{prefix}-1_date-20250101", f"{prefix}-001_id-a"),
+            (f"{prefix}-001_id-a", f"{prefix}-001"),
+            (f"{prefix}-001_id-a", f"{prefix}-1_date-20250101"),
+        ]
+        assert duplicate_errors == [
+            f"DUPLICATE_NAME: The prefix for {new} duplicates the name: {existing}."
+            for new, existing in expected_pairs
+        ]
+
     def test_tags_autoreplace_in_regexp(self):
         """Check the validation function `replace_tags_in_regexp()`
         correctly replaces tags in a regexp with their regexp equivalent.
@@ -267,6 +303,84 @@ class TestValidationUnit:
 
         assert output == "message Path: some/path"
 
+    def test_validation_issues(self):
+        """Check validation issues hold the fields of the error, and
+        are formatted to the same messages as `validate_list_of_names()`.
+        """
+        from pathlib import Path
+
+        paths = [
+            Path("rawdata") / name
+            for name in ["sub-001", "sub-02_date-2024", "sub-abc", "sub-003!"]
+        ]
+        issues = validation.get_list_of_names_issues(paths, "sub")
+
+        assert [str(issue) for issue in issues] == (
+            validation.validate_list_of_names(paths, "sub")
+        )
+        assert [issue.code for issue in issues] == [
+            "DATETIME",
+            "BAD_VALUE",
+            "BAD_VALUE",
+            "SPECIAL_CHAR",
+            "VALUE_LENGTH",
+        ]
+        assert all(issue.level == "sub" for issue in issues)
+
+        # The path is shared with the passed path, not copied
+        assert issues[0].path is paths[1]
+        assert issues[0].name == "sub-02_date-2024"
+        assert issues[0].message == (
+            "DATETIME: Name sub-02_date-2024 contains an invalid date. "
+            "It should be ISO format: %Y%m%d. Path: rawdata/sub-02_date-2024"
+        )
+
+        assert [
+            validation.ValidationIssue.from_dict(issue.to_dict())
+            for issue in issues
+        ] == issues
+
+    @pytest.mark.parametrize("prefix", ["sub", "ses"])
+    def test_name_range_validation(self, prefix):
+        """Check ranges of names made with the @TO@ tag are validated
+        without expanding them, with the same duplicate and value
+        length checks as when they are expanded.
+        """
+        names = [
+            f"{prefix}-005_id-a",
+            f"{prefix}-001@TO@100",
+            f"{prefix}-099@TO@0150",
+        ]
+
+        issues = validation.get_list_of_names_issues(
+            formatting.format_names(names, prefix, expand_ranges=False),
+            prefix,
+        )
+        expanded_issues = validation.get_list_of_names_issues(
+            formatting.format_names(names, prefix), prefix
+        )
+
+        assert issues == expanded_issues
+        assert [issue.code for issue in issues] == ["DUPLICATE_NAME"] * 4 + [
+            "VALUE_LENGTH"
+        ]
+        assert issues[2].name == f"{prefix}-099"
+        assert issues[2].details["exist_name"] == f"{prefix}-99"
+
+        # Names in a range are only checked once, other than the template.
+        names = [f"{prefix}-001@TO@100_id-a!"]
+        templates = {"on": True, "sub": r"sub-0\d\d.*", "ses": r"ses-0\d\d.*"}
+
+        issues = validation.get_list_of_names_issues(
+            formatting.format_names(names, prefix, expand_ranges=False),
+            prefix,
+            validation_templates=templates,
+        )
+
+        assert [issue.code for issue in issues] == ["SPECIAL_CHAR", "TEMPLATE"]
+        assert issues[0].name == f"{prefix}-001_id-a!"
+        assert issues[1].name == f"{prefix}-100_id-a!"
+
     @pytest.mark.parametrize("prefix", ["sub", "ses"])
     def test_datetime_iso_format(self, prefix):
         # Test dates
@@ -306,3 +420,35 @@ class TestValidationUnit:
         )
         assert len(error_messages) == 3
         assert all("DATETIME" in message for message in error_messages)
+
+    def test_name_rules_are_reused(self):
+        """Check the rules used to validate names (regexps, template)
+        are built once and reused across calls and names.
+        """
+        validation_templates = {
+            "on": True,
+            "sub": r"sub-\d\d\d_@DATE@",
+            "ses": None,
+        }
+        validation.get_name_rules.cache_clear()
+
+        for _ in range(2):
+            error_messages = validation.validate_list_of_names(
+                ["sub-001_date-20240101", "sub-002", "sub-003_date-20241301"],
+                "sub",
+                validation_templates,
+            )
+            assert len(error_messages) == 2
+            assert (
+                sum("TEMPLATE" in message for message in error_messages) == 1
+            )
+            assert (
+                sum("DATETIME" in message for message in error_messages) == 1
+            )
+
+        cache_info = validation.get_name_rules.cache_info()
+        assert cache_info.misses == 1
+        assert cache_info.hits == 1
+
+        rules = validation.get_name_rules("sub", r"sub-\d\d\d_@DATE@", False)
+        assert rules.template == r"sub-\d\d\d_date-\d{8}"